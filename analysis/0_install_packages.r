@@ -30,9 +30,12 @@ install.packages('wordcloud2') #wordcloud2 패키지
 install.packages('tidytext')   #tidytext 패키지
 install.packages('Rcpp')       #Rcpp 패키지
 install.packages('slam')       #slam 패키지
+install.packages('Matrix')     #희소 행렬 패키지 (term_matrix.py 출력 읽기)
 install.packages('rlang')      #rlang 패키지
 install.packages('vctrs')      #vctrs 패키지
 install.packages("textmineR")
+install.packages("jsonlite")   #jsonl.gz 스크랩 결과 읽기
+install.packages("arrow")      #parquet 스크랩 결과 읽기
 
 install.packages("multilinguer")
 library(multilinguer)
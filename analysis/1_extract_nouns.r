@@ -11,7 +11,8 @@ argSpec <- matrix(c(
     'input', 'i', 1, 'character', "Scraped Articles, CSV File",
     'filter', 'f', 1, 'character', "Stopwords List, TXT File (Default filter.txt)",
     'output', 'o', 1, 'character', "Extracted Nouns, CSV File (Default nouns_{input}.csv)",
-    'sejongdic', 's', 0, 'logical', "Use Sejong Dic instead of NIA Dic"
+    'sejongdic', 's', 0, 'logical', "Use Sejong Dic instead of NIA Dic",
+    'raw', 'r', 0, 'logical', "Only Extract Nouns, Remove Words with scrap/noun_filter.py"
 ), byrow=TRUE, ncol=5)
 
 opts <- getopt(argSpec)
@@ -43,6 +44,9 @@ if(!is.null(opts$sejongdic)) {
     shouldUseSejongDic <- TRUE
 }
 
+# -r: 명사만 추출하고 저빈도수 단어와 불용어 제거는 noun_filter.py에서 함
+shouldOnlyExtract <- !is.null(opts$raw)
+
 ###################### 명사 추출 ######################
 library(rJava)
 library(KoNLP)
@@ -60,7 +64,16 @@ if(shouldUseSejongDic){
 }
 
 # $date (작성일), $title (제목), $body (기사 본문)
-articlesDataFrame <- read.csv(articlesFileName, header = TRUE, fileEncoding = "UTF-8", stringsAsFactors=FALSE)
+# 확장자에 따라 csv, jsonl.gz (jsonlite), parquet (arrow, 필요한 열만 읽음) 형식으로 읽음
+if (endsWith(articlesFileName, ".parquet")) {
+    library(arrow)
+    articlesDataFrame <- as.data.frame(read_parquet(articlesFileName, col_select=c("date", "title", "body")))
+} else if (endsWith(articlesFileName, ".jsonl.gz")) {
+    library(jsonlite)
+    articlesDataFrame <- stream_in(gzfile(articlesFileName), verbose=FALSE)
+} else {
+    articlesDataFrame <- read.csv(articlesFileName, header = TRUE, fileEncoding = "UTF-8", stringsAsFactors=FALSE)
+}
 
 # 전체 기사의 개수
 numOfArticles <- length(articlesDataFrame[,1])
@@ -87,6 +100,11 @@ for(cntArticle in 1:numOfArticles) {
 
 cat("\rExtracting Nouns... [DONE]\n")
 
+if (shouldOnlyExtract) {
+    write.table(articlesDataFrame, resultFileName, sep=", ", row.names = FALSE, fileEncoding="UTF-8")
+    q(status=0)
+}
+
 ################ 저빈도수 단어들을 제거 ###################
 # 분석을 위해서는 '문서수 x 단어수' 요소 만큼의 2차원 행렬을 생성하게 됨.
 # 이 경우 분석 대상의 문서 수가 방대해지면 추출되는 단어의 갯수도 아주
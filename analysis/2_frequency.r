@@ -10,6 +10,7 @@ argSpec <- matrix(c(
     'help', 'h', 0, 'logical', "help",
     'input', 'i', 1, 'character', "Extracted Nouns, CSV File",
     'number', 'n', 1, 'integer', "Number of Top Rank Words to Get (Default 50)",
+    'matrix', 'd', 1, 'character', "Term Matrix Directory made by term_matrix.py (dtm.mtx, vocab.txt), Used instead of Input",
     'output', 'o', 1, 'character', "Most Frequent Words, CSV File (Default frequent_{input}.csv)"
 ), byrow=TRUE, ncol=5)
 
@@ -22,9 +23,10 @@ if(!is.null(opts$help)) {
 
 nounsFileName <- opts$input
 wordsNum <- opts$number
+matrixDirName <- opts$matrix
 frequentFileName <- opts$output
 
-if (is.null(nounsFileName)) {
+if (is.null(nounsFileName) && is.null(matrixDirName)) {
     cat(getopt(argSpec, usage=TRUE))
     q(status=1)
 }
@@ -33,7 +35,9 @@ if (is.null(wordsNum)) {
     wordsNum <- 50
 }
 
-if (is.null(frequentFileName)) {
+if (is.null(frequentFileName) && is.null(nounsFileName)) {
+    frequentFileName <- file.path(matrixDirName, "frequent.csv")
+} else if (is.null(frequentFileName)) {
     frequentFileName <- paste(paste("frequent", 
         file_path_sans_ext(basename(nounsFileName)), sep="_"), ".csv", sep='')
 }
@@ -45,17 +49,27 @@ library(SnowballC)
 library(servr)
 library(tm)
 
-# $date (작성일), $title (제목), $body (기사 본문)
-articlesDataFrame <- read.csv(nounsFileName, header = TRUE, fileEncoding = "UTF-8", stringsAsFactors=FALSE)
 cat("Select Top", wordsNum, "Words... ")
 
-corpusArticles <- VCorpus(VectorSource(articlesDataFrame$body)) 
+if (!is.null(matrixDirName)) {
+    # term_matrix.py가 만든 희소 행렬 (행: 문서, 열: 단어)
+    library(Matrix)
+    dtmArticles <- readMM(file.path(matrixDirName, "dtm.mtx"))
+    frequencyVector <- colSums(dtmArticles)
+    names(frequencyVector) <- readLines(file.path(matrixDirName, "vocab.txt"), encoding="UTF-8")
+    orderedWordsVector <- sort(frequencyVector, decreasing = TRUE)
+} else {
+    # $date (작성일), $title (제목), $body (기사 본문)
+    articlesDataFrame <- read.csv(nounsFileName, header = TRUE, fileEncoding = "UTF-8", stringsAsFactors=FALSE)
 
-# 2음절 이상 단어만 선택해 TDM 생성
-tdmArticles <- TermDocumentMatrix(corpusArticles, control=list(wordLengths=c(2, Inf))) 
+    corpusArticles <- VCorpus(VectorSource(articlesDataFrame$body)) 
 
-# TDM을 이용하여 전체 문서에서 단어별 빈도수로 정렬
-orderedWordsVector <- sort(slam::row_sums(tdmArticles), decreasing = TRUE) 
+    # 2음절 이상 단어만 선택해 TDM 생성
+    tdmArticles <- TermDocumentMatrix(corpusArticles, control=list(wordLengths=c(2, Inf))) 
+
+    # TDM을 이용하여 전체 문서에서 단어별 빈도수로 정렬
+    orderedWordsVector <- sort(slam::row_sums(tdmArticles), decreasing = TRUE) 
+}
 
 
 # 단어와 빈도수로만 된 매트릭스 생성
@@ -11,6 +11,7 @@ argSpec <- matrix(c(
     'input', 'i', 1, 'character', "Extracted Nouns, CSV File",
     'minimum-topics', 'm', 1, 'integer', "Minimum Topics Count to Calculate Coherence (Default 2)",
     'maximum-topics', 'M', 1, 'integer', "Maximum Topics Count to Calculate Coherence (Default 15)",
+    'matrix', 'd', 1, 'character', "Term Matrix Directory made by term_matrix.py (dtm.mtx, vocab.txt), Used instead of Input, Unigrams Only",
     'output', 'o', 1, 'character', "Coherence Result, CSV File (Default coherence_{input}.csv)"
 ), byrow=TRUE, ncol=5)
 
@@ -24,9 +25,10 @@ if (!is.null(opts$help)) {
 nounsFileName <- opts$input
 minTopics <- opts$`minimum-topics`
 maxTopics <- opts$`maximum-topics`
+matrixDirName <- opts$matrix
 coherenceFileName <- opts$output
 
-if (is.null(nounsFileName)) {
+if (is.null(nounsFileName) && is.null(matrixDirName)) {
     cat(getopt(argSpec, usage=TRUE))
     q(status=1)
 }
@@ -39,7 +41,9 @@ if (is.null(maxTopics)) {
     maxTopics <- 15
 }
 
-if (is.null(coherenceFileName)) {
+if (is.null(coherenceFileName) && is.null(nounsFileName)) {
+    coherenceFileName <- file.path(matrixDirName, "coherence.csv")
+} else if (is.null(coherenceFileName)) {
     coherenceFileName <- paste(paste("coherence", 
         file_path_sans_ext(basename(nounsFileName)), sep="_"), ".csv", sep='')
 }
@@ -47,16 +51,24 @@ if (is.null(coherenceFileName)) {
 #################### Topic Coherence 계산 ####################
 library(textmineR)
 
-# $date (작성일), $title (제목), $body (기사 본문)
-articlesDataFrame <- read.csv(nounsFileName, header = TRUE, fileEncoding = "UTF-8", stringsAsFactors=FALSE)
-
 cat("Generating Document Term Matrix... ")
 set.seed(1502)
-dtmArticles = CreateDtm(doc_vec = articlesDataFrame$body,
-                    doc_names = 1:length(articlesDataFrame$body),
-                    ngram_window = c(1,2),
-                    stopword_vec = c(),
-                    verbose = FALSE)
+if (!is.null(matrixDirName)) {
+    # term_matrix.py가 만든 희소 행렬을 그대로 읽음 (단어 하나씩만 있음)
+    library(Matrix)
+    dtmArticles <- as(readMM(file.path(matrixDirName, "dtm.mtx")), "CsparseMatrix")
+    dimnames(dtmArticles) <- list(1:nrow(dtmArticles),
+                                  readLines(file.path(matrixDirName, "vocab.txt"), encoding="UTF-8"))
+} else {
+    # $date (작성일), $title (제목), $body (기사 본문)
+    articlesDataFrame <- read.csv(nounsFileName, header = TRUE, fileEncoding = "UTF-8", stringsAsFactors=FALSE)
+
+    dtmArticles = CreateDtm(doc_vec = articlesDataFrame$body,
+                        doc_names = 1:length(articlesDataFrame$body),
+                        ngram_window = c(1,2),
+                        stopword_vec = c(),
+                        verbose = FALSE)
+}
 
 dtmArticles <- dtmArticles[,colSums(dtmArticles)>2]
 
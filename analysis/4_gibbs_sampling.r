@@ -10,6 +10,7 @@ argSpec <- matrix(c(
     'help', 'h', 0, 'logical', "help",
     'input', 'i', 1, 'character', "Extracted Nouns, CSV File",
     'number', 'n', 1, 'integer', "Number of Top Rank Words to Use (Default 500)",
+    'matrix', 'd', 1, 'character', "Term Matrix Directory made by term_matrix.py (lda.txt, vocab.txt)",
     'topics', 't', 1, 'integer', "Decided Number of Topics",
     'topic-coherence', 'T', 1, 'character', "Coherence Result, CSV File to Decide Number of Topics",
     'output', 'o', 1, 'character', "Trained Gibbs Sampling Model, RData File (Default gibbs_{topic-num}_{input}.RData)"
@@ -24,6 +25,7 @@ if (!is.null(opts$help)) {
 
 nounsFileName <- opts$input
 wordsNum <- opts$number
+matrixDirName <- opts$matrix
 numOfTopics <- opts$topics
 coherenceFileName <- opts$`topic-coherence`
 modelFileName <- opts$output
@@ -70,17 +72,26 @@ articlesDataFrame <- read.csv(nounsFileName, header = TRUE, fileEncoding = "UTF-
 cat("Training Models by", numOfTopics, "\bTopics.\n")
 
 cat("Generating LDA Form Data... ")
-corpusArticles <- VCorpus(VectorSource(articlesDataFrame$body))
-tdmArticles <- TermDocumentMatrix(corpusArticles, control=list(wordLengths=c(2, Inf)))
-matArticles <- as.matrix(tdmArticles)
-
-orderedWordsVector <- order(rowSums(matArticles), decreasing = TRUE)
-
-# 상위 wordsNum개의 단어로 군집화에 사용될 document-term 매트릭스 생성
-dtmArticles <- as.DocumentTermMatrix(tdmArticles[orderedWordsVector[1:wordsNum],])
-
-# DTM을 LDA Gibbs sampler를 위한 형식으로 변환
-ldaFormArticles <- dtm2ldaformat(dtmArticles, omit_empty = FALSE) 
+if (!is.null(matrixDirName)) {
+    # term_matrix.py가 만든 LDA 형식 파일. 단어는 빈도순이므로 번호가 wordsNum보다 작은 단어만 남김
+    # (lda.txt를 만들 때의 -w 값보다 wordsNum이 크면 그만큼만 쓰임)
+    documentsList <- read.documents(file.path(matrixDirName, "lda.txt"))
+    documentsList <- lapply(documentsList, function(document) document[, document[1,] < wordsNum, drop=FALSE])
+    vocabVector <- readLines(file.path(matrixDirName, "vocab.txt"), encoding="UTF-8")
+    ldaFormArticles <- list(documents = documentsList, vocab = vocabVector[1:min(wordsNum, length(vocabVector))])
+} else {
+    corpusArticles <- VCorpus(VectorSource(articlesDataFrame$body))
+    tdmArticles <- TermDocumentMatrix(corpusArticles, control=list(wordLengths=c(2, Inf)))
+
+    # 밀집 행렬로 바꾸지 않고 희소 행렬 그대로 단어별 빈도수를 구함
+    orderedWordsVector <- order(slam::row_sums(tdmArticles), decreasing = TRUE)
+
+    # 상위 wordsNum개의 단어로 군집화에 사용될 document-term 매트릭스 생성
+    dtmArticles <- as.DocumentTermMatrix(tdmArticles[orderedWordsVector[1:wordsNum],])
+
+    # DTM을 LDA Gibbs sampler를 위한 형식으로 변환
+    ldaFormArticles <- dtm2ldaformat(dtmArticles, omit_empty = FALSE) 
+}
 
 cat("[DONE]\n")
 
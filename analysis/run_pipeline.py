@@ -0,0 +1,480 @@
+##################################################################################################
+# 분석 파이프라인 실행 (analysis.bat을 대신함)
+# 명사 추출부터 IDM 시각화까지의 단계를 의존 관계 그래프로 두고, 앞 단계가 끝난 단계들을 동시에 실행함
+# - 단계마다 명령, 스크립트 파일, 입력 파일 내용의 해시를 기록해두고 모두 같으면 다시 실행하지 않음
+#   (불용어 파일만 바꾸면 명사 추출은 건너뛰고, 앞 단계의 출력이 그대로면 뒤 단계도 건너뜀)
+#   파일 해시는 크기와 수정 시각이 같으면 기록해둔 값을 씀
+# - Topic coherence는 토픽 수마다 3_topic_coherence.r을 따로 실행하여 동시에 계산한 뒤 합침
+#   토픽 수마다 같은 시드로 시작하므로 한 번에 계산했을 때와 값이 조금 다를 수 있음
+# - 워드클라우드는 행렬만 있으면 되므로 coherence, Gibbs sampling과 동시에 진행됨
+# - 단계마다 걸린 시간, CPU 시간, 최대 메모리(os.wait4, Linux/macOS)를 {출력 디렉토리}/pipeline_stats.json에 저장
+#   각 단계의 출력은 {출력 디렉토리}/logs/{단계}.log
+#
+# 단계 (괄호 안은 앞 단계)
+# nouns_raw: noun_extract.py / nouns (nouns_raw): noun_filter.py / matrix (nouns): term_matrix.py
+# coherence_{K} (nouns): 3_topic_coherence.r -m K -M K / coherence (coherence_*): 합치기
+# gibbs (matrix, coherence): 4_gibbs_sampling.r / topwords, proportion, trend, idm (gibbs): 5, 6, 7, 9
+# wordcloud (matrix): 8_wordcloud.r
+#
+# 사용법: run_pipeline.py [-h] -i <articles> [-f <filter>] [-o <directory>] [-j <jobs>] [-m <min>] [-M <max>]
+#                         [-n <words>] [-p <period>] [-t <tagger>] [--rscript <path>] [--force] [--dry-run]
+# -h --help: 도움말
+# -i --input  (스크랩 결과 파일, csv | jsonl.gz | parquet)
+# -f --filter (불용어 파일)
+# -o --output (작업 결과 디렉토리, 기본값 result)
+# -j --jobs   (동시에 실행할 단계 수, 기본값 CPU 코어 수)
+# -m --min-topics (coherence를 계산할 최소 토픽 수, 기본값 5)
+# -M --max-topics (coherence를 계산할 최대 토픽 수, 기본값 15)
+# -n --number (빈도수 상위 단어 수. frequent.csv와 Gibbs sampling에 쓸 단어 수, 기본값 50)
+# -p --period (Topic 비중 변화 분석 기간 1: 일 | 2: 월 | 3: 연, 기본값 2)
+# -t --tagger (형태소 분석기, noun_extract.py의 -t, 기본값 hannanum)
+# --rscript (Rscript 실행 파일, 기본값 Rscript)
+# --force   (기록을 무시하고 모든 단계를 다시 실행)
+# --dry-run (실행하지 않고 실행할 단계만 출력)
+##################################################################################################
+
+import sys  # 시스템 모듈
+import os  # 파일 도구
+import getopt  # 명령행 인수 파서
+import inspect  # 텍스트 도구
+import hashlib  # 내용 해시
+import json  # 기록 파일
+import locale  # 기본 인코딩
+import shutil  # 파일 복사
+import subprocess  # 단계 실행
+import threading  # 동기화 도구
+import time  # 처리 시간
+from concurrent.futures import ThreadPoolExecutor, FIRST_COMPLETED, wait  # 단계 동시 실행
+
+ANALYSIS_DIR = os.path.dirname(os.path.abspath(__file__))  # R 스크립트 디렉토리
+SCRAP_DIR = os.path.join(os.path.dirname(ANALYSIS_DIR), 'scrap')  # 파이썬 스크립트 디렉토리
+
+STATE_FILE = '.pipeline.json'  # 단계별 해시 기록 (출력 디렉토리 안)
+STATS_FILE = 'pipeline_stats.json'  # 단계별 처리 시간과 메모리 (출력 디렉토리 안)
+
+# 단계 결과
+RAN = 'ran'  # 실행함
+CACHED = 'cached'  # 입력이 같아서 건너뜀
+FAILED = 'failed'  # 실패
+BLOCKED = 'blocked'  # 앞 단계가 실패하여 실행하지 않음
+
+
+# 파이프라인 단계
+# command: 실행할 명령 (리스트), function: 명령 다음에 실행할 파이썬 함수 (없어도 됨)
+# inputs: 읽는 파일 (스크립트 포함, 내용이 바뀌면 다시 실행), outputs: 만드는 파일/디렉토리
+# deps: 앞 단계 이름, params: 명령 외에 결과에 영향을 주는 값
+class Stage:
+
+    def __init__(self, name, command=None, function=None, inputs=(), outputs=(), deps=(), params=None):
+        self.name = name
+        self.command = command
+        self.function = function
+        self.inputs = list(inputs)
+        self.outputs = list(outputs)
+        self.deps = list(deps)
+        self.params = params
+
+
+# 단계별 해시 기록. 파일 해시도 (크기, 수정 시각)과 함께 기록해두고 둘 다 같으면 다시 읽지 않음
+class PipelineState:
+
+    def __init__(self, file_name):
+        self.file_name = file_name
+        self._lock = threading.Lock()
+        try:
+            with open(file_name, encoding='utf8') as file:
+                state = json.load(file)
+        except (OSError, ValueError):
+            state = {}
+        self.stages = state.get('stages', {})  # 단계 이름 -> 마지막으로 성공한 실행의 해시
+        self.files = state.get('files', {})  # 파일 경로 -> [크기, 수정 시각, 해시]
+
+    # 파일 내용의 해시. 없는 파일이면 None
+    def file_hash(self, file_name):
+        try:
+            stat = os.stat(file_name)
+        except OSError:
+            return None
+        with self._lock:
+            cached = self.files.get(file_name)
+        if cached is not None and cached[:2] == [stat.st_size, stat.st_mtime_ns]:
+            return cached[2]
+
+        digest = hashlib.sha256()
+        with open(file_name, 'rb') as file:
+            for block in iter(lambda: file.read(1 << 20), b''):
+                digest.update(block)
+        with self._lock:
+            self.files[file_name] = [stat.st_size, stat.st_mtime_ns, digest.hexdigest()]
+        return digest.hexdigest()
+
+    # 단계의 해시. 명령, 값, 입력 파일 내용으로 만듦
+    def stage_key(self, stage):
+        digest = hashlib.sha256(json.dumps([stage.command, stage.params], ensure_ascii=False).encode('utf8'))
+        for file_name in stage.inputs:
+            digest.update(f'\0{file_name}\0{self.file_hash(file_name)}'.encode('utf8'))
+        return digest.hexdigest()
+
+    # 기록과 해시가 같고 출력이 모두 있으면 다시 실행하지 않아도 됨
+    def is_fresh(self, stage, key):
+        with self._lock:
+            if self.stages.get(stage.name) != key:
+                return False
+        return all(os.path.exists(output) for output in stage.outputs)
+
+    # 성공한 단계 기록. 중간에 멈춰도 끝난 단계는 남도록 바로 저장함
+    def record(self, stage, key):
+        with self._lock:
+            self.stages[stage.name] = key
+            self._save()
+
+    def forget(self, stage):  # 실패한 단계는 출력이 남아 있어도 다음에 다시 실행
+        with self._lock:
+            self.stages.pop(stage.name, None)
+            self._save()
+
+    def _save(self):
+        temp_file_name = self.file_name + '.tmp'
+        with open(temp_file_name, 'w', encoding='utf8') as file:
+            json.dump({'stages': self.stages, 'files': self.files}, file, ensure_ascii=False, indent=1)
+        os.replace(temp_file_name, self.file_name)
+
+
+# 단계의 명령을 실행하고 끝날 때까지 기다림. 반환값은 측정값 딕셔너리
+# os.wait4가 있으면 자식 프로세스의 CPU 시간과 최대 메모리(ru_maxrss)도 기록함
+def run_command(stage, log_file_name, processes):
+    stats = {}
+    with open(log_file_name, 'w', encoding='utf8') as log_file:
+        process = subprocess.Popen(stage.command, stdout=log_file, stderr=subprocess.STDOUT, cwd=ANALYSIS_DIR)
+        processes[stage.name] = process
+        try:
+            if hasattr(os, 'wait4'):
+                _, status, usage = os.wait4(process.pid, 0)
+                process.returncode = os.waitstatus_to_exitcode(status)
+                max_rss = usage.ru_maxrss / (1024 * 1024 if sys.platform == 'darwin' else 1024)  # MB
+                stats.update(user=round(usage.ru_utime, 2), system=round(usage.ru_stime, 2),
+                             max_rss_mb=round(max_rss, 1))
+            else:
+                process.wait()
+        finally:
+            processes.pop(stage.name, None)
+
+    if process.returncode != 0:
+        raise RuntimeError(f'Exit Code {process.returncode}, See {log_file_name}')
+    return stats
+
+
+# 단계 하나 실행. 명령, 함수 순서로 실행하고 출력이 모두 생겼는지 확인함
+def run_stage(stage, log_dir_name, processes):
+    start_time = time.monotonic()
+    stats = {}
+    if stage.command is not None:
+        stats = run_command(stage, os.path.join(log_dir_name, f'{stage.name}.log'), processes)
+    if stage.function is not None:
+        stage.function()
+
+    missing = [output for output in stage.outputs if not os.path.exists(output)]
+    if missing:
+        raise RuntimeError(f'Missing Output: {", ".join(missing)}')
+
+    stats['seconds'] = round(time.monotonic() - start_time, 2)
+    return stats
+
+
+# 단계들을 의존 관계 순서로 실행. 앞 단계가 모두 끝난 단계는 jobs개까지 동시에 실행함
+# 반환값은 단계 이름 -> {'status': RAN | CACHED | FAILED | BLOCKED, 측정값...}
+def run_pipeline(stages, state, log_dir_name, jobs, force=False, dry_run=False):
+    pending = {stage.name: stage for stage in stages}
+    results = {}
+    running = {}  # future -> (단계, 해시)
+    processes = {}  # 실행 중인 단계 이름 -> 프로세스 (중단할 때 종료)
+    changed = set()  # --dry-run에서 실행할 단계
+
+    def status_of(name):
+        return results.get(name, {}).get('status')
+
+    # 앞 단계가 모두 끝난 단계를 처리함. 건너뛰는 단계가 있으면 뒤 단계가 준비될 수 있으므로 반복함
+    def schedule(executor):
+        progress = True
+        while progress:
+            progress = False
+            for name, stage in list(pending.items()):
+                if any(status_of(dep) in (FAILED, BLOCKED) for dep in stage.deps):
+                    del pending[name]
+                    results[name] = {'status': BLOCKED}
+                    print(f'Stage {name} [BLOCKED]')
+                    progress = True
+                    continue
+                if any(status_of(dep) not in (RAN, CACHED) for dep in stage.deps):
+                    continue
+                if len(running) >= jobs:
+                    return
+
+                del pending[name]
+                progress = True
+
+                if dry_run:  # 앞 단계를 실행하면 출력이 바뀔 수 있으므로 뒤 단계도 실행할 단계로 봄
+                    if force or any(dep in changed for dep in stage.deps) \
+                            or not state.is_fresh(stage, state.stage_key(stage)):
+                        changed.add(name)
+                        print(f'Stage {name} [RUN]')
+                    else:
+                        print(f'Stage {name} [CACHED]')
+                    results[name] = {'status': CACHED}
+                    continue
+
+                key = state.stage_key(stage)
+                if not force and state.is_fresh(stage, key):
+                    results[name] = {'status': CACHED}
+                    print(f'Stage {name} [CACHED]')
+                    continue
+
+                print(f'Stage {name} Started')
+                running[executor.submit(run_stage, stage, log_dir_name, processes)] = (stage, key)
+
+    with ThreadPoolExecutor(max_workers=jobs) as executor:
+        try:
+            schedule(executor)
+            while running:
+                finished, _ = wait(running, return_when=FIRST_COMPLETED)
+                for future in finished:
+                    stage, key = running.pop(future)
+                    try:
+                        stats = future.result()
+                    except Exception as error:
+                        state.forget(stage)
+                        results[stage.name] = {'status': FAILED, 'error': str(error)}
+                        print(f'Stage {stage.name} [FAILED] {error}')
+                        continue
+
+                    state.record(stage, key)
+                    results[stage.name] = {'status': RAN, **stats}
+                    print(f'Stage {stage.name} [DONE] {format_stats(stats)}')
+                schedule(executor)
+
+        except KeyboardInterrupt:  # 실행 중인 단계를 종료함. 끝난 단계는 기록에 남아 있음
+            print('Pipeline Aborted by KeyboardInterrupt')
+            for process in list(processes.values()):
+                process.terminate()
+            raise
+
+    return results
+
+
+# 측정값 한 줄 요약
+def format_stats(stats):
+    text = f'{stats["seconds"]:.1f}s'
+    if 'max_rss_mb' in stats:
+        text += f', CPU {stats["user"] + stats["system"]:.1f}s, Max RSS {stats["max_rss_mb"]:.0f}MB'
+    return text
+
+
+# 토픽 수별 coherence 파일들을 3_topic_coherence.r의 출력과 같은 형식의 파일 하나로 합침
+def merge_coherence(coherence_file_names, output_file_name):
+    with open(output_file_name, 'w', encoding='utf8', newline='\n') as output_file:
+        output_file.write('"topics", "coherence"\n')
+        for file_name in coherence_file_names:
+            with open(file_name, encoding='utf-8-sig') as file:
+                output_file.writelines(line.rstrip('\r\n') + '\n' for line in list(file)[1:] if line.strip())
+
+
+# IDM 결과 정리. lda.json을 UTF-8로 바꾸고 (Windows에서 R이 기본 인코딩으로 씀) 문서 확인용 index.js 복사
+def finish_idm(idm_dir_name):
+    json_file_name = os.path.join(idm_dir_name, 'lda.json')
+    encoding = locale.getpreferredencoding(False)
+    if os.path.exists(json_file_name) and encoding.lower().replace('-', '') != 'utf8':
+        with open(json_file_name, encoding=encoding) as file:
+            content = file.read()
+        with open(json_file_name, 'w', encoding='utf8') as file:
+            file.write(content)
+    shutil.copy(os.path.join(ANALYSIS_DIR, 'index.js'), os.path.join(idm_dir_name, 'index.js'))
+
+
+# analysis.bat과 같은 단계 구성
+def build_stages(articles_file_name, filter_file_name, output_dir_name, min_topics=5, max_topics=15,
+                 num_words=50, period=2, tagger_name='hannanum', rscript='Rscript'):
+
+    def output(*names):
+        return os.path.join(output_dir_name, *names)
+
+    def python_script(name):
+        return os.path.join(SCRAP_DIR, name)
+
+    def r_script(name):
+        return os.path.join(ANALYSIS_DIR, name)
+
+    def r_command(name, *args):
+        return [rscript, '--encoding=utf8', r_script(name), *args]
+
+    nouns_raw, nouns = output('nouns_raw.csv'), output('nouns.csv')
+    matrix_files = [output(name) for name in ('dtm.mtx', 'vocab.txt', 'frequent.csv', 'lda.txt')]
+    coherence, gibbs = output('coherence.csv'), output('gibbs.RData')
+
+    stages = [
+        Stage('nouns_raw', [sys.executable, python_script('noun_extract.py'), '-i', articles_file_name,
+                            '-o', nouns_raw, '-t', tagger_name],
+              inputs=[python_script('noun_extract.py'), articles_file_name], outputs=[nouns_raw]),
+        Stage('nouns', [sys.executable, python_script('noun_filter.py'), '-i', nouns_raw, '-o', nouns]
+              + (['-f', filter_file_name] if filter_file_name is not None else []),
+              inputs=[python_script('noun_filter.py'), nouns_raw]
+              + ([filter_file_name] if filter_file_name is not None else []),
+              outputs=[nouns], deps=['nouns_raw']),
+        Stage('matrix', [sys.executable, python_script('term_matrix.py'), '-i', nouns, '-o', output_dir_name,
+                         '-n', str(num_words), '-w', str(num_words)],
+              inputs=[python_script('term_matrix.py'), nouns], outputs=matrix_files, deps=['nouns']),
+    ]
+
+    # 토픽 수마다 따로 계산. 범위를 바꿔도 이미 계산한 토픽 수는 다시 계산하지 않음
+    coherence_files = []
+    for num_topics in range(min_topics, max_topics + 1):
+        coherence_file = output('coherence', f'coherence_{num_topics}.csv')
+        coherence_files.append(coherence_file)
+        stages.append(Stage(f'coherence_{num_topics}',
+                            r_command('3_topic_coherence.r', '-i', nouns, '-m', str(num_topics),
+                                      '-M', str(num_topics), '-o', coherence_file),
+                            inputs=[r_script('3_topic_coherence.r'), nouns], outputs=[coherence_file],
+                            deps=['nouns']))
+
+    stages += [
+        Stage('coherence', function=lambda: merge_coherence(coherence_files, coherence),
+              inputs=coherence_files, outputs=[coherence],
+              deps=[f'coherence_{num_topics}' for num_topics in range(min_topics, max_topics + 1)]),
+        Stage('gibbs', r_command('4_gibbs_sampling.r', '-i', nouns, '-d', output_dir_name, '-n', str(num_words),
+                                 '-T', coherence, '-o', gibbs),
+              inputs=[r_script('4_gibbs_sampling.r'), nouns, output('lda.txt'), output('vocab.txt'), coherence],
+              outputs=[gibbs], deps=['matrix', 'coherence']),
+        Stage('topwords', r_command('5_topwords_topics.r', '-i', gibbs, '-o', output('topwords.csv')),
+              inputs=[r_script('5_topwords_topics.r'), gibbs], outputs=[output('topwords.csv')], deps=['gibbs']),
+        Stage('proportion', r_command('6_proportion_topics.r', '-i', gibbs, '-o', output('proportion.csv')),
+              inputs=[r_script('6_proportion_topics.r'), gibbs], outputs=[output('proportion.csv')],
+              deps=['gibbs']),
+        Stage('trend', r_command('7_trend_topics.r', '-i', gibbs, '-p', str(period), '-o', output('trend.csv')),
+              inputs=[r_script('7_trend_topics.r'), gibbs], outputs=[output('trend.csv')], deps=['gibbs']),
+        Stage('wordcloud', r_command('8_wordcloud.r', '-i', output('frequent.csv'), '-o', output('wordcloud')),
+              inputs=[r_script('8_wordcloud.r'), output('frequent.csv')], outputs=[output('wordcloud')],
+              deps=['matrix']),
+        Stage('idm', r_command('9_idm_visualization.r', '-i', gibbs, '-o', output('IDM')),
+              function=lambda: finish_idm(output('IDM')),
+              inputs=[r_script('9_idm_visualization.r'), r_script('index.js'), gibbs],
+              outputs=[output('IDM', 'index.js')], deps=['gibbs']),
+    ]
+    return stages
+
+
+# 커맨드라인 도움말 출력 및 종료
+def print_help(exit_code):
+    print(inspect.cleandoc(
+        '''사용법: [-h] -i <articles> [-f <filter>] [-o <directory>] [-j <jobs>] [-m <min>] [-M <max>]
+                  [-n <words>] [-p <period>] [-t <tagger>] [--rscript <path>] [--force] [--dry-run]
+            -h --help: 도움말
+            -i --input  (스크랩 결과 파일, csv | jsonl.gz | parquet)
+            -f --filter (불용어 파일)
+            -o --output (작업 결과 디렉토리, 기본값 result)
+            -j --jobs   (동시에 실행할 단계 수, 기본값 CPU 코어 수)
+            -m --min-topics (coherence를 계산할 최소 토픽 수, 기본값 5)
+            -M --max-topics (coherence를 계산할 최대 토픽 수, 기본값 15)
+            -n --number (빈도수 상위 단어 수. frequent.csv와 Gibbs sampling에 쓸 단어 수, 기본값 50)
+            -p --period (Topic 비중 변화 분석 기간 1: 일 | 2: 월 | 3: 연, 기본값 2)
+            -t --tagger (형태소 분석기, noun_extract.py의 -t, 기본값 hannanum)
+            --rscript (Rscript 실행 파일, 기본값 Rscript)
+            --force   (기록을 무시하고 모든 단계를 다시 실행)
+            --dry-run (실행하지 않고 실행할 단계만 출력)'''))
+    sys.exit(exit_code)
+
+
+def main(argv):
+
+    articles_file_name = None  # 스크랩 결과 파일명
+    filter_file_name = None  # 불용어 파일명
+    output_dir_name = 'result'  # 작업 결과 디렉토리
+    jobs = os.cpu_count() or 1  # 동시에 실행할 단계 수
+    min_topics = 5  # 최소 토픽 수
+    max_topics = 15  # 최대 토픽 수
+    num_words = 50  # 상위 단어 수
+    period = 2  # 비중 변화 분석 기간
+    tagger_name = 'hannanum'  # 형태소 분석기
+    rscript = 'Rscript'  # Rscript 실행 파일
+    force = False  # 모든 단계를 다시 실행
+    dry_run = False  # 실행할 단계만 출력
+
+    try:  # 명령행 인수 파싱
+        opts, _ = getopt.getopt(argv, 'hi:f:o:j:m:M:n:p:t:',
+                                ['help', 'input=', 'filter=', 'output=', 'jobs=', 'min-topics=', 'max-topics=',
+                                 'number=', 'period=', 'tagger=', 'rscript=', 'force', 'dry-run'])
+
+    except getopt.GetoptError as error:  # 오류 발생 (잘못된 입력)
+        print(error)
+        print_help(1)
+
+    for opt, arg in opts:
+        if opt in ('-h', '--help'):  # 도움말
+            print_help(0)
+        elif opt in ('-i', '--input'):  # 스크랩 결과 파일명
+            articles_file_name = arg
+        elif opt in ('-f', '--filter'):  # 불용어 파일명
+            filter_file_name = arg
+        elif opt in ('-o', '--output'):  # 작업 결과 디렉토리
+            output_dir_name = arg
+        elif opt in ('-j', '--jobs'):  # 동시에 실행할 단계 수
+            jobs = int(arg)
+            if jobs < 1:
+                print_help(1)
+        elif opt in ('-m', '--min-topics'):  # 최소 토픽 수
+            min_topics = int(arg)
+        elif opt in ('-M', '--max-topics'):  # 최대 토픽 수
+            max_topics = int(arg)
+        elif opt in ('-n', '--number'):  # 상위 단어 수
+            num_words = int(arg)
+        elif opt in ('-p', '--period'):  # 비중 변화 분석 기간
+            if arg not in ('1', '2', '3'):
+                print_help(1)
+            period = int(arg)
+        elif opt in ('-t', '--tagger'):  # 형태소 분석기
+            tagger_name = arg
+        elif opt == '--rscript':  # Rscript 실행 파일
+            rscript = arg
+        elif opt == '--force':  # 모든 단계를 다시 실행
+            force = True
+        elif opt == '--dry-run':  # 실행할 단계만 출력
+            dry_run = True
+
+    if articles_file_name is None:  # 스크랩 결과 파일 입력 안함
+        print_help(1)
+
+    if min_topics < 2 or max_topics < min_topics:  # 토픽 수 범위가 잘못됨
+        print_help(1)
+
+    # 단계들은 analysis 디렉토리에서 실행하므로 경로를 모두 절대 경로로 바꿈
+    articles_file_name = os.path.abspath(articles_file_name)
+    filter_file_name = os.path.abspath(filter_file_name) if filter_file_name is not None else None
+    output_dir_name = os.path.abspath(output_dir_name)
+    log_dir_name = os.path.join(output_dir_name, 'logs')
+    os.makedirs(os.path.join(output_dir_name, 'coherence'), exist_ok=True)
+    os.makedirs(log_dir_name, exist_ok=True)
+
+    stages = build_stages(articles_file_name, filter_file_name, output_dir_name, min_topics, max_topics,
+                          num_words, period, tagger_name, rscript)
+    state = PipelineState(os.path.join(output_dir_name, STATE_FILE))
+
+    start_time = time.monotonic()
+    try:
+        results = run_pipeline(stages, state, log_dir_name, jobs, force, dry_run)
+    except KeyboardInterrupt:
+        sys.exit(1)
+    if dry_run:
+        return
+
+    elapsed = time.monotonic() - start_time
+    with open(os.path.join(output_dir_name, STATS_FILE), 'w', encoding='utf8') as file:
+        json.dump({'seconds': round(elapsed, 2), 'stages': results}, file, ensure_ascii=False, indent=1)
+
+    counts = {status: sum(result['status'] == status for result in results.values())
+              for status in (RAN, CACHED, FAILED, BLOCKED)}
+    print(f'Pipeline Completed in {elapsed:.1f}s: {counts[RAN]} Ran, {counts[CACHED]} Cached, '
+          f'{counts[FAILED]} Failed, {counts[BLOCKED]} Blocked')
+    if counts[FAILED] or counts[BLOCKED]:
+        sys.exit(1)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
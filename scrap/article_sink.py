@@ -0,0 +1,321 @@
+##########################################################################
+# 기사 목록/스크랩 결과 저장 형식
+# csv (기본값) | jsonl.gz (압축 JSON Lines) | parquet (열 단위 저장, pyarrow 필요)
+#
+# 행을 모아서 한꺼번에 파일에 내보내고(flush), 내보낸 뒤에 on_flush(keys)를 호출함
+# 작업 기록은 on_flush에서 하므로 기록된 기사는 항상 파일에 들어 있음
+##########################################################################
+
+import os  # 파일 도구
+import csv  # csv 파서
+import gzip  # 압축
+import json  # JSON 도구
+import time  # 내보내기 간격
+import threading  # 동기화 도구
+
+FORMATS = ('csv', 'jsonl.gz', 'parquet')  # 사용 가능한 형식
+EXTENSIONS = {'csv': '.csv', 'jsonl.gz': '.jsonl.gz', 'parquet': '.parquet'}  # 형식별 확장자
+
+LIST_COLUMNS = ('url', 'title')  # 기사 목록 열
+RESULT_COLUMNS = ('date', 'title', 'body')  # 스크랩 결과 열
+PRESS_COLUMN = 'press'  # 여러 언론사를 한 파일에 저장할 때 맨 앞에 붙이는 언론사 열
+
+
+# 파일 이름의 확장자로 형식 판단
+def format_of(file_name):
+    for name, extension in EXTENSIONS.items():
+        if file_name.endswith(extension):
+            return name
+    return 'csv'
+
+
+# 저장 형식 공통 부분
+# 행을 flush_rows개 쓰거나 마지막으로 내보낸 뒤 flush_interval초가 지나면 내보냄
+# 중단(SIGINT)으로 메인 스레드가 닫은 뒤에 도착한 행은 버림. 작업 기록에 없으므로 다시 실행하면 다시 작업함
+class ArticleSink:
+
+    FLUSH_ROWS = 100  # 한 번에 내보낼 행 수
+    FLUSH_INTERVAL = 1.0  # 최대 내보내기 간격 (초), None이면 행 수만 봄
+
+    def __init__(self, file_name, columns, resume=False, on_flush=None):
+        self.file_name = file_name
+        self.columns = tuple(columns)
+        self.on_flush = on_flush  # 내보낸 뒤 호출할 함수, 내보낸 행의 key 목록을 받음
+
+        self._keys = []  # 아직 내보내지 않은 행의 key
+        self._num_unflushed = 0  # 아직 내보내지 않은 행 수
+        self._last_flush = time.monotonic()
+        self._lock = threading.RLock()  # 기록 스레드와 메인 스레드(닫기) 사이 보호
+        self._closed = False
+
+        self._open(resume and os.path.exists(file_name))
+
+    def _open(self, append):  # 파일 열기. append가 아니면 새로 만듦
+        raise NotImplementedError
+
+    def _write_row(self, row):  # 행 하나 쓰기
+        raise NotImplementedError
+
+    def _flush_file(self):  # 쓴 행을 파일에 내보냄
+        raise NotImplementedError
+
+    def _close_file(self):
+        raise NotImplementedError
+
+    # 행 쓰기. key는 내보낸 뒤 on_flush로 넘겨줌
+    def write(self, row, key=None):
+        with self._lock:
+            if self._closed:
+                return
+
+            self._write_row(row)
+            self._num_unflushed += 1
+            if key is not None:
+                self._keys.append(key)
+
+            if self._num_unflushed >= self.FLUSH_ROWS or (
+                    self.FLUSH_INTERVAL is not None
+                    and time.monotonic() - self._last_flush >= self.FLUSH_INTERVAL):
+                self.flush()
+
+    def flush(self):
+        with self._lock:
+            if self._closed:
+                return
+
+            if self._num_unflushed > 0:
+                self._flush_file()
+
+            keys, self._keys = self._keys, []
+            self._num_unflushed = 0
+            self._last_flush = time.monotonic()
+
+            if keys and self.on_flush is not None:
+                self.on_flush(keys)
+
+    def close(self):
+        with self._lock:
+            self.flush()
+            self._closed = True
+            self._close_file()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+# CSV. 모든 필드를 따옴표로 감싸고 필드 안의 따옴표는 두 번 씀
+class CsvSink(ArticleSink):
+
+    def _open(self, append):
+        if append:
+            append = CsvSink._repair(self.file_name)  # 머리글까지 잘렸으면 새로 씀
+        self._file = open(self.file_name, 'a' if append else 'w', encoding='utf8', newline='')
+        self._writer = csv.writer(self._file, quoting=csv.QUOTE_ALL, lineterminator='\n')
+        if not append:
+            self._writer.writerow(self.columns)
+
+    # 중간에 멈춰서 끝이 잘린 파일이면 마지막 온전한 행까지만 남김. 머리글이 남아 있으면 True
+    # 온전한 행: 줄바꿈으로 끝나고 열 수가 머리글과 같은 행
+    # csv.reader는 온전한 행을 그 행의 마지막 줄까지만 읽고 돌려주므로, 파일 끝까지 읽은 뒤에 나온 행은
+    # 본문 안의 줄바꿈에서 잘린 행
+    # 잘린 곳이 UTF-8 글자 중간이면 그 줄을 읽다가 UnicodeDecodeError가 나므로 거기서 멈춤
+    @staticmethod
+    def _repair(file_name):
+        offset = 0  # 읽은 바이트 수
+        line_complete = False  # 마지막으로 읽은 줄이 줄바꿈으로 끝남
+        at_end = False  # 파일 끝까지 읽음
+        end = 0  # 마지막 온전한 행의 끝
+        num_columns = None  # 머리글의 열 수
+
+        with open(file_name, 'rb') as csv_file:
+            def lines():
+                nonlocal offset, line_complete, at_end
+                for line in csv_file:
+                    offset += len(line)
+                    line_complete = line.endswith(b'\n')
+                    yield line.decode('utf8')
+                at_end = True
+
+            try:
+                for row in csv.reader(lines()):
+                    if num_columns is None:
+                        num_columns = len(row)
+                    if at_end or not line_complete or len(row) != num_columns:
+                        break
+                    end = offset
+            except (csv.Error, UnicodeDecodeError):  # 글자가 잘린 행
+                pass
+
+        if end < os.path.getsize(file_name):
+            with open(file_name, 'r+b') as csv_file:
+                csv_file.truncate(end)
+        return end > 0
+
+    def _write_row(self, row):
+        self._writer.writerow([row[column] for column in self.columns])
+
+    def _flush_file(self):
+        self._file.flush()
+
+    def _close_file(self):
+        self._file.close()
+
+
+# 압축 JSON Lines. 한 줄에 기사 하나
+# 이어 쓸 때는 gzip 멤버를 하나 더 덧붙임 (gzip, R gzfile 모두 이어서 읽음)
+class JsonlGzipSink(ArticleSink):
+
+    def _open(self, append):
+        if append:
+            JsonlGzipSink._repair(self.file_name)
+        self._file = gzip.open(self.file_name, 'at' if append else 'wt', encoding='utf8')
+
+    # 중간에 멈춰서 끝이 잘린 파일이면 온전한 줄만 남김
+    @staticmethod
+    def _repair(file_name):
+        lines = []
+        try:
+            with gzip.open(file_name, 'rt', encoding='utf8') as jsonl_file:
+                for line in jsonl_file:
+                    lines.append(line)
+            return  # 온전한 파일
+        except (EOFError, gzip.BadGzipFile, UnicodeDecodeError):
+            pass
+
+        if lines and not lines[-1].endswith('\n'):  # 쓰다 만 줄
+            lines.pop()
+
+        temp_file_name = file_name + '.tmp'
+        with gzip.open(temp_file_name, 'wt', encoding='utf8') as jsonl_file:
+            jsonl_file.writelines(lines)
+        os.replace(temp_file_name, file_name)
+
+    def _write_row(self, row):
+        self._file.write(json.dumps({column: row[column] for column in self.columns},
+                                    ensure_ascii=False) + '\n')
+
+    def _flush_file(self):
+        self._file.flush()  # 여기까지 압축을 풀 수 있도록 내보냄 (Z_SYNC_FLUSH)
+
+    def _close_file(self):
+        self._file.close()
+
+
+# Parquet. 내보낼 때마다 행 그룹 하나를 씀
+# 파일 끝의 메타데이터를 닫을 때 쓰므로 이어 쓰기는 지원하지 않음
+class ParquetSink(ArticleSink):
+
+    FLUSH_ROWS = 10000  # 행 그룹 크기
+    FLUSH_INTERVAL = None
+
+    def _open(self, append):
+        import pyarrow  # 열 단위 저장 형식
+        import pyarrow.parquet
+
+        if append:
+            raise ValueError('Parquet Output cannot be Resumed')
+
+        self._schema = pyarrow.schema([(column, pyarrow.string()) for column in self.columns])
+        self._writer = pyarrow.parquet.ParquetWriter(self.file_name, self._schema, compression='zstd')
+        self._rows = {column: [] for column in self.columns}
+
+    def _write_row(self, row):
+        for column in self.columns:
+            self._rows[column].append(row[column])
+
+    def _flush_file(self):
+        import pyarrow
+
+        self._writer.write_table(pyarrow.table(self._rows, schema=self._schema))
+        self._rows = {column: [] for column in self.columns}
+
+    def _close_file(self):
+        self._writer.close()
+
+
+# 파일에 쓰지 않는 저장 객체. on_flush만 호출하여 작업 기록과 중복 기사 색인에는 남김
+# scrap_articles.py --nouns로 목록 파일 없이 수집할 때 사용
+class NullSink(ArticleSink):
+
+    def __init__(self, columns, on_flush=None):
+        super().__init__(os.devnull, columns, on_flush=on_flush)
+
+    def _open(self, append):
+        pass
+
+    def _write_row(self, row):
+        pass
+
+    def _flush_file(self):
+        pass
+
+    def _close_file(self):
+        pass
+
+
+# 형식에 맞는 저장 객체 생성
+def open_sink(sink_format, file_name, columns, resume=False, on_flush=None):
+    if sink_format == 'csv':
+        return CsvSink(file_name, columns, resume, on_flush)
+    if sink_format == 'jsonl.gz':
+        return JsonlGzipSink(file_name, columns, resume, on_flush)
+    if sink_format == 'parquet':
+        return ParquetSink(file_name, columns, resume, on_flush)
+    raise ValueError(f'Unknown Format: {sink_format}')
+
+
+# 저장된 파일의 열 이름. 형식은 확장자로 판단. 머리글도 없는 빈 파일이면 None
+def read_columns(file_name):
+    file_format = format_of(file_name)
+
+    if file_format == 'parquet':
+        import pyarrow.parquet
+
+        return tuple(pyarrow.parquet.read_schema(file_name).names)
+
+    if file_format == 'jsonl.gz':  # 머리글이 없으므로 첫 줄의 키
+        with gzip.open(file_name, 'rt', encoding='utf8') as jsonl_file:
+            try:
+                line = jsonl_file.readline()
+            except EOFError:  # 끝이 잘린 파일
+                return None
+        if not line.endswith('\n'):
+            return None
+        return tuple(json.loads(line).keys())
+
+    with open(file_name, 'r', encoding='utf8', newline='') as csv_file:
+        header = next(csv.reader(csv_file, skipinitialspace=True), None)
+    return tuple(header) if header else None
+
+
+# 저장된 기사를 딕셔너리로 하나씩 반환하는 제너레이터. 형식은 확장자로 판단
+# columns를 주면 그 열만 읽음 (parquet은 다른 열을 파일에서 읽지도 않음)
+def read_articles(file_name, columns=None):
+    file_format = format_of(file_name)
+
+    if file_format == 'parquet':
+        import pyarrow.parquet
+
+        parquet_file = pyarrow.parquet.ParquetFile(file_name)
+        for batch in parquet_file.iter_batches(columns=list(columns) if columns is not None else None):
+            yield from batch.to_pylist()
+
+    elif file_format == 'jsonl.gz':
+        with gzip.open(file_name, 'rt', encoding='utf8') as jsonl_file:
+            try:
+                for line in jsonl_file:
+                    if not line.endswith('\n'):  # 쓰다 만 줄
+                        break
+                    row = json.loads(line)
+                    yield row if columns is None else {column: row[column] for column in columns}
+            except EOFError:  # 끝이 잘린 파일
+                pass
+
+    else:
+        # 예전 형식 ("url", "title" 처럼 쉼표 뒤에 공백이 있는 머리글)도 읽을 수 있도록 공백 무시
+        with open(file_name, 'r', encoding='utf8', newline='') as csv_file:
+            for row in csv.DictReader(csv_file, skipinitialspace=True):
+                yield row if columns is None else {column: row[column] for column in columns}
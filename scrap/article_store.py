@@ -0,0 +1,328 @@
+##################################################################################################
+# 기사 저장소 (SQLite + FTS5)
+# 스크랩한 기사를 링크마다 한 행으로 쌓아두고 언론사, 날짜, 링크와 제목/본문 전문 검색으로 골라서 꺼냄
+# CSV 결과 파일은 한 달, 검색어 하나만 필요해도 전체를 읽어야 하지만, 저장소는 색인으로 필요한 기사만 읽음
+# - articles: 링크(UNIQUE), 언론사, 날짜, 제목, 본문. (언론사, 날짜)와 날짜에 색인
+# - articles_fts: 제목/본문 전문 색인 (FTS5, 외부 내용 테이블). 트리거로 articles와 같이 바뀜
+# 같은 링크를 다시 저장하면 새 내용으로 바꿈. 여러 실행, 여러 검색어의 결과를 한 저장소에 쌓아도 됨
+#
+# 스크랩하면서 저장하려면 scrap_articles.py --store <저장소 파일명>
+# 기사는 모아서 짧은 트랜잭션으로 쓰므로 같은 저장소를 쓰는 다른 작업자(--worker)가 오래 기다리지 않음
+# 결과 파일을 내보낼 때도 저장소에 쓴 뒤 작업 기록에 남기므로, 작업 기록에 있는 기사는 저장소에도 있음
+#
+# 전문 검색은 공백 단위(unicode61)로 나눈 단어로 찾음. 한국어는 조사가 붙으므로 -k는 단어로 시작하는
+# 낱말을 찾음 (-k 코로나 -> 코로나, 코로나가, 코로나19 ...). FTS5 검색식을 그대로 쓰려면 -m
+#
+# 사용법: article_store.py [-h] -i <store> [-o <output>] [-f <format>] [-p <press,...>]
+#                          [--since <date>] [--until <date>] [-k <keyword,...>] [-m <match>] [-n <number>]
+#                          [-c <column,...>]
+# -h --help: 도움말
+# -i --input   (저장소 파일명)
+# -o --output  (출력 파일명. 형식은 확장자로 판단 (.csv, .jsonl.gz, .parquet), 기본값 표준 출력)
+# -f --format  (표준 출력 형식 csv | jsonl, 기본값 csv)
+# -p --press   (언론사, 쉼표로 여러 개)
+# --since      (이 날짜부터, YYYY-MM-DD)
+# --until      (이 날짜까지, YYYY-MM-DD)
+# -k --keyword (제목이나 본문에 있어야 할 단어, 쉼표로 여러 개면 모두 있는 기사)
+# -m --match   (FTS5 검색식, 예: "코로나* OR 백신*")
+# -n --number  (최대 기사 수)
+# -c --columns (출력할 열, 쉼표로 구분. 기본값 press,date,title,body. url도 쓸 수 있음)
+##################################################################################################
+
+import sys  # 시스템 모듈
+import csv  # CSV 출력
+import json  # JSON 출력
+import sqlite3  # SQLite 데이터베이스
+import getopt  # 명령행 인수 파서
+import inspect  # 텍스트 도구
+import threading  # 동기화 도구
+import time  # 처리 시간
+
+import article_sink  # 저장 형식
+
+COLUMNS = ('press', 'url', 'date', 'title', 'body')  # 저장소의 열
+EXPORT_COLUMNS = ('press', 'date', 'title', 'body')  # 기본 출력 열 (여러 언론사 결과 파일과 같음)
+
+
+class ArticleStore:
+
+    def __init__(self, path, timeout=30.0):
+        self.path = path  # 저장소 파일 경로
+
+        # 기록 스레드(쓰기)와 메인 스레드(닫기)가 같은 연결을 쓰므로 잠금으로 보호함
+        self._lock = threading.RLock()
+        self._connection = sqlite3.connect(path, timeout=timeout, check_same_thread=False)
+        self._connection.execute('PRAGMA journal_mode=WAL')  # 스크랩하는 동안에도 다른 프로세스가 읽을 수 있음
+        self._connection.execute('PRAGMA synchronous=NORMAL')
+        self._connection.executescript('''
+            CREATE TABLE IF NOT EXISTS articles (
+                id INTEGER PRIMARY KEY,
+                url TEXT UNIQUE NOT NULL,
+                press TEXT,
+                date TEXT,
+                title TEXT,
+                body TEXT);
+            CREATE INDEX IF NOT EXISTS articles_press_date ON articles (press, date);
+            CREATE INDEX IF NOT EXISTS articles_date ON articles (date);
+
+            CREATE VIRTUAL TABLE IF NOT EXISTS articles_fts USING fts5 (
+                title, body, content='articles', content_rowid='id');
+            CREATE TRIGGER IF NOT EXISTS articles_insert AFTER INSERT ON articles BEGIN
+                INSERT INTO articles_fts (rowid, title, body) VALUES (new.id, new.title, new.body);
+            END;
+            CREATE TRIGGER IF NOT EXISTS articles_delete AFTER DELETE ON articles BEGIN
+                INSERT INTO articles_fts (articles_fts, rowid, title, body)
+                    VALUES ('delete', old.id, old.title, old.body);
+            END;
+            CREATE TRIGGER IF NOT EXISTS articles_update AFTER UPDATE ON articles BEGIN
+                INSERT INTO articles_fts (articles_fts, rowid, title, body)
+                    VALUES ('delete', old.id, old.title, old.body);
+                INSERT INTO articles_fts (rowid, title, body) VALUES (new.id, new.title, new.body);
+            END;
+        ''')
+
+    # 기사 여러 개를 한 트랜잭션으로 저장. items: [(행, 링크), ...]
+    # 같은 링크가 있으면 새 내용으로 바꿈. 쓰는 동안만 쓰기 잠금을 잡음
+    def add_many(self, items):
+        with self._lock:
+            with self._connection:  # 끝나면 commit, 오류가 나면 rollback
+                self._connection.executemany(
+                    'INSERT INTO articles (url, press, date, title, body) VALUES (?, ?, ?, ?, ?) '
+                    'ON CONFLICT (url) DO UPDATE SET '
+                    'press = excluded.press, date = excluded.date, title = excluded.title, body = excluded.body',
+                    [(url, row.get('press'), row.get('date'), row.get('title'), row.get('body'))
+                     for row, url in items])
+
+    # 조건에 맞는 기사를 딕셔너리로 하나씩 반환하는 제너레이터. 최신 기사부터 (같은 날짜는 저장한 순서)
+    # presses: 언론사 목록, since/until: 날짜 범위 (양 끝 포함), match: FTS5 검색식
+    def query(self, presses=None, since=None, until=None, match=None, columns=EXPORT_COLUMNS, limit=None):
+        for column in columns:
+            if column not in COLUMNS:
+                raise ValueError(f'Unknown Column: {column}')
+
+        conditions, params = [], []
+        if match is not None:
+            conditions.append('articles.id IN (SELECT rowid FROM articles_fts WHERE articles_fts MATCH ?)')
+            params.append(match)
+        if presses:
+            conditions.append(f'press IN ({",".join("?" * len(presses))})')
+            params.extend(presses)
+        if since is not None:
+            conditions.append('date >= ?')
+            params.append(since)
+        if until is not None:
+            conditions.append('date <= ?')
+            params.append(until)
+
+        sql = f'SELECT {", ".join(columns)} FROM articles'
+        if conditions:
+            sql += ' WHERE ' + ' AND '.join(conditions)
+        sql += ' ORDER BY date DESC, id'
+        if limit is not None:
+            sql += ' LIMIT ?'
+            params.append(limit)
+
+        # 읽기는 따로 커서를 열어 조금씩 가져옴 (전체를 메모리에 올리지 않음)
+        cursor = self._connection.execute(sql, params)
+        try:
+            for values in cursor:
+                yield dict(zip(columns, values))
+        finally:
+            cursor.close()
+
+    def count(self):
+        with self._lock:
+            return self._connection.execute('SELECT COUNT(*) FROM articles').fetchone()[0]
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
+
+
+# 단어들로 FTS5 검색식 만들기. 단어로 시작하는 낱말이 모두 있는 기사 ("코로나"* "백신"*)
+def keyword_match(keywords):
+    return ' '.join('"' + keyword.replace('"', '""') + '"*' for keyword in keywords)
+
+
+# 결과 저장 객체에 저장소를 덧붙임. 쓰는 행은 저장소에도 넣음 (key가 링크)
+# 행은 모았다가 COMMIT_ROWS개나 COMMIT_INTERVAL초마다 한 트랜잭션으로 씀
+# 결과 파일의 내보내기 주기(parquet은 10000행)와 상관없이 짧게 쓰므로 다른 작업자가 저장소를 오래 기다리지 않음
+# 저장 객체가 파일에 내보낸 뒤, 작업 기록(on_flush)에 남기기 전에 남은 행도 저장소에 씀
+# 잠금 순서는 항상 이 객체의 잠금 -> 저장 객체의 잠금 (내보내기 알림은 저장 객체의 잠금 안에서 옴)
+class StoreSink:
+
+    COMMIT_ROWS = 100  # 한 번에 쓸 행 수
+    COMMIT_INTERVAL = 1.0  # 최대 쓰기 간격 (초)
+
+    def __init__(self, sink, store):
+        self.sink = sink
+        self.store = store
+        self.columns = sink.columns
+
+        self._lock = threading.RLock()
+        self._closed = False
+        self._items = []  # 아직 저장소에 쓰지 않은 (행, 링크)
+        self._last_commit = time.monotonic()
+        self._on_flush = sink.on_flush
+        sink.on_flush = self._flushed
+
+    def _commit(self):  # 모아둔 행을 저장소에 씀
+        with self._lock:
+            items, self._items = self._items, []
+            if items:
+                self.store.add_many(items)
+            self._last_commit = time.monotonic()
+
+    def _flushed(self, keys):
+        self._commit()
+        if self._on_flush is not None:
+            self._on_flush(keys)
+
+    def write(self, row, key=None):
+        with self._lock:
+            if self._closed:  # 중단으로 닫은 뒤에 도착한 행
+                return
+            self._items.append((row, key))
+            self.sink.write(row, key)
+            if len(self._items) >= self.COMMIT_ROWS or time.monotonic() - self._last_commit >= self.COMMIT_INTERVAL:
+                self._commit()
+
+    def flush(self):
+        with self._lock:
+            self.sink.flush()
+
+    def close(self):
+        with self._lock:
+            self._closed = True
+            try:
+                self.sink.close()
+                self._commit()  # key 없이 쓴 행 등 내보내기 알림이 없었던 행
+            finally:
+                self.store.close()
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, *args):
+        self.close()
+
+
+# 조회 결과를 표준 출력에 씀 (csv는 결과 파일과 같은 형식, jsonl은 한 줄에 기사 하나)
+def write_stdout(rows, columns, output_format):
+    if output_format == 'jsonl':
+        for row in rows:
+            sys.stdout.write(json.dumps(row, ensure_ascii=False) + '\n')
+    else:
+        writer = csv.writer(sys.stdout, quoting=csv.QUOTE_ALL, lineterminator='\n')
+        writer.writerow(columns)
+        for row in rows:
+            writer.writerow([row[column] for column in columns])
+
+
+# 커맨드라인 도움말 출력 및 종료
+def print_help(exit_code):
+    print(inspect.cleandoc(
+        '''사용법: [-h] -i <store> [-o <output>] [-f <format>] [-p <press,...>] [--since <date>] [--until <date>]
+                  [-k <keyword,...>] [-m <match>] [-n <number>] [-c <column,...>]
+            -h --help: 도움말
+            -i --input   (저장소 파일명, scrap_articles.py --store로 만든 파일)
+            -o --output  (출력 파일명. 형식은 확장자로 판단 (.csv, .jsonl.gz, .parquet), 기본값 표준 출력)
+            -f --format  (표준 출력 형식 csv | jsonl, 기본값 csv)
+            -p --press   (언론사, 쉼표로 여러 개)
+            --since      (이 날짜부터, YYYY-MM-DD)
+            --until      (이 날짜까지, YYYY-MM-DD)
+            -k --keyword (제목이나 본문에 있어야 할 단어, 쉼표로 여러 개면 모두 있는 기사. 조사가 붙은 낱말도 찾음)
+            -m --match   (FTS5 검색식, 예: "코로나* OR 백신*")
+            -n --number  (최대 기사 수)
+            -c --columns (출력할 열, 쉼표로 구분. 기본값 press,date,title,body. url도 쓸 수 있음)'''))
+    sys.exit(exit_code)
+
+
+def main(argv):
+
+    store_file_name = None  # 저장소 파일명
+    output_file_name = None  # 출력 파일명. None이면 표준 출력
+    output_format = 'csv'  # 표준 출력 형식
+    presses = None  # 언론사
+    since = None  # 시작 날짜
+    until = None  # 끝 날짜
+    keywords = []  # 검색 단어
+    match = None  # FTS5 검색식
+    limit = None  # 최대 기사 수
+    columns = EXPORT_COLUMNS  # 출력할 열
+
+    try:  # 명령행 인수 파싱
+        opts, _ = getopt.getopt(argv, 'hi:o:f:p:k:m:n:c:',
+                                ['help', 'input=', 'output=', 'format=', 'press=', 'since=', 'until=',
+                                 'keyword=', 'match=', 'number=', 'columns='])
+
+    except getopt.GetoptError as error:  # 오류 발생 (잘못된 입력)
+        print(error)
+        print_help(1)
+
+    for opt, arg in opts:
+        if opt in ('-h', '--help'):  # 도움말
+            print_help(0)
+        elif opt in ('-i', '--input'):  # 저장소 파일명
+            store_file_name = arg
+        elif opt in ('-o', '--output'):  # 출력 파일명
+            output_file_name = arg
+        elif opt in ('-f', '--format'):  # 표준 출력 형식
+            if arg not in ('csv', 'jsonl'):
+                print_help(1)
+            output_format = arg
+        elif opt in ('-p', '--press'):  # 언론사
+            presses = arg.split(',')
+        elif opt == '--since':  # 시작 날짜
+            since = arg
+        elif opt == '--until':  # 끝 날짜
+            until = arg
+        elif opt in ('-k', '--keyword'):  # 검색 단어
+            keywords = [keyword for keyword in arg.split(',') if keyword]
+        elif opt in ('-m', '--match'):  # FTS5 검색식
+            match = arg
+        elif opt in ('-n', '--number'):  # 최대 기사 수
+            limit = int(arg)
+        elif opt in ('-c', '--columns'):  # 출력할 열
+            columns = tuple(arg.split(','))
+            if any(column not in COLUMNS for column in columns):
+                print_help(1)
+
+    if store_file_name is None:  # 저장소 입력 안함
+        print_help(1)
+
+    if keywords:  # 단어와 검색식을 함께 주면 둘 다 만족하는 기사
+        match = keyword_match(keywords) + (f' AND ({match})' if match is not None else '')
+
+    start_time = time.monotonic()
+    store = ArticleStore(store_file_name)
+    try:
+        rows = store.query(presses, since, until, match, columns, limit)
+        num_articles = 0
+
+        def counted():
+            nonlocal num_articles
+            for row in rows:
+                num_articles += 1
+                yield row
+
+        if output_file_name is None:
+            write_stdout(counted(), columns, output_format)
+        else:
+            with article_sink.open_sink(article_sink.format_of(output_file_name), output_file_name,
+                                        columns) as sink:
+                for row in counted():
+                    sink.write(row)
+    except sqlite3.OperationalError as error:  # 잘못된 검색식
+        print(f'Query Failed: {error}', file=sys.stderr)
+        sys.exit(1)
+    finally:
+        store.close()
+
+    # 표준 출력은 데이터이므로 진행 상황은 표준 오류에 씀
+    print(f'Exported {num_articles} Articles in {time.monotonic() - start_time:.2f}s',
+          file=sys.stderr if output_file_name is None else sys.stdout)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
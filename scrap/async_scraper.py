@@ -0,0 +1,168 @@
+##########################################################################
+# asyncio 기반 기사 스크래퍼
+# 하나의 이벤트 루프에서 수천 개의 요청을 동시에 처리함
+# 검색 주소 계산과 페이지 분석은 언론사별 동기 스크래퍼(scraper_press)의 것을 그대로 사용
+##########################################################################
+
+import asyncio  # 비동기 이벤트 루프
+import random  # 백오프 지터
+import time  # 요청 시간 측정
+
+import aiohttp  # 비동기 HTTP 클라이언트
+
+import metrics  # 단계별 처리 시간 측정
+import rate_limiter  # 호스트별 요청 속도 조절
+import response_cache  # HTTP 응답 디스크 캐시
+
+
+# 비동기 스크래퍼
+# async with 문 안에서 사용해야 연결 풀이 열리고 닫힘
+class AsyncScraper:
+
+    RETRY_STATUS = (429, 500, 502, 503, 504)  # 재시도할 응답 코드
+    THROTTLE_RETRIES = 10  # 과부하 응답(429, 503, 504)은 retries와 별도로 이만큼 더 재시도함
+
+    def __init__(self, scraper, concurrency=100, timeout=30, retries=3, backoff=0.5):
+        self.scraper = scraper  # 분석을 맡을 언론사별 스크래퍼
+        self.concurrency = concurrency  # 동시에 진행할 최대 요청 수
+        self.timeout = timeout  # 읽기 타임아웃 초
+        self.retries = retries  # 최대 재시도 횟수
+        self.backoff = backoff  # 첫 재시도 대기 시간 (초), 매번 두 배로 늘어남
+
+        self._semaphore = None
+        self._session = None
+
+    async def __aenter__(self):
+        self._semaphore = asyncio.Semaphore(self.concurrency)
+        self._session = aiohttp.ClientSession(
+            connector=aiohttp.TCPConnector(limit=self.concurrency, limit_per_host=self.concurrency),
+            timeout=aiohttp.ClientTimeout(sock_connect=5, sock_read=self.timeout))
+        return self
+
+    async def __aexit__(self, *args):
+        await self._session.close()
+
+    async def _wait(self, attempt, retry_after=None):  # 지수 백오프 대기 (지터 포함), Retry-After가 더 길면 따름
+        delay = self.backoff * (2 ** min(attempt, 6)) * random.uniform(0.5, 1.5)
+        await asyncio.sleep(max(delay, retry_after or 0))
+
+    async def _request_text(self, url):  # HTTP GET 후 본문 텍스트 반환, 실패 시 재시도
+        limiter = rate_limiter.get_limiter(url)
+        attempt = 0  # 재시도 횟수
+        throttled = 0  # 그 중 과부하 응답으로 재시도한 횟수
+
+        while True:
+            retry_after = None
+            is_throttled = False
+
+            async with self._semaphore:
+                start = await limiter.acquire_async()
+                try:
+                    async with self._session.get(url) as response:
+                        retry_after = rate_limiter.parse_retry_after(response.headers.get('Retry-After'))
+                        is_throttled = response.status in rate_limiter.THROTTLE_STATUS
+
+                        if response.status in AsyncScraper.RETRY_STATUS and (
+                                attempt - throttled < self.retries
+                                or (is_throttled and throttled < AsyncScraper.THROTTLE_RETRIES)):
+                            print(f'HTTP {response.status}, Retry [{attempt + 1}] {url}')
+                            metrics.count('retried')
+                            if is_throttled and throttled < AsyncScraper.THROTTLE_RETRIES:
+                                throttled += 1
+                        else:
+                            response.raise_for_status()
+                            text = await response.text()
+                            # 세마포어와 조절기 대기 시간은 빼고 측정
+                            metrics.observe('fetch', time.monotonic() - start)
+                            return text
+
+                except (aiohttp.ClientConnectionError, asyncio.TimeoutError) as error:
+                    is_throttled = True  # 연결 실패와 타임아웃도 과부하 신호로 봄
+                    if attempt - throttled >= self.retries:
+                        raise error
+                    print(f'{type(error).__name__}, Retry [{attempt + 1}] {url}')
+                    metrics.count('retried')
+
+                finally:
+                    limiter.release(start, throttled=is_throttled, retry_after=retry_after)
+
+            await self._wait(attempt, retry_after)
+            attempt += 1
+
+    async def _get_text(self, url, kind='article'):  # 페이지 내용 반환. 캐시를 설정했으면 캐시를 먼저 확인
+        cache = response_cache.get_cache()
+        if cache is None:
+            return await self._request_text(url)
+
+        # 파일 입출력과 압축은 이벤트 루프를 막지 않도록 스레드에서
+        text = await asyncio.to_thread(cache.get, url, kind)
+        if text is None:
+            if cache.offline:  # 오프라인 모드에서는 네트워크에 접근하지 않음
+                raise response_cache.CacheMissError(url)
+            text = await self._request_text(url)
+            await asyncio.to_thread(cache.put, url, text)
+        return text
+
+    async def _fetch_search_page(self, page_url):
+        with metrics.press_label(self.scraper.PRESS):
+            text = await self._get_text(page_url, 'page')
+            return self.scraper._parse_timed(self.scraper._parse_search_page, text, 'parse_page')
+
+    # {'url': (링크), 'title': (제목)} 딕셔너리를 비동기 제너레이터로 반환
+    # 검색 결과 페이지를 page_window개씩 동시에 요청하고 페이지 순서대로 반환함
+    async def collect_articles(self, collect_count, ignore_count, query_word, detail_word):
+        page_urls, skip = self.scraper._collect_plan(
+            collect_count, ignore_count, query_word, detail_word)
+        page_urls = iter(page_urls)
+
+        num = 0  # 찾은 기사 수
+        tasks = []  # 요청 순서대로 보관
+
+        def submit_next():
+            # 이미 빈 페이지가 도착했으면 더 요청하지 않음
+            for task in tasks:
+                if task.done() and not task.cancelled() and task.exception() is None \
+                        and not task.result():
+                    return
+            page_url = next(page_urls, None)
+            if page_url is not None:
+                tasks.append(asyncio.ensure_future(self._fetch_search_page(page_url)))
+
+        try:
+            for _ in range(self.scraper.page_window):
+                submit_next()
+
+            while tasks:
+                articles = await tasks.pop(0)
+                if not articles:  # 검색 결과 끝
+                    return
+                submit_next()
+
+                for article in articles:
+                    # 기사 무시
+                    if skip > 0:
+                        print(f'Ignored Article, {skip} left.')
+                        skip -= 1
+                        continue
+
+                    # 목표 기사 수 도달
+                    if num >= collect_count:
+                        return
+
+                    yield article
+                    num += 1
+
+        finally:  # 남은 요청 취소
+            for task in tasks:
+                task.cancel()
+
+    # {'date': (날짜), 'title': (제목), 'body': (내용)} 딕셔너리로 반환
+    async def scrap_articles(self, article_url):
+        with metrics.press_label(self.scraper.PRESS):
+            text = await self._get_text(article_url, 'article')
+            return self.scraper._parse_timed(self.scraper._parse_article, text, 'parse')
+
+    # 기사 페이지를 받아오기만 함 (분석은 scraper.parse_article로 따로 함)
+    async def fetch_article(self, article_url):
+        with metrics.press_label(self.scraper.PRESS):
+            return await self._get_text(article_url, 'article')
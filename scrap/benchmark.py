@@ -0,0 +1,263 @@
+##########################################################################
+# 스크래퍼 성능 측정
+# 로컬 대역 서버(fixture_server)를 띄우고 scrap_articles.py를 별도 프로세스로 실행하여
+# 기사 수, 응답 지연, 동시 작업 수를 바꿔가며 처리 속도를 측정함. 실제 사이트에는 접속하지 않음
+#
+# 사용법: benchmark.py [-h] [-p <press,...>] [-m <mode,...>] [-n <number,...>] [-L <latency,...>]
+#                     [-j <jobs,...>] [--async <concurrency,...>] [--parser <parser>]
+#                     [--parse-procs <processes,...>] [-o <output>]
+# -h --help: 도움말
+# -p --press   (측정할 언론사, 기본값 joongang,donga,chosun)
+# -m --mode    (측정할 작업 collect | scrap | both, 기본값 collect,scrap,both)
+# -n --number  (수집/스크랩할 기사 수, 기본값 200)
+# -L --latency (대역 서버 응답 지연 ms, 기본값 20)
+# -j --jobs    (스레드 엔진 작업자 수, 기본값 1,8)
+# --async      (asyncio 엔진 동시 요청 수, 주면 asyncio 엔진도 측정)
+# --parser     (HTML 분석기, 기본값 html.parser)
+# --parse-procs (기사 분석 프로세스 수, 기본값 0)
+# -o --output  (결과 JSON 파일명, 없으면 표준 출력)
+#
+# 쉼표로 여러 값을 주면 모든 조합을 측정함
+# 결과: 경우마다 articles/sec, 기사당 처리 시간 p50/p99, 최대 메모리(RSS),
+#       단계별 누적 시간 (fetch: 받아오기, parse: 분석, clean: _clean_text, write: 기록)
+#       parse는 clean을 뺀 시간이며, 동시에 진행되는 단계의 누적 시간은 실행 시간보다 클 수 있음
+#       분석 프로세스를 쓰면 parse, clean은 분석 프로세스가 기사마다 보낸 시간으로 기록됨
+#
+# 예) benchmark.py -p donga -m scrap -n 500 -L 0,20 -j 1,16 --async 200 -o bench.json
+##########################################################################
+
+import sys  # 시스템 모듈
+import os  # 파일 도구
+import getopt  # 명령행 인수 파서
+import inspect  # 텍스트 도구
+import json  # 결과 저장
+import platform  # 실행 환경
+import shutil  # 작업 디렉토리 삭제
+import subprocess  # 스크래퍼 프로세스 실행
+import tempfile  # 작업 디렉토리
+import time  # 시간 측정
+
+from fixture_server import FixtureServer  # 로컬 대역 서버
+
+SCRAP_ARTICLES = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'scrap_articles.py')
+
+PRESSES = ('joongang', 'donga', 'chosun')
+MODES = ('collect', 'scrap', 'both')
+QUERY_WORD = '코로나'  # 대역 서버는 검색어와 관계없이 같은 결과를 줌
+
+
+# 자식 프로세스 실행 후 (종료 코드, 실행 시간, 최대 RSS MB) 반환
+# os.wait4가 없는 환경(윈도우)에서는 최대 RSS를 None으로 함
+def run_process(args):
+    start = time.perf_counter()
+    process = subprocess.Popen([sys.executable, SCRAP_ARTICLES] + args,
+                               stdout=subprocess.DEVNULL, stderr=subprocess.DEVNULL)
+
+    if not hasattr(os, 'wait4'):
+        exit_code = process.wait()
+        return exit_code, time.perf_counter() - start, None
+
+    _, status, usage = os.wait4(process.pid, 0)
+    elapsed = time.perf_counter() - start
+    process.returncode = os.waitstatus_to_exitcode(status)
+
+    # ru_maxrss 단위는 리눅스 KB, macOS 바이트
+    peak_rss = usage.ru_maxrss / (1024 * 1024 if sys.platform == 'darwin' else 1024)
+    return process.returncode, elapsed, peak_rss
+
+
+# 파일의 기사 수 (머리글 제외)
+def count_rows(file_name):
+    if not os.path.exists(file_name):
+        return 0
+    with open(file_name, 'r', encoding='utf8') as count_file:
+        return max(sum(1 for _ in count_file) - 1, 0)
+
+
+# 측정 한 번
+# engine: ('threads', 작업자 수) | ('async', 동시 요청 수)
+# parse_procs: 기사 분석 프로세스 수
+def run_case(server, work_dir, press, mode, num_articles, engine, parser, parse_procs=0):
+    list_file_name = os.path.join(work_dir, f'list_{press}.csv')
+    result_file_name = os.path.join(work_dir, f'result_{press}.csv')
+    metrics_file_name = os.path.join(work_dir, 'metrics.json')
+
+    common_args = ['-p', press, '--base-url', server.base_url, '--parser', parser, '--restart']
+    collect_args = ['-c', '-n', str(num_articles), '-q', QUERY_WORD, '-l', list_file_name]
+
+    if mode == 'scrap':  # 스크랩할 기사 목록 준비 (측정하지 않음)
+        exit_code, _, _ = run_process(common_args + collect_args)
+        if exit_code != 0:
+            raise RuntimeError(f'Preparing Article List Failed: {press}')
+        args = ['-s', '-l', list_file_name]
+    elif mode == 'collect':
+        args = list(collect_args)
+    else:
+        args = ['-s'] + collect_args
+
+    if mode != 'collect':
+        args += ['-r', result_file_name]
+
+    engine_name, concurrency = engine
+    if engine_name == 'async':
+        args += ['--async', str(concurrency)]
+    else:
+        args += ['-j', str(concurrency)]
+    if parse_procs > 0 and mode != 'collect':
+        args += ['--parse-procs', str(parse_procs)]
+
+    if os.path.exists(metrics_file_name):
+        os.remove(metrics_file_name)
+
+    exit_code, elapsed, peak_rss = run_process(common_args + args + ['--metrics', metrics_file_name])
+
+    stages = {}
+    if os.path.exists(metrics_file_name):
+        with open(metrics_file_name, 'r', encoding='utf8') as metrics_file:
+            stages = json.load(metrics_file)['stages']
+
+    def total(name):
+        return stages[name]['total'] if name in stages else 0.0
+
+    num_done = count_rows(list_file_name if mode == 'collect' else result_file_name)
+    article = stages.get('article', {})
+
+    return {
+        'press': press, 'mode': mode, 'articles': num_articles, 'latency_ms': server.latency * 1000,
+        'engine': engine_name, 'concurrency': concurrency, 'parser': parser, 'parse_procs': parse_procs,
+        'exit_code': exit_code,
+        'completed': num_done,
+        'elapsed': elapsed,
+        'articles_per_sec': num_done / elapsed if elapsed > 0 else 0.0,
+        'article_p50_ms': article.get('p50', 0.0) * 1000,
+        'article_p99_ms': article.get('p99', 0.0) * 1000,
+        'peak_rss_mb': peak_rss,
+        'time_split': {
+            'fetch': total('fetch'),
+            'parse': total('parse') + total('parse_page') - total('clean'),
+            'clean': total('clean'),
+            'write': total('write'),
+        },
+        'stages': stages,
+    }
+
+
+# 커맨드라인 도움말 출력 및 종료
+def print_help(exit_code):
+    print(inspect.cleandoc(
+        '''사용법: [-h] [-p <press,...>] [-m <mode,...>] [-n <number,...>] [-L <latency,...>] [-j <jobs,...>] [--async <concurrency,...>] [--parser <parser>] [--parse-procs <processes,...>] [-o <output>]
+            -h --help: 도움말
+            -p --press   (측정할 언론사, 기본값 joongang,donga,chosun)
+            -m --mode    (측정할 작업 collect | scrap | both, 기본값 collect,scrap,both)
+            -n --number  (수집/스크랩할 기사 수, 기본값 200)
+            -L --latency (대역 서버 응답 지연 ms, 기본값 20)
+            -j --jobs    (스레드 엔진 작업자 수, 기본값 1,8)
+            --async      (asyncio 엔진 동시 요청 수, 주면 asyncio 엔진도 측정)
+            --parser     (HTML 분석기, 기본값 html.parser)
+            --parse-procs (기사 분석 프로세스 수, 기본값 0)
+            -o --output  (결과 JSON 파일명, 없으면 표준 출력)
+
+            쉼표로 여러 값을 주면 모든 조합을 측정함'''))
+    sys.exit(exit_code)
+
+
+def main(argv):
+
+    presses = list(PRESSES)  # 언론사
+    modes = list(MODES)  # 작업
+    numbers = [200]  # 기사 수
+    latencies = [20.0]  # 응답 지연 ms
+    jobs = [1, 8]  # 스레드 엔진 작업자 수
+    async_concurrencies = []  # asyncio 엔진 동시 요청 수
+    parser = 'html.parser'  # HTML 분석기
+    parse_procs_list = [0]  # 기사 분석 프로세스 수
+    output_file_name = None  # 결과 파일명
+
+    try:  # 명령행 인수 파싱
+        opts, _ = getopt.getopt(argv, 'hp:m:n:L:j:o:', [
+            'help', 'press=', 'mode=', 'number=', 'latency=', 'jobs=', 'async=', 'parser=', 'parse-procs=',
+            'output='])
+
+    except getopt.GetoptError as error:  # 오류 발생 (잘못된 입력)
+        print(error)
+        print_help(1)
+
+    try:
+        for opt, arg in opts:
+            if opt in ('-h', '--help'):  # 도움말
+                print_help(0)
+            elif opt in ('-p', '--press'):  # 언론사
+                presses = arg.split(',')
+                if not set(presses) <= set(PRESSES):
+                    print_help(1)
+            elif opt in ('-m', '--mode'):  # 작업
+                modes = arg.split(',')
+                if not set(modes) <= set(MODES):
+                    print_help(1)
+            elif opt in ('-n', '--number'):  # 기사 수
+                numbers = [int(value) for value in arg.split(',')]
+            elif opt in ('-L', '--latency'):  # 응답 지연
+                latencies = [float(value) for value in arg.split(',')]
+            elif opt in ('-j', '--jobs'):  # 작업자 수
+                jobs = [int(value) for value in arg.split(',')] if arg else []
+            elif opt == '--async':  # asyncio 동시 요청 수
+                async_concurrencies = [int(value) for value in arg.split(',')]
+            elif opt == '--parser':  # HTML 분석기
+                parser = arg
+            elif opt == '--parse-procs':  # 기사 분석 프로세스 수
+                parse_procs_list = [int(value) for value in arg.split(',')]
+            elif opt in ('-o', '--output'):  # 결과 파일명
+                output_file_name = arg
+
+    except ValueError as error:  # 숫자가 아닌 값
+        print(error)
+        print_help(1)
+
+    engines = [('threads', num_jobs) for num_jobs in jobs] + \
+        [('async', concurrency) for concurrency in async_concurrencies]
+
+    work_dir = tempfile.mkdtemp(prefix='scrap_benchmark_')
+    cases = []
+
+    try:
+        for num_articles in numbers:
+            for latency in latencies:
+                # 기사 수에 맞춰 대역 서버 준비. 검색 결과 끝을 확인할 수 있도록 조금 더 둠
+                with FixtureServer(num_articles + 50, latency / 1000) as server:
+                    for press in presses:
+                        for mode in modes:
+                            for engine in engines:
+                                for parse_procs in parse_procs_list:
+                                    case = run_case(server, work_dir, press, mode, num_articles, engine, parser,
+                                                    parse_procs)
+                                    cases.append(case)
+
+                                    print(f'{press:8} {mode:7} n={num_articles} latency={latency:g}ms '
+                                          f'{engine[0]}={engine[1]}'
+                                          + (f' parse-procs={parse_procs}' if parse_procs > 0 else '') +
+                                          f': {case["articles_per_sec"]:.1f} articles/sec, '
+                                          f'p50 {case["article_p50_ms"]:.1f}ms, p99 {case["article_p99_ms"]:.1f}ms',
+                                          file=sys.stderr)
+
+    except KeyboardInterrupt:
+        print('Benchmark Aborted by KeyboardInterrupt', file=sys.stderr)
+
+    finally:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+    report = {
+        'python': platform.python_version(),
+        'platform': platform.platform(),
+        'cases': cases,
+    }
+
+    if output_file_name is None:
+        json.dump(report, sys.stdout, ensure_ascii=False, indent=2)
+        print()
+    else:
+        with open(output_file_name, 'w', encoding='utf8') as output_file:
+            json.dump(report, output_file, ensure_ascii=False, indent=2)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
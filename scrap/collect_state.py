@@ -0,0 +1,70 @@
+##########################################################################
+# 증분 수집 상태 (SQLite)
+# 언론사, 검색어, 부가 검색어마다 지난 실행에서 본 가장 최신 기사 주소들과 수집 시각을 기억함
+# 검색 결과는 최신순이므로 다음 실행은 기억한 기사가 나오는 곳까지만 페이지를 넘기면 됨
+# - 가장 최신 기사 하나만 기억하면 그 기사가 지워졌을 때 끝까지 넘기게 되므로 HEAD_SIZE개를 기억함
+# - 검색 결과에는 날짜가 없으므로 기사 날짜 대신 주소로 비교함
+#
+# 이번 실행에서 본 기사들은 record로 모아두었다가 목록 파일을 다 쓴 뒤 save로 저장함
+# 따라서 중간에 멈추면 상태가 바뀌지 않고 다음 실행이 같은 곳까지 다시 수집함
+##########################################################################
+
+import json  # 주소 목록 저장
+import time  # 기록 시각
+import sqlite3  # SQLite 데이터베이스
+import threading  # 동기화 도구
+
+HEAD_SIZE = 20  # 기억할 최신 기사 수
+
+
+class CollectState:
+
+    def __init__(self, path):
+        self.path = path  # 상태 파일 경로
+
+        # 언론사마다 수집 스레드가 따로 있으므로 잠금으로 보호함
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.executescript('''
+            CREATE TABLE IF NOT EXISTS head (
+                press TEXT NOT NULL,
+                query TEXT NOT NULL,
+                detail TEXT NOT NULL,
+                urls TEXT NOT NULL,
+                updated REAL NOT NULL,
+                PRIMARY KEY (press, query, detail));
+        ''')
+        self._connection.commit()
+
+        self._recorded = {}  # (언론사, 검색어, 부가 검색어) -> 이번 실행의 최신 기사 주소들
+
+    # 지난 실행에서 본 최신 기사 주소 리스트(최신순)와 수집 시각. 처음이면 ([], None)
+    def head(self, press, query, detail):
+        with self._lock:
+            row = self._connection.execute(
+                'SELECT urls, updated FROM head WHERE press = ? AND query = ? AND detail = ?',
+                (press, query, detail)).fetchone()
+        if row is None:
+            return [], None
+        return json.loads(row[0]), row[1]
+
+    # 이번 실행에서 기억한 곳까지 오는 동안 본 기사 주소들(최신순)을 기록. save를 호출해야 저장됨
+    def record(self, press, query, detail, urls):
+        old_urls, _ = self.head(press, query, detail)
+        new_urls = list(dict.fromkeys(urls + old_urls))[:HEAD_SIZE]
+        with self._lock:
+            self._recorded[(press, query, detail)] = new_urls
+
+    # 기록한 상태를 저장
+    def save(self):
+        now = time.time()
+        with self._lock:
+            self._connection.executemany(
+                'INSERT OR REPLACE INTO head (press, query, detail, urls, updated) VALUES (?, ?, ?, ?, ?)',
+                [(*key, json.dumps(urls), now) for key, urls in self._recorded.items()])
+            self._connection.commit()
+            self._recorded.clear()
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
@@ -0,0 +1,197 @@
+##########################################################################
+# 여러 실행, 여러 언론사에 걸친 중복 기사 색인 (SQLite + 블룸 필터)
+# 정규화한 주소와 제목 해시를 키로 저장하여 이미 수집한 기사를 다시 받지 않도록 함
+# - SQLite에 모든 키를 정확히 저장하고, 메모리에는 블룸 필터만 둠
+# - 블룸 필터에 없으면 확실히 새 기사이므로 SQLite를 조회하지 않음
+# - 블룸 필터는 닫을 때 SQLite에 저장하고, 저장된 것이 오래되었거나 용량을 넘으면 다시 만듦
+#
+# check로 확인한 새 기사는 이번 실행에서만 기억하고, 목록 파일에 내보낸 뒤 add_many로 저장함
+# 따라서 중간에 멈춰도 파일에 없는 기사가 중복으로 처리되어 빠지지 않음
+##########################################################################
+
+import math  # 블룸 필터 크기 계산
+import time  # 기록 시각
+import hashlib  # 해시
+import sqlite3  # SQLite 데이터베이스
+import threading  # 동기화 도구
+import urllib.parse  # 주소 분석
+
+# 주소에서 뺄 추적용 파라미터
+TRACKING_PARAMS = ('utm_source', 'utm_medium', 'utm_campaign', 'utm_term', 'utm_content',
+                   'fbclid', 'gclid', 'ref', 'cloc', 'from')
+
+MIN_TITLE_LENGTH = 10  # 이보다 짧은 제목은 다른 기사와 겹칠 수 있으므로 제목으로 비교하지 않음
+
+
+# 같은 기사를 가리키는 주소들이 같은 값이 되도록 정규화
+# http/https, www, 기본 포트, 끝의 /, #조각, 추적용 파라미터, 파라미터 순서 차이를 없앰
+def normalize_url(url):
+    parts = urllib.parse.urlsplit(url.strip())
+
+    host = (parts.hostname or '').lower()
+    if host.startswith('www.'):
+        host = host[4:]
+    if parts.port is not None and parts.port not in (80, 443):
+        host = f'{host}:{parts.port}'
+
+    query = sorted((name, value) for name, value in urllib.parse.parse_qsl(parts.query, keep_blank_values=True)
+                   if name.lower() not in TRACKING_PARAMS)
+
+    path = parts.path.rstrip('/') or '/'
+    return f'{host}{path}' + (f'?{urllib.parse.urlencode(query)}' if query else '')
+
+
+# 공백을 정리한 제목의 해시. 짧은 제목이면 None
+def title_hash(title):
+    title = ' '.join(title.split())
+    if len(title.replace(' ', '')) < MIN_TITLE_LENGTH:
+        return None
+    return hashlib.sha1(title.encode('utf8')).hexdigest()[:20]
+
+
+# 블룸 필터. 거짓 양성은 있지만 거짓 음성은 없음
+class BloomFilter:
+
+    def __init__(self, capacity, error_rate=0.001, bits=None):
+        self.capacity = capacity
+        self.error_rate = error_rate
+        self.num_bits = max(int(-capacity * math.log(error_rate) / (math.log(2) ** 2)), 8)
+        self.num_hashes = max(int(round(self.num_bits / capacity * math.log(2))), 1)
+        self.bits = bits if bits is not None else bytearray((self.num_bits + 7) // 8)
+
+    def _positions(self, key):  # 이중 해싱으로 num_hashes개의 위치 계산
+        digest = hashlib.blake2b(key.encode('utf8'), digest_size=16).digest()
+        first = int.from_bytes(digest[:8], 'little')
+        second = int.from_bytes(digest[8:], 'little') | 1
+        return ((first + i * second) % self.num_bits for i in range(self.num_hashes))
+
+    def add(self, key):
+        for position in self._positions(key):
+            self.bits[position >> 3] |= 1 << (position & 7)
+
+    def __contains__(self, key):
+        return all(self.bits[position >> 3] & (1 << (position & 7)) for position in self._positions(key))
+
+
+class DedupIndex:
+
+    COMMIT_INTERVAL = 100  # 이만큼 추가할 때마다 커밋
+
+    def __init__(self, path, capacity=1000000, error_rate=0.001):
+        self.path = path  # 색인 파일 경로
+        self.error_rate = error_rate
+
+        self.num_skipped = {'url': 0, 'title': 0}  # 이번 실행에서 건너뛴 기사 수 (이유별)
+
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute('PRAGMA synchronous=NORMAL')
+        self._connection.executescript('''
+            CREATE TABLE IF NOT EXISTS seen (
+                key TEXT PRIMARY KEY,
+                press TEXT,
+                url TEXT,
+                added REAL) WITHOUT ROWID;
+            CREATE TABLE IF NOT EXISTS bloom (
+                id INTEGER PRIMARY KEY CHECK (id = 0),
+                capacity INTEGER NOT NULL,
+                error_rate REAL NOT NULL,
+                num_keys INTEGER NOT NULL,
+                bits BLOB NOT NULL);
+        ''')
+        self._connection.commit()
+
+        self._num_keys = self._connection.execute('SELECT COUNT(*) FROM seen').fetchone()[0]
+        self._num_uncommitted = 0
+        self._reserved = set()  # check를 통과했지만 아직 저장하지 않은 키
+        self._bloom = self._load_bloom(max(capacity, self._num_keys * 2))
+
+    # 저장된 블룸 필터가 지금 키들과 맞으면 사용하고, 아니면 다시 만듦
+    def _load_bloom(self, capacity):
+        row = self._connection.execute(
+            'SELECT capacity, error_rate, num_keys, bits FROM bloom WHERE id = 0').fetchone()
+        if row is not None:
+            saved_capacity, saved_error_rate, num_keys, bits = row
+            if num_keys == self._num_keys and saved_error_rate == self.error_rate \
+                    and self._num_keys <= saved_capacity:
+                return BloomFilter(saved_capacity, saved_error_rate, bytearray(bits))
+
+        bloom = BloomFilter(capacity, self.error_rate)
+        for (key,) in self._connection.execute('SELECT key FROM seen'):
+            bloom.add(key)
+        return bloom
+
+    def _contains(self, key):
+        if key in self._reserved:
+            return True
+        if key not in self._bloom:  # 블룸 필터에 없으면 확실히 없음
+            return False
+        return self._connection.execute('SELECT 1 FROM seen WHERE key = ?', (key,)).fetchone() is not None
+
+    def _add(self, key, press, url):
+        cursor = self._connection.execute(
+            'INSERT OR IGNORE INTO seen (key, press, url, added) VALUES (?, ?, ?, ?)',
+            (key, press, url, time.time()))
+        if cursor.rowcount > 0:
+            self._bloom.add(key)
+            self._num_keys += 1
+            self._num_uncommitted += 1
+
+        if self._num_uncommitted >= DedupIndex.COMMIT_INTERVAL:
+            self._connection.commit()
+            self._num_uncommitted = 0
+
+        if self._num_keys > self._bloom.capacity:  # 용량을 넘으면 거짓 양성이 늘어나므로 두 배로 다시 만듦
+            self._connection.commit()
+            self._bloom = BloomFilter(self._bloom.capacity * 2, self.error_rate)
+            for (seen_key,) in self._connection.execute('SELECT key FROM seen'):
+                self._bloom.add(seen_key)
+
+    @staticmethod
+    def _keys(url, title):  # 기사의 색인 키들
+        keys = ['u:' + normalize_url(url)]
+        title_key = title_hash(title)
+        if title_key is not None:
+            keys.append('t:' + title_key)
+        return keys
+
+    # 이미 본 기사이면 이유('url' | 'title'), 처음 보는 기사이면 None 반환
+    # 처음 보는 기사는 이번 실행 동안 기억하여 같은 기사가 다시 와도 중복으로 처리함
+    def check(self, article):
+        keys = DedupIndex._keys(article['url'], article.get('title', ''))
+
+        with self._lock:
+            for key in keys:
+                if self._contains(key):
+                    reason = 'url' if key.startswith('u:') else 'title'
+                    self.num_skipped[reason] += 1
+                    return reason
+
+            self._reserved.update(keys)
+            return None
+
+    # 파일에 내보낸 기사들을 색인에 저장
+    def add_many(self, articles):  # [(링크, 제목, 언론사), ...]
+        with self._lock:
+            for url, title, press in articles:
+                for key in DedupIndex._keys(url, title):
+                    self._add(key, press, url)
+                    self._reserved.discard(key)
+
+    # 건너뛴 기사 수 출력
+    def report(self):
+        total = sum(self.num_skipped.values())
+        if total > 0:
+            print(f'Skipped {total} Duplicate Articles '
+                  f'(URL: {self.num_skipped["url"]}, Title: {self.num_skipped["title"]})')
+
+    # 커밋하고 블룸 필터를 저장한 뒤 닫음
+    # 블룸 필터는 저장된 키 수와 함께 저장하므로 중간에 멈춰 저장하지 못하면 다음에 다시 만듦
+    def close(self):
+        with self._lock:
+            self._connection.execute(
+                'INSERT OR REPLACE INTO bloom (id, capacity, error_rate, num_keys, bits) VALUES (0, ?, ?, ?, ?)',
+                (self._bloom.capacity, self._bloom.error_rate, self._num_keys, bytes(self._bloom.bits)))
+            self._connection.commit()
+            self._connection.close()
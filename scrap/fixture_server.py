@@ -0,0 +1,354 @@
+##########################################################################
+# 언론사 웹 서버를 대신하는 로컬 대역 HTTP 서버
+# 중앙일보, 동아일보, 조선일보의 검색 결과와 기사 페이지를 같은 구조로 만들어 제공함
+# 실제 사이트에 접속하지 않고 스크래퍼를 시험하거나 성능을 측정할 때 사용
+#
+# 사용법: fixture_server.py [-h] [-P <port>] [-n <number>] [-L <latency>] [-R <rate>] [-N <seconds>]
+# -h --help: 도움말
+# -P --port    (포트 번호, 기본값 8000)
+# -n --number  (언론사별 기사 수, 기본값 1000)
+# -L --latency (응답마다 추가할 지연 시간 ms, 기본값 0)
+# -R --rate-limit (초당 허용 요청 수, 넘으면 429와 Retry-After로 응답. 기본값 제한 없음)
+# -N --new-every (이 시간(초)마다 언론사별로 새 기사를 하나씩 검색 결과 맨 앞에 추가. 기본값 추가하지 않음)
+#
+# 예) scrap_articles.py -p joongang --base-url http://127.0.0.1:8000 -c -s -n 100 -q 코로나
+##########################################################################
+
+import sys  # 시스템 모듈
+import getopt  # 명령행 인수 파서
+import inspect  # 텍스트 도구
+import json  # JSON 도구
+import random  # 기사 내용 생성
+import datetime  # 기사 날짜 생성
+import time  # 응답 지연
+import threading  # 서버 스레드
+import urllib.parse  # 주소 분석
+import http.server  # HTTP 서버
+
+
+# 기사 내용을 만들 때 쓰는 단어들
+WORDS = ('코로나', '정부', '방역', '확진자', '대통령', '경제', '학교', '교육', '서울', '부산',
+         '지역', '병원', '의료진', '백신', '치료제', '국회', '예산', '기업', '수출', '시장',
+         '주식', '부동산', '정책', '발표', '조사', '결과', '시민', '사회', '문화', '과학')
+
+NEW_ARTICLE_ID = 1000000  # 시작한 뒤 새로 올라온 기사는 이 번호 다음부터 (NEW_ARTICLE_ID + 1, + 2, ...)
+
+
+# 기사 하나 생성. 같은 번호는 항상 같은 내용
+def make_article(press, article_id):
+    generator = random.Random(f'{press}-{article_id}')
+
+    # 최신 기사일수록 번호가 작음 (검색 결과가 최신순이므로). 새 기사는 나중에 올라온 것일수록 번호가 큼
+    age = article_id if article_id <= NEW_ARTICLE_ID else NEW_ARTICLE_ID - article_id
+    date = datetime.datetime(2020, 12, 31, 18, 0) - datetime.timedelta(hours=age * 7)
+
+    title = ' '.join(generator.choice(WORDS) for _ in range(6))
+
+    paragraphs = []
+    for _ in range(generator.randint(8, 16)):
+        words = [generator.choice(WORDS) + generator.choice(('은', '는', '이', '가', '을', '를', ''))
+                 for _ in range(generator.randint(20, 40))]
+        paragraphs.append(' '.join(words) + f'. ({generator.randint(1, 99)}%, "COVID-19")')
+
+    return {'date': date, 'title': title, 'paragraphs': paragraphs}
+
+
+# 언론사별 페이지 생성기
+# 기사 링크는 요청을 받은 서버 주소(base_url)를 가리키게 만듦
+class FixturePages:
+
+    def __init__(self, num_articles):
+        self.num_articles = num_articles  # 언론사별 처음 기사 수
+        self.num_new = 0  # 시작한 뒤 새로 올라온 기사 수
+
+    # 실제 기사 페이지처럼 메뉴, 스크립트, 바닥글을 붙임 (분석할 필요 없는 부분)
+    @staticmethod
+    def _chrome(press, content):
+        menu = ''.join(f'<li><a href="/section/{number}">{WORDS[number % len(WORDS)]} 메뉴</a></li>'
+                       for number in range(300))
+        script = '<script>var ads = {"slot": "top", "text": "<b>광고</b> 입니다"};</script>'
+        return (f'<html><head><title>{press}</title>{script}<style>.x {{ color: red; }}</style></head>'
+                f'<body><div id="gnb"><ul>{menu}</ul></div>{content}'
+                f'<div id="footer"><ul>{menu}</ul>{script}</div></body></html>')
+
+    def _article_ids(self, first, count):  # 검색 결과 한 페이지에 들어갈 기사 번호들
+        # 새 기사가 최신순으로 맨 앞에 오고, 처음 기사들은 그만큼 뒤로 밀림
+        num_new = self.num_new
+        positions = range(max(first, 0), min(first + count, num_new + self.num_articles))
+        return [NEW_ARTICLE_ID + num_new - position if position < num_new else position - num_new
+                for position in positions]
+
+    # 언론사마다 새 기사 count개를 검색 결과 맨 앞에 추가
+    def publish(self, count=1):
+        self.num_new += count
+
+    # 중앙일보 검색 결과 (page는 1부터, 페이지당 10개)
+    def joongang_search(self, base_url, query):
+        page = int(query.get('page', ['1'])[0])
+        items = ''.join(
+            f'<li><div><h2><a href="{base_url}/article/{article_id}">'
+            f'{make_article("joongang", article_id)["title"]}</a></h2></div></li>'
+            for article_id in self._article_ids((page - 1) * 10, 10))
+        return ('text/html; charset=utf-8',
+                f'<html><body><div id="content"><div class="section_news"><div class="bd">'
+                f'<ul>{items}</ul></div></div></div></body></html>')
+
+    # 중앙일보 기사
+    def joongang_article(self, article_id):
+        article = make_article('joongang', article_id)
+        body = '<br><br>'.join(article['paragraphs']) + \
+            '<script>document.write("<div>추천 기사</div>");</script>'
+        return ('text/html; charset=utf-8',
+                self._chrome('joongang',
+                             f'<div class="article_head"><h1 id="article_title">{article["title"]}</h1>'
+                             f'<div class="clearfx"><div class="byline"><em>기자</em>'
+                             f'<em>입력 {article["date"]:%Y.%m.%d %H:%M}</em>'
+                             f'<em>업데이트 {article["date"]:%Y.%m.%d %H:%M}</em></div></div></div>'
+                             f'<div id="article_body" class="article_body">{body}</div>'))
+
+    # 동아일보 검색 결과 (p는 1, 16, 31, ... 페이지당 15개)
+    def donga_search(self, base_url, query):
+        first = int(query.get('p', ['1'])[0]) - 1
+        items = ''.join(
+            f'<div class="t"><p class="tit"><a href="{base_url}/news/article/all/{article_id}">'
+            f'{make_article("donga", article_id)["title"]}</a></p></div>'
+            for article_id in self._article_ids(first, 15))
+        return ('text/html; charset=utf-8', f'<html><body>{items}</body></html>')
+
+    # 동아일보 기사
+    def donga_article(self, article_id):
+        article = make_article('donga', article_id)
+        body = ''.join(f'{paragraph}<br>' for paragraph in article['paragraphs'])
+        return ('text/html; charset=utf-8',
+                self._chrome('donga',
+                             f'<div id="container"><div class="article_title">'
+                             f'<h1>{article["title"]}</h1><div class="title_foot">'
+                             f'<span class="date01">입력 {article["date"]:%Y-%m-%d %H:%M}</span>'
+                             f'<span class="date01">업데이트 {article["date"]:%Y-%m-%d %H:%M}</span></div></div>'
+                             f'<div id="content"><div><div class="article_txt">{body}</div></div></div>'
+                             f'</div>'))
+
+    # 조선일보 검색 API (query의 page는 0부터, 페이지당 10개)
+    def chosun_search(self, base_url, query):
+        page = json.loads(query['query'][0])['page']
+        elements = [{'article_view_url': f'{base_url}/site/data/html_dir/article.html?id={article_id}',
+                     'title': make_article('chosun', article_id)['title']}
+                    for article_id in self._article_ids(page * 10, 10)]
+        return ('application/json; charset=utf-8',
+                json.dumps({'content_elements': elements}, ensure_ascii=False))
+
+    # 조선일보 기사
+    # 실제 페이지처럼 기사 전체를 Fusion.globalContent 스크립트(JSON)로도 넣음. 날짜는 UTC
+    def chosun_article(self, article_id):
+        article = make_article('chosun', article_id)
+        body = ''.join(f'<p>{paragraph}</p>' for paragraph in article['paragraphs'])
+
+        date = (article['date'] - datetime.timedelta(hours=9)).strftime('%Y-%m-%dT%H:%M:%S.000Z')
+        content = {
+            '_id': f'ARTICLE{article_id}', 'type': 'story', 'canonical_website': 'chosun',
+            'display_date': date, 'first_publish_date': date, 'last_updated_date': date,
+            'headlines': {'basic': article['title'], 'meta_title': '', 'mobile': ''},
+            'credits': {'by': [{'name': '기자', 'type': 'author'}]},
+            'taxonomy': {'tags': [{'text': word, 'slug': str(number)} for number, word in enumerate(WORDS)]},
+            'content_elements': [{'_id': f'P{number}', 'type': 'text', 'content': paragraph}
+                                 for number, paragraph in enumerate(article['paragraphs'])],
+        }
+        # 스크립트 안이므로 </를 <\/로 바꿔 넣음
+        content = json.dumps(content, ensure_ascii=False).replace('</', '<\\/')
+        script = (f'<script>Fusion.globalContent={content};'
+                  f'Fusion.globalContentConfig={{"source":"content-api","query":{{"id":"{article_id}"}}}};'
+                  f'</script>')
+
+        return ('text/html; charset=utf-8',
+                self._chrome('chosun',
+                             f'{script}<div id="wv_wrap_id"><div class="wv_header">'
+                             f'<div class="wv_header_title">{article["title"]}</div>'
+                             f'<div class="wv_header_date">입력 {article["date"]:%Y.%m.%d %H:%M}</div></div>'
+                             f'<div class="wv_newsbody">{body}</div></div>'))
+
+    # 요청 경로에 맞는 (Content-Type, 내용) 반환. 없는 페이지는 None
+    def route(self, base_url, path):
+        url = urllib.parse.urlparse(path)
+        query = urllib.parse.parse_qs(url.query)
+        parts = url.path.strip('/').split('/')
+
+        if url.path == '/search/JoongangNews':
+            return self.joongang_search(base_url, query)
+        if url.path == '/search':
+            return self.donga_search(base_url, query)
+        if url.path == '/pf/api/v3/content/fetch/search-param-api':
+            return self.chosun_search(base_url, query)
+
+        if parts[0] == 'article' and len(parts) == 2:
+            return self.joongang_article(int(parts[1]))
+        if parts[:3] == ['news', 'article', 'all'] and len(parts) == 4:
+            return self.donga_article(int(parts[3]))
+        if url.path == '/site/data/html_dir/article.html':
+            return self.chosun_article(int(query['id'][0]))
+
+        return None
+
+
+# 요청 처리기. keep-alive를 지원하도록 HTTP/1.1 사용
+class FixtureRequestHandler(http.server.BaseHTTPRequestHandler):
+
+    protocol_version = 'HTTP/1.1'
+    # 머리글과 본문을 따로 보내므로 Nagle 알고리즘이 켜져 있으면 지연된 ACK를 기다리느라 응답마다 수십 ms가 늘어남
+    disable_nagle_algorithm = True
+
+    def do_GET(self):
+        server = self.server
+
+        if not server.allow_request():  # 요청 제한 흉내
+            self.send_response(429)
+            self.send_header('Retry-After', '1')
+            self.send_header('Content-Length', '0')
+            self.end_headers()
+            return
+
+        if server.latency > 0:  # 네트워크 지연 흉내
+            time.sleep(server.latency)
+
+        try:
+            page = server.pages.route(server.base_url, self.path)
+        except (KeyError, ValueError):
+            page = None
+
+        if page is None:
+            self.send_error(404)
+            return
+
+        content_type, text = page
+        body = text.encode('utf8')
+        self.send_response(200)
+        self.send_header('Content-Type', content_type)
+        self.send_header('Content-Length', str(len(body)))
+        self.end_headers()
+        self.wfile.write(body)
+
+    def log_message(self, format, *args):  # 요청마다 로그를 출력하지 않음
+        pass
+
+
+# 대역 서버. with 문으로 쓰면 백그라운드 스레드에서 실행됨
+class FixtureServer(http.server.ThreadingHTTPServer):
+
+    daemon_threads = True
+    request_queue_size = 1024  # 동시 연결이 많아도 연결이 거부되지 않도록
+
+    def __init__(self, num_articles=1000, latency=0, host='127.0.0.1', port=0, rate_limit=None, new_every=None):
+        super().__init__((host, port), FixtureRequestHandler)
+        self.pages = FixturePages(num_articles)
+        self.latency = latency  # 응답 지연 (초)
+        self.rate_limit = rate_limit  # 초당 허용 요청 수. None이면 제한 없음
+        self.base_url = f'http://{host}:{self.server_address[1]}'
+        self.num_rejected = 0  # 제한으로 거절한 요청 수
+        self.new_every = new_every  # 새 기사를 추가할 간격 (초). None이면 추가하지 않음
+        self._thread = None
+        self._publisher = None
+        self._stopped = threading.Event()
+
+        self._tokens = rate_limit or 0  # 요청 제한용 토큰 버킷 (1초 분량까지 모아둠)
+        self._last_refill = time.monotonic()
+        self._rate_lock = threading.Lock()
+
+    def allow_request(self):  # 요청 제한 안쪽이면 True
+        if self.rate_limit is None:
+            return True
+        with self._rate_lock:
+            now = time.monotonic()
+            self._tokens = min(self.rate_limit, self._tokens + (now - self._last_refill) * self.rate_limit)
+            self._last_refill = now
+            if self._tokens < 1:
+                self.num_rejected += 1
+                return False
+            self._tokens -= 1
+            return True
+
+    def _run_publisher(self):  # new_every초마다 새 기사 추가
+        while not self._stopped.wait(self.new_every):
+            self.pages.publish()
+
+    def start_publisher(self):
+        if self.new_every is not None:
+            self._publisher = threading.Thread(target=self._run_publisher, daemon=True)
+            self._publisher.start()
+
+    def stop_publisher(self):
+        if self._publisher is not None:
+            self._stopped.set()
+
+    def handle_error(self, request, client_address):  # 클라이언트가 먼저 연결을 끊은 경우는 무시
+        if not isinstance(sys.exc_info()[1], (ConnectionResetError, BrokenPipeError)):
+            super().handle_error(request, client_address)
+
+    def __enter__(self):
+        self._thread = threading.Thread(target=self.serve_forever, daemon=True)
+        self._thread.start()
+        self.start_publisher()
+        return self
+
+    def __exit__(self, *args):
+        self.stop_publisher()
+        self.shutdown()
+        self.server_close()
+
+
+# 커맨드라인 도움말 출력 및 종료
+def print_help(exit_code):
+    print(inspect.cleandoc(
+        '''사용법: [-h] [-P <port>] [-n <number>] [-L <latency>] [-R <rate>] [-N <seconds>]
+            -h --help: 도움말
+            -P --port    (포트 번호, 기본값 8000)
+            -n --number  (언론사별 기사 수, 기본값 1000)
+            -L --latency (응답마다 추가할 지연 시간 ms, 기본값 0)
+            -R --rate-limit (초당 허용 요청 수, 넘으면 429와 Retry-After로 응답. 기본값 제한 없음)
+            -N --new-every (이 시간(초)마다 언론사별로 새 기사를 하나씩 검색 결과 맨 앞에 추가. 기본값 추가하지 않음)'''))
+    sys.exit(exit_code)
+
+
+def main(argv):
+
+    port = 8000  # 포트 번호
+    num_articles = 1000  # 언론사별 기사 수
+    latency = 0  # 응답 지연 ms
+    rate_limit = None  # 초당 허용 요청 수
+    new_every = None  # 새 기사 추가 간격 (초)
+
+    try:  # 명령행 인수 파싱
+        opts, _ = getopt.getopt(argv, 'hP:n:L:R:N:', ['help', 'port=', 'number=', 'latency=', 'rate-limit=',
+                                                            'new-every='])
+
+    except getopt.GetoptError as error:  # 오류 발생 (잘못된 입력)
+        print(error)
+        print_help(1)
+
+    for opt, arg in opts:
+        if opt in ('-h', '--help'):  # 도움말
+            print_help(0)
+        elif opt in ('-P', '--port'):  # 포트 번호
+            port = int(arg)
+        elif opt in ('-n', '--number'):  # 기사 수
+            num_articles = int(arg)
+        elif opt in ('-L', '--latency'):  # 응답 지연
+            latency = float(arg)
+        elif opt in ('-R', '--rate-limit'):  # 요청 제한
+            rate_limit = float(arg)
+        elif opt in ('-N', '--new-every'):  # 새 기사 추가 간격
+            new_every = float(arg)
+
+    server = FixtureServer(num_articles, latency / 1000, port=port, rate_limit=rate_limit, new_every=new_every)
+    print(f'Serving {num_articles} Articles per Press at {server.base_url}')
+
+    try:
+        server.start_publisher()
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print('Server Stopped')
+    finally:
+        server.stop_publisher()
+        server.server_close()
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
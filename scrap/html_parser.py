@@ -0,0 +1,76 @@
+##########################################################################
+# HTML 분석기 선택
+# html.parser (기본값, 순수 파이썬) | lxml (BeautifulSoup + lxml) | selectolax (lexbor)
+# 어떤 분석기를 쓰든 select, select_one, get_text, get 으로 같은 방식으로 사용함
+##########################################################################
+
+from bs4 import BeautifulSoup, SoupStrainer  # HTML 분석기
+
+BACKENDS = ('html.parser', 'lxml', 'selectolax')  # 사용 가능한 분석기
+
+_backend = 'html.parser'  # 현재 분석기
+
+
+# 분석기 선택. 필요한 모듈이 없으면 ImportError
+def set_backend(name):
+    global _backend
+
+    if name not in BACKENDS:
+        raise ValueError(f'Unknown Parser: {name}')
+
+    if name == 'lxml':
+        import lxml  # 설치 여부 확인
+    elif name == 'selectolax':
+        import selectolax  # 설치 여부 확인
+
+    _backend = name
+
+
+def get_backend():
+    return _backend
+
+
+# HTML 분석
+# parse_only: (속성 이름, (값, ...)) 형식. 주면 속성값이 일치하는 요소의 하위 트리만 만듦
+# selectolax는 전체를 분석해도 충분히 빠르므로 무시함
+def parse_html(text, parse_only=None):
+    if _backend == 'selectolax':
+        return _SelectolaxNode.parse(text)
+
+    strainer = None
+    if parse_only is not None:
+        attribute, values = parse_only
+        strainer = SoupStrainer(attrs={attribute: list(values)})
+
+    return BeautifulSoup(text, _backend, parse_only=strainer)
+
+
+# selectolax 노드를 BeautifulSoup과 같은 방식으로 쓰기 위한 감싸개
+class _SelectolaxNode:
+
+    __slots__ = ('_node',)
+
+    def __init__(self, node):
+        self._node = node
+
+    @staticmethod
+    def parse(text):
+        from selectolax.lexbor import LexborHTMLParser  # lexbor 기반 HTML 분석기
+
+        tree = LexborHTMLParser(text)
+        # BeautifulSoup의 get_text는 스크립트와 스타일 내용을 빼므로 같게 맞춤
+        tree.strip_tags(['script', 'style'])
+        return _SelectolaxNode(tree)
+
+    def select(self, selector):
+        return [_SelectolaxNode(node) for node in self._node.css(selector)]
+
+    def select_one(self, selector):
+        node = self._node.css_first(selector)
+        return _SelectolaxNode(node) if node is not None else None
+
+    def get_text(self):
+        return self._node.text(deep=True)
+
+    def get(self, attribute):
+        return self._node.attributes.get(attribute)
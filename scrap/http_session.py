@@ -0,0 +1,114 @@
+##########################################################################
+# 스크래퍼들이 함께 쓰는 HTTP 세션
+# 호스트별 연결 풀과 keep-alive로 매 요청마다 TCP/TLS 연결을 새로 맺지 않음
+# 5xx, 429 응답이나 연결 끊김은 지수 백오프로 재시도함 (Retry-After가 있으면 따름)
+# 요청마다 호스트별 조절기(rate_limiter)에서 자리를 받아 서버가 견디는 만큼만 요청함
+##########################################################################
+
+import time  # 재시도 대기
+import random  # 백오프 지터
+import threading  # 스레드별 세션
+
+import requests  # HTTP REQUEST를 위한 모듈
+from requests.adapters import HTTPAdapter  # 연결 풀 어댑터
+
+import metrics  # 재시도 횟수 측정
+import rate_limiter  # 호스트별 요청 속도 조절
+
+
+# 공유 HTTP 세션
+# requests.Session 자체는 스레드 간 공유가 안전하지 않으므로 스레드마다 세션을 두고
+# 연결 풀을 가진 어댑터만 모든 세션이 공유함 (urllib3 연결 풀은 스레드 안전함)
+class HttpSession:
+
+    RETRY_STATUS = (429, 500, 502, 503, 504)  # 재시도할 응답 코드
+    THROTTLE_RETRIES = 10  # 과부하 응답(429, 503, 504)은 retries와 별도로 이만큼 더 재시도함
+
+    def __init__(self, timeout=(5, 30), retries=3, backoff=0.5, pool_size=16):
+        self.timeout = timeout  # (연결, 읽기) 타임아웃 초
+        self.retries = retries  # 최대 재시도 횟수
+        self.backoff = backoff  # 첫 재시도 대기 시간 (초), 매번 두 배로 늘어남
+
+        # 호스트별 연결 풀. pool_connections: 풀을 유지할 호스트 수, pool_maxsize: 호스트당 연결 수
+        self._adapter = HTTPAdapter(pool_connections=8, pool_maxsize=pool_size)
+        self._local = threading.local()
+
+    def _session(self):  # 현재 스레드의 세션
+        session = getattr(self._local, 'session', None)
+        if session is None:
+            session = requests.Session()
+            session.mount('http://', self._adapter)
+            session.mount('https://', self._adapter)
+            self._local.session = session
+        return session
+
+    def _wait(self, attempt, retry_after=None):  # 지수 백오프 대기 (지터 포함), Retry-After가 더 길면 따름
+        delay = self.backoff * (2 ** min(attempt, 6)) * random.uniform(0.5, 1.5)
+        time.sleep(max(delay, retry_after or 0))
+
+    def get(self, url):  # HTTP GET, 실패 시 재시도
+        limiter = rate_limiter.get_limiter(url)
+        attempt = 0  # 재시도 횟수
+        throttled = 0  # 그 중 과부하 응답으로 재시도한 횟수
+
+        while True:
+            start = limiter.acquire()
+            try:
+                response = self._session().get(url, timeout=self.timeout)
+
+            except (requests.exceptions.ConnectionError, requests.exceptions.Timeout) as error:
+                limiter.release(start, throttled=True)  # 연결 실패와 타임아웃도 과부하 신호로 봄
+                if attempt - throttled >= self.retries:
+                    raise error
+                print(f'{type(error).__name__}, Retry [{attempt + 1}] {url}')
+                metrics.count('retried')
+                self._wait(attempt)
+                attempt += 1
+                continue
+
+            except BaseException:
+                limiter.release(start)
+                raise
+
+            retry_after = rate_limiter.parse_retry_after(response.headers.get('Retry-After'))
+            is_throttled = response.status_code in rate_limiter.THROTTLE_STATUS
+            limiter.release(start, throttled=is_throttled, retry_after=retry_after)
+
+            if response.status_code in HttpSession.RETRY_STATUS and (
+                    attempt - throttled < self.retries
+                    or (is_throttled and throttled < HttpSession.THROTTLE_RETRIES)):
+                print(f'HTTP {response.status_code}, Retry [{attempt + 1}] {url}')
+                metrics.count('retried')
+                self._wait(attempt, retry_after)
+                if is_throttled and throttled < HttpSession.THROTTLE_RETRIES:
+                    throttled += 1
+                attempt += 1
+                continue
+
+            response.raise_for_status()
+            return response
+
+    def close(self):  # 연결 풀 정리
+        self._adapter.close()
+
+
+_session = None  # 프로세스 전체에서 공유하는 세션
+_session_lock = threading.Lock()
+
+
+# 공유 세션 설정. 첫 요청 전에 호출해야 함
+def configure(**kwargs):
+    global _session
+    with _session_lock:
+        if _session is not None:
+            _session.close()
+        _session = HttpSession(**kwargs)
+
+
+# 공유 세션 반환. 설정되지 않았으면 기본값으로 생성
+def get_session():
+    global _session
+    with _session_lock:
+        if _session is None:
+            _session = HttpSession()
+        return _session
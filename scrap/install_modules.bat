@@ -1,2 +1,7 @@
 python -m pip install requests
-python -m pip install bs4
\ No newline at end of file
+python -m pip install bs4
+python -m pip install aiohttp
+python -m pip install lxml
+python -m pip install selectolax
+python -m pip install pyarrow
+python -m pip install konlpy
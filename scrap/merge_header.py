@@ -1,25 +1,257 @@
-import sys
+##########################################################################
+# 여러 스크랩 결과 파일을 하나로 합침
+# 기본: 파일을 그대로 이어 붙임 (첫 파일의 머리글만 남김)
+#       csv, jsonl.gz는 열이 모두 같으면 내용을 분석하지 않고 바이트 단위로 복사함
+# 파일마다 열이 다르면 (예: 여러 언론사 결과와 한 언론사 결과) 모든 열을 합쳐서 쓰고
+# 없는 열은 빈 값으로 채움
+# -m:   날짜순 병합. 각 파일은 날짜순(스크랩 결과는 최신순)으로 정렬되어 있어야 하며
+#       파일마다 한 행씩만 읽으므로 메모리는 파일 수에만 비례함
+#       먼저 날짜 열만 읽어 정렬되었는지 확인하고, 정렬되지 않은 파일(--worker 샤드 등)은
+#       SORT_CHUNK_ROWS행씩 정렬해 임시 파일에 쓴 뒤 병합하므로 메모리는 여전히 일정함
+# -u:   날짜순 병합하면서 중복 기사 제거. 같은 날짜의 기사끼리만 비교하므로
+#       메모리는 하루치 기사 수에만 비례함. 언론사, 제목, 본문이 모두 같아야 중복 기사임
+#
+# 사용법: merge_header.py [-h] [-m [--ascending]] [-u] <merge file> <target file> ...
+# -h --help: 도움말
+# -m --merge-by-date: 날짜순 병합 (기본값 최신순)
+#     --ascending: 오래된 순으로 병합 (입력 파일도 오래된 순이어야 함)
+# -u --unique: 중복 기사 제거 (-m과 함께 사용)
+#
+# 출력과 입력 형식은 확장자로 판단함 (csv | jsonl.gz | parquet)
+##########################################################################
+
+import os  # 파일 도구
+import sys  # 시스템 모듈
+import getopt  # 명령행 인수 파서
+import inspect  # 텍스트 도구
+import shutil  # 파일 복사
+import hashlib  # 중복 비교용 해시
+import heapq  # k-way 병합
+import itertools  # 반복 도구
+import tempfile  # 정렬용 임시 디렉토리
+
+import article_sink  # 저장 형식
+
+COPY_BUFFER_SIZE = 16 * 1024 * 1024  # 바이트 단위 복사 버퍼 크기
+SORT_CHUNK_ROWS = 50000  # 정렬되지 않은 파일을 나눠 정렬할 때 한 번에 메모리에 올릴 행 수
+
+
+# 입력 파일들의 열을 모두 합친 출력 열. 언론사 열은 맨 앞에 둠
+# 열이 없는 파일은 경고를 출력함. 모두 빈 파일이면 스크랩 결과 열
+def merge_columns(target_file_name_list, columns_list):
+    columns = []
+    for target_columns in columns_list:
+        for column in target_columns or ():
+            if column not in columns:
+                columns.append(column)
+
+    if not columns:
+        return article_sink.RESULT_COLUMNS
+
+    if article_sink.PRESS_COLUMN in columns:
+        columns.remove(article_sink.PRESS_COLUMN)
+        columns.insert(0, article_sink.PRESS_COLUMN)
+
+    for file_name, target_columns in zip(target_file_name_list, columns_list):
+        missing = [column for column in columns if target_columns is not None and column not in target_columns]
+        if missing:
+            print(f'Warning: {file_name} has no {", ".join(missing)} Column, Filled with Empty Values')
+    return tuple(columns)
+
+
+# 파일을 그대로 이어 붙임. 반환값은 복사한 바이트 수 (행 단위로 변환했으면 기록한 행 수)
+def concatenate(merge_file_name, target_file_name_list):
+    formats = {article_sink.format_of(file_name) for file_name in [merge_file_name] + target_file_name_list}
+    columns_list = [article_sink.read_columns(file_name) for file_name in target_file_name_list]
+    same_columns = len({columns for columns in columns_list if columns is not None}) <= 1
+
+    if formats == {'csv'} and same_columns:  # 첫 파일 이외에는 머리글을 건너뛰고 바이트 단위로 복사
+        with open(merge_file_name, 'wb') as merge_file:
+            for target_file_name in target_file_name_list:
+                with open(target_file_name, 'rb') as target_file:
+                    if target_file.seek(0, 2) == 0:  # 빈 파일
+                        continue
+                    target_file.seek(-1, 2)
+                    ends_with_newline = target_file.read(1) == b'\n'
+                    target_file.seek(0)
+
+                    if merge_file.tell() > 0:  # 머리글은 처음 한 번만
+                        target_file.readline()
+                    start = merge_file.tell()
+                    shutil.copyfileobj(target_file, merge_file, COPY_BUFFER_SIZE)
+
+                # 마지막 줄바꿈이 없는 파일 다음 행이 붙지 않도록
+                if not ends_with_newline and merge_file.tell() > start:
+                    merge_file.write(b'\n')
+            return merge_file.tell()
+
+    if formats == {'jsonl.gz'} and same_columns:  # gzip 멤버는 이어 붙여도 하나의 파일로 읽힘
+        with open(merge_file_name, 'wb') as merge_file:
+            for target_file_name in target_file_name_list:
+                with open(target_file_name, 'rb') as target_file:
+                    shutil.copyfileobj(target_file, merge_file, COPY_BUFFER_SIZE)
+            return merge_file.tell()
+
+    # 형식이나 열이 다르면 한 행씩 변환
+    return merge_rows(merge_file_name, [article_sink.read_articles(file_name)
+                                        for file_name in target_file_name_list],
+                      merge_columns(target_file_name_list, columns_list))
+
+
+# 행 단위 병합. rows_list의 각 행을 차례대로 출력 파일에 씀. 반환값은 기록한 행 수
+# 행에 없는 열은 빈 값으로 채움
+def merge_rows(merge_file_name, rows_list, columns):
+    num_rows = 0
+    with article_sink.open_sink(article_sink.format_of(merge_file_name), merge_file_name, columns) as sink:
+        for rows in rows_list:
+            for row in rows:
+                sink.write({column: row.get(column, '') for column in columns})
+                num_rows += 1
+    return num_rows
+
+
+# 날짜순으로 정렬되어 있는지 확인. 날짜 열만 읽음
+def _is_sorted(file_name, descending):
+    last_date = None
+    for row in article_sink.read_articles(file_name, ('date',)):
+        date = row['date']
+        if last_date is not None and (date > last_date if descending else date < last_date):
+            return False
+        last_date = date
+    return True
+
+
+# 정렬되지 않은 파일의 행을 날짜순으로 반환
+# SORT_CHUNK_ROWS행씩 정렬해 temp_dir_name에 쓰고 병합함. 한 번에 다 들어가면 임시 파일을 쓰지 않음
+def _sorted_rows(file_name, descending, temp_dir_name):
+    columns = article_sink.read_columns(file_name)
+    rows = article_sink.read_articles(file_name)
+    chunk_file_names = []
+    while True:
+        chunk = list(itertools.islice(rows, SORT_CHUNK_ROWS))
+        chunk.sort(key=lambda row: row['date'], reverse=descending)
+        if not chunk_file_names and len(chunk) < SORT_CHUNK_ROWS:  # 파일 전체가 한 묶음
+            return iter(chunk)
+        if not chunk:
+            break
+
+        chunk_file_name = os.path.join(temp_dir_name, f'{len(chunk_file_names)}.jsonl.gz')
+        with article_sink.open_sink('jsonl.gz', chunk_file_name, columns) as sink:
+            for row in chunk:
+                sink.write(row)
+        chunk_file_names.append(chunk_file_name)
+
+    return heapq.merge(*[article_sink.read_articles(chunk_file_name) for chunk_file_name in chunk_file_names],
+                       key=lambda row: row['date'], reverse=descending)
+
+
+# 같은 기사인지 비교하기 위한 키. 공백을 정리한 언론사, 제목, 본문의 해시
+# 제목만 비교하면 같은 날 같은 제목의 다른 기사(연재 칼럼, 언론사마다 있는 [속보] 등)가 빠짐
+def _article_key(row):
+    text = '\n'.join(' '.join(row.get(column, '').split()) for column in ('press', 'title', 'body'))
+    return hashlib.sha1(text.encode('utf8')).digest()
+
+
+# 같은 날짜 안에서 중복 기사를 빼고 반환. 날짜가 바뀌면 비교 대상을 비움
+def _unique(rows, removed):
+    current_date = None
+    seen = set()
+    for row in rows:
+        if row['date'] != current_date:
+            current_date = row['date']
+            seen.clear()
+
+        key = _article_key(row)
+        if key in seen:
+            removed[0] += 1
+            continue
+        seen.add(key)
+        yield row
+
+
+# 날짜순 병합. 반환값은 (기록한 행 수, 제거한 중복 기사 수)
+def merge_by_date(merge_file_name, target_file_name_list, ascending=False, unique=False):
+    descending = not ascending
+    columns = merge_columns(target_file_name_list,
+                            [article_sink.read_columns(file_name) for file_name in target_file_name_list])
+
+    with tempfile.TemporaryDirectory() as temp_dir_name:
+        inputs = []
+        for index, file_name in enumerate(target_file_name_list):
+            if _is_sorted(file_name, descending):
+                inputs.append(article_sink.read_articles(file_name))
+            else:  # 정렬하지 않고 병합하면 출력도 정렬되지 않고 -u도 중복 기사를 놓침
+                print(f'{file_name} is not Sorted by Date, Sorting it before Merging')
+                chunk_dir_name = os.path.join(temp_dir_name, str(index))
+                os.mkdir(chunk_dir_name)
+                inputs.append(_sorted_rows(file_name, descending, chunk_dir_name))
+
+        rows = heapq.merge(*inputs, key=lambda row: row['date'], reverse=descending)
+
+        removed = [0]  # 제거한 중복 기사 수
+        if unique:
+            rows = _unique(rows, removed)
+
+        return merge_rows(merge_file_name, [rows], columns), removed[0]
+
+
+# 커맨드라인 도움말 출력 및 종료
+def print_help(exit_code):
+    print(inspect.cleandoc(
+        '''사용법: [-h] [-m [--ascending]] [-u] <merge file> <target file> ...
+            -h --help: 도움말
+            -m --merge-by-date: 날짜순 병합 (기본값 최신순)
+                --ascending: 오래된 순으로 병합 (입력 파일도 오래된 순이어야 함)
+            -u --unique: 중복 기사 제거 (-m과 함께 사용)
+
+            출력과 입력 형식은 확장자로 판단함 (csv | jsonl.gz | parquet)'''))
+    sys.exit(exit_code)
 
 
 def main(argv):
-    merge_file_name = argv[1]
-    target_file_name_list = argv[2:]
+
+    by_date = False  # 날짜순 병합
+    ascending = False  # 오래된 순
+    unique = False  # 중복 기사 제거
+
+    try:  # 명령행 인수 파싱
+        opts, args = getopt.getopt(argv, 'hmu', ['help', 'merge-by-date', 'ascending', 'unique'])
+
+    except getopt.GetoptError as error:  # 오류 발생 (잘못된 입력)
+        print(error)
+        print_help(1)
+
+    for opt, _ in opts:
+        if opt in ('-h', '--help'):  # 도움말
+            print_help(0)
+        elif opt in ('-m', '--merge-by-date'):  # 날짜순 병합
+            by_date = True
+        elif opt == '--ascending':  # 오래된 순
+            ascending = True
+        elif opt in ('-u', '--unique'):  # 중복 기사 제거
+            unique = True
+
+    if (ascending or unique) and not by_date:
+        print_help(1)
+
+    if len(args) < 1:
+        print_help(1)
+
+    merge_file_name = args[0]
+    target_file_name_list = args[1:]
 
     if len(target_file_name_list) < 1:
         print("Target Files less than 1")
         sys.exit(1)
 
-    with open(merge_file_name, 'w', encoding='utf8') as merge_file:
-        with open(target_file_name_list[0], 'r', encoding='utf8') as target_file_first:
-            for line in target_file_first:
-                merge_file.write(line)
-
-        for target_file_name in target_file_name_list[1:]:
-            with open(target_file_name, 'r', encoding='utf8') as target_file:
-                target_file.readline()
-                for line in target_file:
-                    merge_file.write(line)
+    if by_date:
+        num_rows, num_removed = merge_by_date(merge_file_name, target_file_name_list, ascending, unique)
+        print(f'Merged {num_rows} Articles from {len(target_file_name_list)} Files by Date' +
+              (f', {num_removed} Duplicates Removed' if unique else ''))
+    else:
+        concatenate(merge_file_name, target_file_name_list)
+        print(f'Concatenated {len(target_file_name_list)} Files')
 
 
 if __name__ == "__main__":
-    main(sys.argv)
+    main(sys.argv[1:])
@@ -0,0 +1,349 @@
+##########################################################################
+# 단계별 처리 시간 측정
+# 받아오기(fetch), 분석(parse), 정리(clean), 기록(write) 등 단계마다 걸린 시간을 히스토그램으로 모음
+# 히스토그램은 2^(1/4)배 간격의 구간으로 나눠 세므로 메모리는 일정하고 백분위수는 약 20% 오차 안쪽임
+#
+# - 히스토그램과 카운터(수집, 스크랩, 실패한 기사 수 등)는 언론사별로 따로 모으고 합계도 제공함
+# - 게이지(작업 큐 길이 등)는 등록한 함수를 측정값을 만들 때마다 호출해 읽음
+# - 측정값은 JSON 또는 Prometheus 텍스트 형식으로 저장할 수 있으며 SIGUSR1을 받으면 그때까지의 값을 저장함
+# - Progress는 진행 상황을 한 줄로 일정 간격마다 갱신하여 출력함
+##########################################################################
+
+import sys  # 표준 출력
+import json  # 결과 저장
+import math  # 구간 계산
+import time  # 시각
+import signal  # 저장 신호
+import threading  # 동기화 도구
+import contextvars  # 현재 언론사
+from contextlib import contextmanager  # with 문 도구
+
+
+# 시간 히스토그램 (초 단위)
+class Histogram:
+
+    MIN_VALUE = 1e-6  # 가장 작은 구간 경계 (1us)
+    BUCKETS_PER_DOUBLING = 4  # 두 배마다 나눌 구간 수
+    NUM_BUCKETS = 4 * 28  # 1us ~ 약 268초
+
+    def __init__(self):
+        self.counts = [0] * (Histogram.NUM_BUCKETS + 1)  # 마지막 구간은 그보다 큰 값
+        self.count = 0
+        self.total = 0.0
+        self.max = 0.0
+
+    @staticmethod
+    def _bucket(value):
+        if value <= Histogram.MIN_VALUE:
+            return 0
+        bucket = math.ceil(math.log2(value / Histogram.MIN_VALUE) * Histogram.BUCKETS_PER_DOUBLING)
+        return min(bucket, Histogram.NUM_BUCKETS)
+
+    @staticmethod
+    def bucket_bound(bucket):  # 구간의 위쪽 경계
+        return Histogram.MIN_VALUE * 2 ** (bucket / Histogram.BUCKETS_PER_DOUBLING)
+
+    def observe(self, value):
+        self.counts[Histogram._bucket(value)] += 1
+        self.count += 1
+        self.total += value
+        self.max = max(self.max, value)
+
+    def percentile(self, q):  # q (0~1) 백분위수의 근삿값 (구간의 위쪽 경계)
+        if self.count == 0:
+            return 0.0
+        rank = q * self.count
+        cumulative = 0
+        for bucket, count in enumerate(self.counts):
+            cumulative += count
+            if cumulative >= rank:
+                return min(Histogram.bucket_bound(bucket), self.max)
+        return self.max
+
+    def merge(self, other):  # 다른 히스토그램의 값을 더함
+        self.counts = [count + other_count for count, other_count in zip(self.counts, other.counts)]
+        self.count += other.count
+        self.total += other.total
+        self.max = max(self.max, other.max)
+
+    def to_dict(self):
+        return {'count': self.count, 'total': self.total, 'max': self.max,
+                'p50': self.percentile(0.5), 'p99': self.percentile(0.99)}
+
+
+_lock = threading.Lock()
+_histograms = {}  # (단계 이름, 언론사) -> 히스토그램
+_counters = {}  # (카운터 이름, 언론사) -> 값
+_gauges = {}  # 게이지 이름 -> 현재 값을 반환하는 함수
+_start_time = time.monotonic()
+
+# 현재 스레드(코루틴)가 처리 중인 언론사. 언론사를 모르는 공용 함수(받아오기, 정리)의 측정값에 붙임
+_current_press = contextvars.ContextVar('press', default=None)
+
+
+# with 문 안쪽의 측정값에 언론사를 붙임
+@contextmanager
+def press_label(press):
+    token = _current_press.set(press)
+    try:
+        yield
+    finally:
+        _current_press.reset(token)
+
+
+# 걸린 시간 기록. press가 없으면 현재 언론사를 붙이고, 그것도 없으면 합계에만 들어감
+def observe(name, seconds, press=None):
+    if press is None:
+        press = _current_press.get()
+    with _lock:
+        histogram = _histograms.get((name, press))
+        if histogram is None:
+            histogram = _histograms[(name, press)] = Histogram()
+        histogram.observe(seconds)
+
+
+# with 문 안쪽에 걸린 시간 기록
+@contextmanager
+def timer(name, press=None):
+    start = time.perf_counter()
+    try:
+        yield
+    finally:
+        observe(name, time.perf_counter() - start, press)
+
+
+# 카운터 증가
+def count(name, value=1, press=None):
+    if press is None:
+        press = _current_press.get()
+    with _lock:
+        _counters[(name, press)] = _counters.get((name, press), 0) + value
+
+
+# 카운터 값 (press가 None이면 합계)
+def get_count(name, press=None):
+    with _lock:
+        if press is not None:
+            return _counters.get((name, press), 0)
+        return sum(value for (counter_name, _), value in _counters.items() if counter_name == name)
+
+
+# 게이지 등록. function은 인수 없이 현재 값을 반환하는 함수이며 None이면 등록 해제
+def set_gauge(name, function):
+    with _lock:
+        if function is None:
+            _gauges.pop(name, None)
+        else:
+            _gauges[name] = function
+
+
+def _read_gauges():
+    with _lock:
+        gauges = list(_gauges.items())
+    values = {}
+    for name, function in gauges:  # 게이지 함수가 다른 잠금을 잡을 수 있으므로 잠금 밖에서 호출
+        try:
+            values[name] = function()
+        except Exception:
+            continue
+    return values
+
+
+# 현재까지의 측정값
+# stages, counters는 모든 언론사의 합계이고 presses에 언론사별 값이 있음
+def snapshot():
+    gauges = _read_gauges()
+
+    with _lock:
+        stages = {}
+        presses = {}
+        for (name, press), histogram in _histograms.items():
+            if name not in stages:
+                stages[name] = Histogram()
+            stages[name].merge(histogram)
+            if press is not None:
+                presses.setdefault(press, {'stages': {}, 'counters': {}})['stages'][name] = histogram.to_dict()
+
+        counters = {}
+        for (name, press), value in _counters.items():
+            counters[name] = counters.get(name, 0) + value
+            if press is not None:
+                presses.setdefault(press, {'stages': {}, 'counters': {}})['counters'][name] = value
+
+        return {'elapsed': time.monotonic() - _start_time,
+                'stages': {name: histogram.to_dict() for name, histogram in sorted(stages.items())},
+                'counters': dict(sorted(counters.items())),
+                'gauges': dict(sorted(gauges.items())),
+                'presses': dict(sorted(presses.items()))}
+
+
+# 측정값을 JSON 파일로 저장
+def dump_json(file_name):
+    with open(file_name, 'w', encoding='utf8') as metrics_file:
+        json.dump(snapshot(), metrics_file, ensure_ascii=False, indent=2, sort_keys=True)
+
+
+PROMETHEUS_QUANTILES = (0.5, 0.9, 0.99)  # Prometheus summary로 내보낼 백분위수
+
+
+def _labels(**labels):  # Prometheus 레이블 문자열
+    labels = {name: value for name, value in labels.items() if value is not None}
+    if not labels:
+        return ''
+    return '{' + ','.join(f'{name}="{value}"' for name, value in labels.items()) + '}'
+
+
+# 측정값을 Prometheus 텍스트 형식으로 저장 (node_exporter textfile collector 등에서 읽을 수 있음)
+# 히스토그램은 summary로, 언론사는 press 레이블로 구분함
+def dump_prometheus(file_name):
+    gauges = _read_gauges()
+    with _lock:
+        histograms = sorted(_histograms.items(), key=lambda item: (item[0][0], item[0][1] or ''))
+        counters = sorted(_counters.items(), key=lambda item: (item[0][0], item[0][1] or ''))
+        lines = ['# TYPE scrap_stage_seconds summary']
+        for (name, press), histogram in histograms:
+            for quantile in PROMETHEUS_QUANTILES:
+                lines.append(f'scrap_stage_seconds{_labels(stage=name, press=press, quantile=quantile)} '
+                             f'{histogram.percentile(quantile):.6g}')
+            lines.append(f'scrap_stage_seconds_sum{_labels(stage=name, press=press)} {histogram.total:.6g}')
+            lines.append(f'scrap_stage_seconds_count{_labels(stage=name, press=press)} {histogram.count}')
+
+        names = []
+        for (name, press), value in counters:
+            if name not in names:
+                names.append(name)
+                lines.append(f'# TYPE scrap_{name}_total counter')
+            lines.append(f'scrap_{name}_total{_labels(press=press)} {value}')
+
+        lines.append('# TYPE scrap_elapsed_seconds gauge')
+        lines.append(f'scrap_elapsed_seconds {time.monotonic() - _start_time:.3f}')
+
+    for name, value in sorted(gauges.items()):
+        lines.append(f'# TYPE scrap_{name} gauge')
+        lines.append(f'scrap_{name} {value}')
+
+    with open(file_name, 'w', encoding='utf8') as metrics_file:
+        metrics_file.write('\n'.join(lines) + '\n')
+
+
+# 확장자에 따라 저장 (.prom, .txt는 Prometheus 텍스트, 나머지는 JSON)
+def dump(file_name):
+    if file_name.endswith(('.prom', '.txt')):
+        dump_prometheus(file_name)
+    else:
+        dump_json(file_name)
+
+
+# SIGUSR1을 받으면 측정값을 저장하도록 설정. SIGUSR1이 없는 윈도우에서는 아무것도 하지 않음
+# 신호 처리기는 메인 스레드에서 실행되므로, 메인 스레드가 _lock을 잡고 있을 때 신호를 받아 처리기에서 저장하면 멈춤
+# 처리기는 저장 요청만 남기고 저장은 별도 스레드에서 함
+def dump_on_signal(file_name):
+    if not hasattr(signal, 'SIGUSR1'):
+        return
+
+    requested = threading.Event()  # 저장 요청
+
+    def run_dump():
+        while True:
+            requested.wait()
+            requested.clear()  # 저장하는 동안 온 요청은 한 번 더 저장함
+            try:
+                dump(file_name)
+            except OSError as error:
+                print(f'Metrics cannot be Saved to {file_name}: {error}')
+                continue
+            print(f'Metrics Saved to {file_name}')
+
+    threading.Thread(target=run_dump, daemon=True).start()
+    signal.signal(signal.SIGUSR1, lambda signum, frame: requested.set())
+
+
+# 진행 상황 출력기
+# 기사마다 한 줄씩 출력하지 않고 interval초마다 카운터와 게이지를 한 줄로 출력함
+# 터미널이면 같은 줄을 덮어쓰고, 파일로 보낼 때는 non_tty_interval초마다 새 줄로 출력함
+# 터미널에서는 실행 중 sys.stdout을 바꿔서 다른 출력(오류 등)이 진행 상황 줄 뒤에 붙지 않도록 그 줄을 먼저 지움
+class Progress:
+
+    def __init__(self, interval=0.5, non_tty_interval=10.0, output=None):
+        self.output = output if output is not None else sys.stdout
+        self.is_tty = self.output.isatty()
+        self.interval = interval if self.is_tty else non_tty_interval
+
+        self._lock = threading.Lock()
+        self._stop = threading.Event()
+        self._thread = None
+        self._saved_stdout = None  # 바꾸기 전의 sys.stdout
+        self._start_time = time.monotonic()
+        self._last_scraped = 0  # 직전 출력 때의 스크랩 기사 수
+        self._last_time = self._start_time
+        self._width = 0  # 직전에 출력한 줄 길이
+
+    def _line(self):
+        now = time.monotonic()
+        collected = get_count('collected')
+        scraped = get_count('scraped')
+        rate = (scraped - self._last_scraped) / max(now - self._last_time, 1e-9)
+        self._last_scraped, self._last_time = scraped, now
+
+        fields = [f'Collected {collected}', f'Scraped {scraped} ({rate:.1f}/s)']
+        for name in ('nouns', 'duplicate', 'failed', 'retried'):
+            value = get_count(name)
+            if value > 0:
+                fields.append(f'{name.capitalize()} {value}')
+        for name, value in sorted(_read_gauges().items()):
+            fields.append(f'{name} {value}')
+        return f'[{now - _start_time:7.1f}s] ' + ' | '.join(fields)
+
+    def _print(self, line, end):
+        with self._lock:
+            if self.is_tty:  # 같은 줄 덮어쓰기. 이전 줄이 더 길면 나머지를 공백으로 지움
+                self.output.write('\r' + line.ljust(self._width) + end)
+                self._width = len(line) if not end else 0
+            else:
+                self.output.write(line + '\n')
+            self.output.flush()
+
+    def write(self, text):  # 다른 출력. 진행 상황 줄을 지우고 씀 (다음 갱신 때 다시 출력됨)
+        with self._lock:
+            if self._width > 0:
+                self.output.write('\r' + ' ' * self._width + '\r')
+                self._width = 0
+            return self.output.write(text)
+
+    def flush(self):
+        self.output.flush()
+
+    def __getattr__(self, name):  # 그 밖의 속성은 원래 출력의 것을 사용 (sys.stdout 대신 쓰일 때)
+        return getattr(self.output, name)
+
+    def _run(self):
+        while not self._stop.wait(self.interval):
+            self._print(self._line(), '')
+
+    def start(self):
+        if self.is_tty and sys.stdout is self.output:
+            self._saved_stdout = sys.stdout
+            sys.stdout = self
+        self._thread = threading.Thread(target=self._run, daemon=True)
+        self._thread.start()
+        return self
+
+    # 마지막 상태를 출력하고 종료
+    def stop(self):
+        if self._thread is None:
+            return
+        self._stop.set()
+        self._thread.join()
+        self._thread = None
+        if self._saved_stdout is not None:
+            sys.stdout = self._saved_stdout
+            self._saved_stdout = None
+        # 마지막 줄의 처리 속도는 전체 평균
+        self._last_scraped, self._last_time = 0, self._start_time
+        self._print(self._line(), '\n')
+
+    def __enter__(self):
+        return self.start()
+
+    def __exit__(self, *exc_info):
+        self.stop()
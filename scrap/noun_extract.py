@@ -0,0 +1,431 @@
+##################################################################################################
+# 스크랩 결과에서 보통명사 추출 (1_extract_nouns.r의 명사 추출 단계를 대신함)
+# R에서는 SimplePos22로 기사를 하나씩, 한 코어에서, 실행할 때마다 전부 다시 분석했음
+# - 스크랩 결과를 chunk_size개씩 읽어 여러 프로세스가 나눠서 형태소 분석함 (메모리는 묶음 수에만 비례)
+# - 분석 결과를 (분석기, 본문) 해시를 키로 SQLite 캐시에 저장하므로 다시 실행하면 새로 추가되거나
+#   내용이 바뀐 기사만 분석함. 같은 본문이 여러 번 나와도 한 번만 분석함
+# - 분석 프로세스는 시작할 때 분석기를 한 번만 만듦 (konlpy는 JVM을 띄우므로 오래 걸림)
+#
+# 분석기 (-t)
+# - hannanum (기본값): KoNLP의 SimplePos22와 같은 한나눔 22품사 분석, 보통명사(NC)
+# - komoran, mecab: 일반명사(NNG) / okt: 명사(Noun)
+# - <모듈>:<함수>: 본문을 받아 명사 리스트를 반환하는 함수 (예: my_tagger:nouns)
+# 명사는 R의 str_match('([가-힣]+)/NC')처럼 형태소의 끝부분 한글만 씀
+#
+# 출력은 입력의 열을 그대로 두고 본문만 " 명사 명사 ..."로 바꾼 write.table(sep=", ") 형식
+# 저빈도 단어와 불용어 제거는 noun_filter.py에서 함
+#
+# 사용법: noun_extract.py [-h] -i <articles> [-o <output>] [-t <tagger>] [-j <processes>] [--cache <file>]
+# -h --help: 도움말
+# -i --input  (스크랩 결과 파일, csv | jsonl.gz | parquet)
+# -o --output (출력 파일명, 기본값 nouns_{입력 파일명}.csv)
+# -t --tagger (형태소 분석기 hannanum | komoran | mecab | okt | <모듈>:<함수>, 기본값 hannanum)
+# -j --jobs   (분석 프로세스 수, 기본값 CPU 코어 수. 0이면 프로세스를 띄우지 않음)
+# --cache     (분석 결과 캐시 파일명, 기본값 {출력 파일명}.cache)
+# --chunk     (한 번에 읽고 프로세스에 보낼 기사 수, 기본값 64)
+##################################################################################################
+
+import sys  # 시스템 모듈
+import os  # 파일 도구
+import re  # 정규표현식
+import getopt  # 명령행 인수 파서
+import inspect  # 텍스트 도구
+import time  # 처리 시간
+import signal  # SIGINT 무시
+import hashlib  # 본문 해시
+import sqlite3  # SQLite 데이터베이스
+import importlib  # 사용자 분석기 불러오기
+import itertools  # 묶음 나누기
+import multiprocessing  # 프로세스 시작 방식
+import queue  # 기사 전달 큐
+import threading  # 기록 스레드
+import traceback  # 오류 추적 모듈
+from collections import deque  # 처리 중인 묶음
+from concurrent.futures import ProcessPoolExecutor  # 프로세스 풀
+
+import article_sink  # 스크랩 결과 읽기
+import metrics  # 처리량 측정
+import noun_filter  # 명사 파일 형식
+
+# 분석기 이름 -> (konlpy 클래스 이름, pos 인수, 명사 품사)
+TAGGERS = {
+    'hannanum': ('Hannanum', {'ntags': 22}, ('NC',)),
+    'komoran': ('Komoran', {}, ('NNG',)),
+    'mecab': ('Mecab', {}, ('NNG',)),
+    'okt': ('Okt', {}, ('Noun',)),
+}
+
+HANGUL_SUFFIX = re.compile(r'[가-힣]+$')  # 형태소 끝부분의 한글
+
+_tagger = None  # 분석 프로세스의 명사 추출 함수
+
+
+# 분석기 이름으로 명사 추출 함수(본문 -> 명사 리스트)를 만듦
+def make_tagger(name):
+    if name not in TAGGERS:  # <모듈>:<함수>
+        module_name, _, function_name = name.partition(':')
+        if not function_name:
+            raise ValueError(f'Unknown Tagger: {name}')
+        return getattr(importlib.import_module(module_name), function_name)
+
+    import konlpy.tag  # 필요할 때만 불러옴
+
+    class_name, pos_options, noun_tags = TAGGERS[name]
+    tagger = getattr(konlpy.tag, class_name)()
+
+    def nouns(text):
+        result = []
+        for morpheme, tag in tagger.pos(text, **pos_options):
+            if tag in noun_tags:
+                match = HANGUL_SUFFIX.search(morpheme)
+                if match is not None:
+                    result.append(match.group())
+        return result
+
+    return nouns
+
+
+# 명사 리스트를 1_extract_nouns.r의 본문 형식(단어마다 앞에 공백)으로
+def format_nouns(nouns):
+    return ''.join(' ' + noun for noun in nouns)
+
+
+# 분석 프로세스 초기화
+def _init_process(tagger_name):
+    global _tagger
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # Ctrl+C는 부모 프로세스가 처리함
+    _tagger = make_tagger(tagger_name)
+
+
+# 분석 프로세스에서 본문 묶음을 분석
+def _tag_batch(bodies):
+    return [format_nouns(_tagger(body)) if body.strip() else '' for body in bodies]
+
+
+# 분석 결과 캐시 (SQLite). 키는 분석기 이름과 본문의 해시
+class NounCache:
+
+    def __init__(self, path):
+        self.path = path  # 캐시 파일 경로
+        self._connection = sqlite3.connect(path)
+        self._connection.executescript('''
+            CREATE TABLE IF NOT EXISTS nouns (
+                key TEXT PRIMARY KEY,
+                nouns TEXT NOT NULL);
+        ''')
+        self._connection.commit()
+
+    @staticmethod
+    def key(tagger_name, body):
+        return hashlib.sha1(f'{tagger_name}\0{body}'.encode('utf8')).hexdigest()
+
+    # 키 -> 명사 딕셔너리 (캐시에 있는 것만)
+    def get_many(self, keys):
+        keys = list(keys)
+        found = {}
+        for start in range(0, len(keys), 500):  # SQLite 변수 개수 제한
+            part = keys[start:start + 500]
+            found.update(self._connection.execute(
+                f'SELECT key, nouns FROM nouns WHERE key IN ({",".join("?" * len(part))})', part))
+        return found
+
+    def put_many(self, items):
+        self._connection.executemany('INSERT OR REPLACE INTO nouns (key, nouns) VALUES (?, ?)', items)
+        self._connection.commit()
+
+    def close(self):
+        self._connection.close()
+
+
+# 기사(딕셔너리)마다 (기사, 명사 본문)을 입력 순서대로 반환하는 제너레이터
+# 캐시에 없는 본문만 묶음별로 프로세스 풀에 보내고, 처리 중인 묶음이 프로세스 수의 두 배가 되면
+# 가장 먼저 보낸 묶음의 결과를 기다림. num_processes가 0이면 이 프로세스에서 분석함
+# stats는 {'articles': 기사 수, 'tagged': 분석한 본문 수}로 갱신됨
+def extract_nouns(articles, tagger_name, cache=None, num_processes=0, chunk_size=64, stats=None):
+    stats = stats if stats is not None else {}
+    stats.update(articles=0, tagged=0)
+
+    executor = None
+    tagger = None  # 이 프로세스에서 분석할 때의 명사 추출 함수
+    if num_processes > 0:
+        executor = ProcessPoolExecutor(
+            num_processes, mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_process, initargs=(tagger_name,))
+    else:
+        tagger = make_tagger(tagger_name)
+
+    pending = deque()  # (기사 리스트, 키 리스트, 키 -> 명사, 분석할 키 리스트, future 또는 결과)
+
+    def finish(chunk, keys, found, missing, result):
+        results = result.result() if executor is not None else result
+        found.update(zip(missing, results))
+        if cache is not None and missing:
+            cache.put_many(zip(missing, results))
+        stats['articles'] += len(chunk)
+        stats['tagged'] += len(missing)
+        return zip(chunk, (found[key] for key in keys))
+
+    try:
+        iterator = iter(articles)
+        while True:
+            chunk = list(itertools.islice(iterator, chunk_size))
+            if not chunk:
+                break
+
+            bodies = [article.get('body') or '' for article in chunk]
+            keys = [NounCache.key(tagger_name, body) for body in bodies]
+            found = cache.get_many(set(keys)) if cache is not None else {}
+
+            missing_bodies = {key: body for key, body in zip(keys, bodies) if key not in found}  # 중복 제거
+            missing = list(missing_bodies)
+            if executor is not None:
+                result = executor.submit(_tag_batch, list(missing_bodies.values()))
+            else:
+                result = [format_nouns(tagger(body)) if body.strip() else ''
+                          for body in missing_bodies.values()]
+            pending.append((chunk, keys, found, missing, result))
+
+            if len(pending) >= max(num_processes, 1) * 2:
+                yield from finish(*pending.popleft())
+
+        while pending:
+            yield from finish(*pending.popleft())
+
+    finally:
+        if executor is not None:
+            executor.shutdown(cancel_futures=True)
+
+
+# 스크랩한 기사를 바로 명사 추출하여 저장하는 저장 객체 (scrap_articles.py --nouns)
+# article_sink의 저장 객체처럼 write(row, key)로 기사를 받고, 명사를 추출해 파일에 쓴 뒤 on_flush(keys)를 호출함
+# 받은 기사는 크기가 정해진 큐를 거쳐 이 객체의 스레드가 extract_nouns로 넘김
+# 따라서 형태소 분석이 밀리면 write가 기다리고, 그 앞의 결과 큐, 작업 큐, 수집도 차례로 기다림
+# 중단(SIGINT)되면 분석 중인 기사는 버림. 작업 기록에 없으므로 다시 실행하면 다시 작업함
+class NounSink:
+
+    FLUSH_ROWS = 100  # 한 번에 내보낼 행 수
+
+    def __init__(self, file_name, columns, tagger_name, cache_file_name=None, num_processes=0,
+                 chunk_size=64, resume=False, on_flush=None):
+        self.file_name = file_name
+        self.columns = tuple(columns)
+        self.on_flush = on_flush  # 내보낸 뒤 호출할 함수, 내보낸 행의 key 목록을 받음
+        self.stats = {}  # extract_nouns의 기사 수, 분석한 본문 수
+
+        self._queue = queue.Queue(chunk_size * max(num_processes, 1) * 2)  # 분석을 기다리는 (기사, key)
+        self._keys = deque()  # 분석 중인 기사의 key (입력 순서)
+        self._unflushed_keys = []  # 파일에 썼지만 아직 내보내지 않은 행의 key
+        self._lock = threading.RLock()  # 기록 스레드와 메인 스레드(닫기) 사이 보호
+        self._closed = False
+        self._error = None  # 기록 스레드에서 난 오류
+
+        append = resume and os.path.exists(file_name)
+        self._file = open(file_name, 'a' if append else 'w', encoding='utf8', newline='')
+        if not append:
+            self._file.write(noun_filter.format_row(self.columns))
+
+        self._thread = threading.Thread(target=self._run, daemon=True,
+                                        args=(tagger_name, cache_file_name, num_processes, chunk_size))
+        self._thread.start()
+        metrics.set_gauge('noun_queue', self._queue.qsize)
+
+    # 기사 추가. 분석을 기다리는 기사가 많으면 자리가 날 때까지 기다림
+    def write(self, row, key=None):
+        if self._error is not None:
+            raise RuntimeError('Noun Extraction Failed') from self._error
+        if self._closed:
+            return
+        self._queue.put(({column: row[column] for column in self.columns}, key))
+
+    def _articles(self):  # 큐의 기사를 하나씩 반환. 종료 신호(None)가 오면 끝
+        while True:
+            item = self._queue.get()
+            if item is None:
+                return
+            article, key = item
+            self._keys.append(key)
+            yield article
+
+    def _run(self, tagger_name, cache_file_name, num_processes, chunk_size):
+        cache = NounCache(cache_file_name) if cache_file_name is not None else None  # SQLite 연결은 이 스레드에서
+        try:
+            for article, nouns in extract_nouns(self._articles(), tagger_name, cache, num_processes,
+                                                chunk_size, self.stats):
+                key = self._keys.popleft()
+                article['body'] = nouns
+                with self._lock:
+                    if self._closed:
+                        break
+                    self._file.write(noun_filter.format_row(
+                        ['' if article[column] is None else str(article[column]) for column in self.columns]))
+                    metrics.count('nouns', press=article.get('press'))
+                    if key is not None:
+                        self._unflushed_keys.append(key)
+                    if len(self._unflushed_keys) >= self.FLUSH_ROWS:
+                        self._flush()
+
+            with self._lock:
+                if not self._closed:
+                    self._flush()
+
+        except BaseException as error:
+            self._error = error
+            print('Noun Extraction Failed')
+            traceback.print_exc(limit=3, file=sys.stdout)
+            while self._queue.get() is not None:  # write가 기다리지 않도록 남은 기사를 버림
+                pass
+
+        finally:
+            if cache is not None:
+                cache.close()
+
+    def _flush(self):
+        self._file.flush()
+        keys, self._unflushed_keys = self._unflushed_keys, []
+        if keys and self.on_flush is not None:
+            self.on_flush(keys)
+
+    # 이미 쓴 행을 파일에 내보냄. 분석 중인 기사는 close에서 기다림
+    def flush(self):
+        with self._lock:
+            if not self._closed:
+                self._file.flush()
+
+    # 남은 기사를 모두 분석하고 닫음
+    # 대기 중 SIGINT를 받을 수 있도록 타임아웃을 주고 반복해서 확인함
+    def close(self):
+        self._queue.put(None)
+        while self._thread.is_alive():
+            self._thread.join(0.5)
+        self._close_file()
+        if self._error is not None:
+            raise RuntimeError('Noun Extraction Failed') from self._error
+        print(f'Nouns Extracted: {self.stats.get("articles", 0)} Articles, '
+              f'{self.stats.get("tagged", 0)} Tagged')
+
+    # 분석 중인 기사를 버리고 바로 닫음. 이미 쓴 행은 내보냄
+    def terminate(self):
+        with self._lock:
+            if not self._closed:
+                self._flush()
+        self._close_file()
+
+    def _close_file(self):
+        with self._lock:
+            if not self._closed:
+                self._closed = True
+                self._file.close()
+        metrics.set_gauge('noun_queue', None)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc_info):
+        if exc_type is None:
+            self.close()
+        else:
+            self.terminate()
+
+
+# 스크랩 결과에서 명사를 추출하여 저장. 반환값은 stats
+def extract_file(input_file_name, output_file_name, tagger_name, cache=None, num_processes=0, chunk_size=64):
+    stats = {}
+    columns = None
+    temp_file_name = output_file_name + '.tmp'
+
+    with open(temp_file_name, 'w', encoding='utf8', newline='') as file:
+        articles = extract_nouns(article_sink.read_articles(input_file_name), tagger_name,
+                                 cache, num_processes, chunk_size, stats)
+        for count, (article, nouns) in enumerate(articles, 1):
+            if columns is None:  # 입력의 열 순서 그대로
+                columns = list(article)
+                file.write(noun_filter.format_row(columns))
+
+            article['body'] = nouns
+            file.write(noun_filter.format_row(['' if article.get(column) is None else str(article[column])
+                                               for column in columns]))
+
+            if count % 1000 == 0:
+                print(f'\rExtracting Nouns... {count} Articles', end='', flush=True)
+
+    os.replace(temp_file_name, output_file_name)
+    return stats
+
+
+# 커맨드라인 도움말 출력 및 종료
+def print_help(exit_code):
+    print(inspect.cleandoc(
+        '''사용법: [-h] -i <articles> [-o <output>] [-t <tagger>] [-j <processes>] [--cache <file>] [--chunk <number>]
+            -h --help: 도움말
+            -i --input  (스크랩 결과 파일, csv | jsonl.gz | parquet)
+            -o --output (출력 파일명, 기본값 nouns_{입력 파일명}.csv)
+            -t --tagger (형태소 분석기 hannanum | komoran | mecab | okt | <모듈>:<함수>, 기본값 hannanum)
+                        hannanum, komoran, mecab, okt는 konlpy 필요
+            -j --jobs   (분석 프로세스 수, 기본값 CPU 코어 수. 0이면 프로세스를 띄우지 않음)
+            --cache     (분석 결과 캐시 파일명, 기본값 {출력 파일명}.cache)
+            --chunk     (한 번에 읽고 프로세스에 보낼 기사 수, 기본값 64)'''))
+    sys.exit(exit_code)
+
+
+def main(argv):
+
+    articles_file_name = None  # 스크랩 결과 파일명
+    output_file_name = None  # 출력 파일명
+    tagger_name = 'hannanum'  # 형태소 분석기
+    num_processes = os.cpu_count() or 1  # 분석 프로세스 수
+    cache_file_name = None  # 캐시 파일명
+    chunk_size = 64  # 묶음 크기
+
+    try:  # 명령행 인수 파싱
+        opts, _ = getopt.getopt(argv, 'hi:o:t:j:',
+                                ['help', 'input=', 'output=', 'tagger=', 'jobs=', 'cache=', 'chunk='])
+
+    except getopt.GetoptError as error:  # 오류 발생 (잘못된 입력)
+        print(error)
+        print_help(1)
+
+    for opt, arg in opts:
+        if opt in ('-h', '--help'):  # 도움말
+            print_help(0)
+        elif opt in ('-i', '--input'):  # 스크랩 결과 파일명
+            articles_file_name = arg
+        elif opt in ('-o', '--output'):  # 출력 파일명
+            output_file_name = arg
+        elif opt in ('-t', '--tagger'):  # 형태소 분석기
+            tagger_name = arg
+        elif opt in ('-j', '--jobs'):  # 분석 프로세스 수
+            num_processes = int(arg)
+        elif opt == '--cache':  # 캐시 파일명
+            cache_file_name = arg
+        elif opt == '--chunk':  # 묶음 크기
+            chunk_size = int(arg)
+
+    if articles_file_name is None:  # 스크랩 결과 파일 입력 안함
+        print_help(1)
+
+    if output_file_name is None:
+        base_name = os.path.basename(articles_file_name)
+        for extension in article_sink.EXTENSIONS.values():
+            if base_name.endswith(extension):
+                base_name = base_name[:-len(extension)]
+                break
+        output_file_name = os.path.join(os.path.dirname(articles_file_name), f'nouns_{base_name}.csv')
+
+    if cache_file_name is None:
+        cache_file_name = output_file_name + '.cache'
+
+    cache = NounCache(cache_file_name)
+    start_time = time.monotonic()
+    print('Extracting Nouns... ', end='', flush=True)
+    try:
+        stats = extract_file(articles_file_name, output_file_name, tagger_name, cache, num_processes, chunk_size)
+    finally:
+        cache.close()
+
+    print(f'\rExtracting Nouns... [DONE] {stats["articles"]} Articles, '
+          f'{stats["tagged"]} Tagged, {stats["articles"] - stats["tagged"]} Cached')
+    print(f'Saved to {output_file_name} in {time.monotonic() - start_time:.1f}s')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,171 @@
+##################################################################################################
+# 명사 추출 결과에서 저빈도 단어와 불용어 제거 (1_extract_nouns.r의 단어 제거 단계를 대신함)
+# R에서는 제거할 단어마다 전체 본문에 gsub을 실행하므로 (단어 수 x 본문 크기)만큼 걸리고
+# " 단어 " 형태로 찾기 때문에 본문 맨 앞/뒤의 단어나 연달아 나온 같은 단어는 지우지 못했음
+# 여기서는 파일을 두 번 읽음
+# 1. 본문마다 단어로 한 번 나누어 단어별 전체 빈도수와 문서 빈도수를 셈 (메모리는 단어 종류 수에만 비례)
+# 2. 제거할 단어 집합을 만들고, 본문을 다시 나누어 집합에 없는 단어만 남겨 같은 형식으로 저장
+#
+# 저빈도 단어는 tm의 TermDocumentMatrix처럼 2글자 이상인 단어만 셈 (1글자 단어는 빈도와 관계없이 남김)
+# 출력은 R의 write.table(sep=", ")과 같은 형식이며 본문은 " 명사 명사 ..."처럼 단어마다 앞에 공백을 붙임
+#
+# 사용법: noun_filter.py [-h] -i <nouns> [-f <filter>] [-o <output>] [-m <count>] [-D <documents>]
+# -h --help: 도움말
+# -i --input  (명사 추출 결과 CSV 파일, noun_extract.py나 1_extract_nouns.r -r의 출력)
+# -f --filter (불용어 파일, 공백이나 줄바꿈으로 구분. 기본값 filter.txt, 없으면 불용어 제거 안함)
+# -o --output (출력 파일명, 기본값 {입력 파일명}_filtered.csv)
+# -m --min-count (남길 단어의 최소 전체 빈도수, 기본값 3. R의 findFreqTerms(tdm, 1, 2) 제거와 같음)
+# -D --min-docs  (남길 단어의 최소 문서 빈도수, 기본값 1)
+##################################################################################################
+
+import sys  # 시스템 모듈
+import os  # 파일 도구
+import csv  # CSV 파일 도구
+import getopt  # 명령행 인수 파서
+import inspect  # 텍스트 도구
+import time  # 처리 시간
+from collections import Counter  # 단어 빈도수
+
+MIN_WORD_LENGTH = 2  # 빈도수를 셀 단어의 최소 글자 수 (TermDocumentMatrix의 wordLengths)
+BODY_COLUMN = 'body'  # 명사들이 들어있는 열
+
+
+# 명사 파일의 머리글과 행들을 하나씩 반환. 첫 번째 값이 머리글
+# R의 write.table(sep=", ")로 쓴 파일이므로 구분자 뒤의 공백을 무시하고, 따옴표는 \"로 이스케이프된 것으로 읽음
+def read_rows(file_name):
+    csv.field_size_limit(sys.maxsize)
+    with open(file_name, encoding='utf-8-sig', newline='') as file:
+        yield from csv.reader(file, skipinitialspace=True, escapechar='\\')
+
+
+# 행 하나를 write.table(sep=", ")과 같은 형식으로 변환 (모든 값을 따옴표로 감싸고 따옴표는 \"로)
+def format_row(row):
+    return ', '.join('"' + value.replace('"', '\\"') + '"' for value in row) + '\n'
+
+
+# 불용어 파일의 단어 집합. R의 scan(what="character")처럼 공백과 줄바꿈으로 구분
+def read_stopwords(file_name):
+    with open(file_name, encoding='utf-8-sig') as file:
+        return set(file.read().split())
+
+
+# 본문들의 단어별 전체 빈도수와 문서 빈도수
+def count_words(bodies, min_length=MIN_WORD_LENGTH):
+    term_counts = Counter()
+    document_counts = Counter()
+    for body in bodies:
+        counts = Counter(word for word in body.split() if len(word) >= min_length)
+        term_counts.update(counts)
+        document_counts.update(counts.keys())
+    return term_counts, document_counts
+
+
+# 제거할 단어 집합 (빈도수가 부족한 단어와 불용어)
+def removed_words(term_counts, document_counts, stopwords=(), min_count=3, min_docs=1):
+    removed = {word for word, count in term_counts.items()
+               if count < min_count or document_counts[word] < min_docs}
+    removed.update(stopwords)
+    return removed
+
+
+# 본문에서 제거할 단어를 뺀 나머지. 1_extract_nouns.r처럼 단어마다 앞에 공백을 붙임
+def filter_body(body, removed):
+    return ''.join(' ' + word for word in body.split() if word not in removed)
+
+
+# 명사 파일의 저빈도 단어와 불용어를 제거하여 저장. 반환값은 (기사 수, 단어 종류 수, 제거한 단어 종류 수)
+# on_body가 있으면 제거한 뒤의 본문마다 호출함 (같은 패스에서 문서-단어 행렬을 만들 때 사용)
+def filter_nouns(input_file_name, output_file_name, stopwords=(), min_count=3, min_docs=1, on_body=None):
+    rows = read_rows(input_file_name)
+    header = next(rows, None)
+    if header is None:
+        raise ValueError(f'Empty File: {input_file_name}')
+    position = header.index(BODY_COLUMN)
+
+    # 1. 빈도수 세기
+    term_counts, document_counts = count_words(row[position] for row in rows if position < len(row))
+    removed = removed_words(term_counts, document_counts, stopwords, min_count, min_docs)
+
+    # 2. 다시 읽으며 제거. 입력과 출력이 같은 파일이어도 되도록 임시 파일에 쓴 뒤 바꿈
+    num_articles = 0
+    temp_file_name = output_file_name + '.tmp'
+    rows = read_rows(input_file_name)
+    with open(temp_file_name, 'w', encoding='utf8', newline='') as file:
+        file.write(format_row(next(rows)))
+        for row in rows:
+            if position < len(row):
+                row[position] = filter_body(row[position], removed)
+                if on_body is not None:
+                    on_body(row[position])
+            file.write(format_row(row))
+            num_articles += 1
+    os.replace(temp_file_name, output_file_name)
+
+    return num_articles, len(term_counts), len(removed & term_counts.keys())
+
+
+# 커맨드라인 도움말 출력 및 종료
+def print_help(exit_code):
+    print(inspect.cleandoc(
+        '''사용법: [-h] -i <nouns> [-f <filter>] [-o <output>] [-m <count>] [-D <documents>]
+            -h --help: 도움말
+            -i --input  (명사 추출 결과 CSV 파일, noun_extract.py나 1_extract_nouns.r -r의 출력)
+            -f --filter (불용어 파일, 공백이나 줄바꿈으로 구분. 기본값 filter.txt, 없으면 불용어 제거 안함)
+            -o --output (출력 파일명, 기본값 {입력 파일명}_filtered.csv)
+            -m --min-count (남길 단어의 최소 전체 빈도수, 기본값 3)
+            -D --min-docs  (남길 단어의 최소 문서 빈도수, 기본값 1)'''))
+    sys.exit(exit_code)
+
+
+def main(argv):
+
+    nouns_file_name = None  # 명사 파일명
+    filter_file_name = None  # 불용어 파일명
+    output_file_name = None  # 출력 파일명
+    min_count = 3  # 최소 전체 빈도수
+    min_docs = 1  # 최소 문서 빈도수
+
+    try:  # 명령행 인수 파싱
+        opts, _ = getopt.getopt(argv, 'hi:f:o:m:D:',
+                                ['help', 'input=', 'filter=', 'output=', 'min-count=', 'min-docs='])
+
+    except getopt.GetoptError as error:  # 오류 발생 (잘못된 입력)
+        print(error)
+        print_help(1)
+
+    for opt, arg in opts:
+        if opt in ('-h', '--help'):  # 도움말
+            print_help(0)
+        elif opt in ('-i', '--input'):  # 명사 파일명
+            nouns_file_name = arg
+        elif opt in ('-f', '--filter'):  # 불용어 파일명
+            filter_file_name = arg
+        elif opt in ('-o', '--output'):  # 출력 파일명
+            output_file_name = arg
+        elif opt in ('-m', '--min-count'):  # 최소 전체 빈도수
+            min_count = int(arg)
+        elif opt in ('-D', '--min-docs'):  # 최소 문서 빈도수
+            min_docs = int(arg)
+
+    if nouns_file_name is None:  # 명사 파일 입력 안함
+        print_help(1)
+
+    if output_file_name is None:
+        output_file_name = os.path.splitext(nouns_file_name)[0] + '_filtered.csv'
+
+    stopwords = set()
+    if filter_file_name is not None:
+        stopwords = read_stopwords(filter_file_name)
+    elif os.path.exists('filter.txt'):
+        stopwords = read_stopwords('filter.txt')
+
+    start_time = time.monotonic()
+    print('Removing Infrequent Words and Stopwords... ', end='', flush=True)
+    num_articles, num_words, num_removed = filter_nouns(nouns_file_name, output_file_name,
+                                                        stopwords, min_count, min_docs)
+    print(f'[DONE] {num_articles} Articles, Removed {num_removed} of {num_words} Words')
+    print(f'Saved to {output_file_name} in {time.monotonic() - start_time:.1f}s')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,174 @@
+##########################################################################
+# 기사 분석용 프로세스 풀
+# 받아오기는 스레드(코루틴)가 하고, CPU를 쓰는 HTML 분석과 정리(정규식)는 여러 프로세스가 나눠서 함
+# - 프로세스 간 통신 비용을 줄이기 위해 기사를 batch_size개씩 묶어서 보냄
+#   묶음이 다 차지 않아도 batch_delay초가 지나면 보냄
+# - 처리 중인 묶음이 프로세스 수의 두 배가 되면 submit이 기다리므로 메모리 사용량이 일정함
+# - 분석 프로세스는 시작할 때 부모와 같은 HTML 분석기를 설정하고 언론사별 스크래퍼를 한 번만 만듦
+#
+# 윈도우와 같은 방식으로 동작하도록, 그리고 스레드가 있는 프로세스를 fork하지 않도록 spawn으로 시작함
+##########################################################################
+
+import time  # 시각
+import signal  # SIGINT 무시
+import traceback  # 오류 추적 모듈
+import threading  # 동기화 도구
+import multiprocessing  # 프로세스 시작 방식
+from concurrent.futures import ProcessPoolExecutor  # 프로세스 풀
+
+import html_parser  # HTML 분석기 선택
+import metrics  # 단계별 처리 시간 측정
+from scraper_press import SCRAPERS  # 언론사별 스크래퍼
+
+_scrapers = {}  # 분석 프로세스의 언론사 -> 스크래퍼
+
+
+# 분석 프로세스 초기화
+def _init_process(backend):
+    signal.signal(signal.SIGINT, signal.SIG_IGN)  # Ctrl+C는 부모 프로세스가 처리함
+    html_parser.set_backend(backend)
+
+
+# 분석 프로세스에서 묶음 하나를 분석. [(결과, 오류 메시지, 걸린 시간, 정리에 걸린 시간), ...] 반환
+# 분석 프로세스의 측정값은 부모에게 전달되지 않으므로 시간을 함께 반환하여 부모가 기록함
+def _parse_batch(press, contents):
+    scraper = _scrapers.get(press)
+    if scraper is None:
+        scraper = _scrapers[press] = SCRAPERS[press]()
+
+    results = []
+    for content in contents:
+        start = time.perf_counter()
+        try:
+            article, clean_seconds = scraper.parse_article_timed(content)
+            results.append((article, None, time.perf_counter() - start, clean_seconds))
+        except Exception:
+            results.append((None, traceback.format_exc(limit=3), time.perf_counter() - start, 0.0))
+    return results
+
+
+class ParsePool:
+
+    def __init__(self, num_processes, on_result, batch_size=16, batch_delay=0.05):
+        # on_result(item, content, error): 기사 하나의 분석이 끝날 때마다 풀의 관리 스레드에서 호출됨
+        # content는 분석 결과 (실패하면 None), error는 실패했을 때의 오류 메시지
+        self.on_result = on_result
+        self.batch_size = batch_size  # 한 번에 보낼 기사 수
+        self.batch_delay = batch_delay  # 묶음이 다 차지 않았을 때 보내기까지 기다릴 최대 시간 (초)
+
+        self._executor = ProcessPoolExecutor(
+            num_processes, mp_context=multiprocessing.get_context('spawn'),
+            initializer=_init_process, initargs=(html_parser.get_backend(),))
+
+        self._slots = threading.BoundedSemaphore(num_processes * 2)  # 처리 중인 묶음 수 제한
+        self._lock = threading.Lock()
+        self._idle = threading.Condition(self._lock)  # 남은 기사가 없을 때 알림
+        self._batches = {}  # 언론사 -> (항목 리스트, 내용 리스트, 첫 기사를 넣은 시각)
+        self._num_pending = 0  # 보냈거나 묶음에 들어있는, 분석이 끝나지 않은 기사 수
+
+        self._terminated = False  # terminate 이후에 들어온 기사는 버림
+        self._stop = threading.Event()
+        self._flusher = threading.Thread(target=self._run_flusher, daemon=True)
+        self._flusher.start()
+
+        metrics.set_gauge('parse_pending', lambda: self._num_pending)
+
+    # 분석할 기사 추가. item은 on_result에 그대로 넘겨주는 값
+    # 처리 중인 묶음이 많으면 자리가 날 때까지 기다림
+    def submit(self, press, item, content):
+        with self._lock:
+            if self._terminated:
+                return
+            batch = self._batches.get(press)
+            if batch is None:
+                batch = self._batches[press] = ([], [], time.monotonic())
+            batch[0].append(item)
+            batch[1].append(content)
+            self._num_pending += 1
+
+            full = len(batch[0]) >= self.batch_size
+            if full:
+                del self._batches[press]
+
+        if full:
+            self._send(press, batch)
+
+    def _send(self, press, batch):
+        items, contents, _ = batch
+        self._slots.acquire()
+        try:
+            if self._terminated:
+                self._slots.release()
+                return
+            future = self._executor.submit(_parse_batch, press, contents)
+        except BaseException:
+            self._slots.release()
+            raise
+        future.add_done_callback(lambda done: self._on_done(press, items, done))
+
+    def _on_done(self, press, items, future):
+        self._slots.release()
+        if self._terminated:  # 취소된 묶음
+            return
+        try:
+            results = future.result()
+        except Exception:  # 분석 프로세스가 죽은 경우 등
+            results = [(None, traceback.format_exc(limit=3), 0.0, 0.0)] * len(items)
+
+        for item, (content, error, seconds, clean_seconds) in zip(items, results):
+            if error is None:
+                metrics.observe('parse', seconds, press)
+                metrics.observe('clean', clean_seconds, press)
+            self.on_result(item, content, error)
+
+        with self._lock:
+            self._num_pending -= len(items)
+            if self._num_pending == 0:
+                self._idle.notify_all()
+
+    # older_than초보다 오래 기다린 묶음을 보냄
+    def _flush(self, older_than=0.0):
+        now = time.monotonic()
+        with self._lock:
+            ready = [(press, batch) for press, batch in self._batches.items() if now - batch[2] >= older_than]
+            for press, _ in ready:
+                del self._batches[press]
+
+        for press, batch in ready:
+            self._send(press, batch)
+
+    def _run_flusher(self):
+        while not self._stop.wait(self.batch_delay / 2):
+            self._flush(self.batch_delay)
+
+    # 남은 기사를 모두 분석하고 종료
+    # 대기 중 SIGINT를 받을 수 있도록 타임아웃을 주고 반복해서 확인함
+    def close(self):
+        self._stop.set()
+        self._flusher.join()
+        self._flush()
+
+        with self._lock:
+            while self._num_pending > 0:
+                self._idle.wait(0.5)
+
+        self._executor.shutdown()
+        metrics.set_gauge('parse_pending', None)
+
+    # 남은 기사를 버리고 바로 종료
+    def terminate(self):
+        with self._lock:
+            self._terminated = True
+            self._batches.clear()
+        self._stop.set()
+        self._executor.shutdown(wait=False, cancel_futures=True)
+        metrics.set_gauge('parse_pending', None)
+
+    def __enter__(self):
+        return self
+
+    def __exit__(self, exc_type, *exc_info):
+        if exc_type is None:
+            self.close()
+        else:
+            self.terminate()
@@ -0,0 +1,206 @@
+##########################################################################
+# 호스트별 요청 속도/동시 요청 수 조절기
+# - 토큰 버킷으로 초당 요청 수를, AIMD(가법 증가, 승법 감소)로 동시 요청 수를 조절함
+# - 429/503/504 응답, 타임아웃, 연결 오류를 과부하 신호로 보고 동시 요청 수와 속도를 절반으로 줄임
+#   Retry-After 헤더가 있으면 그 시간 동안 해당 호스트로 요청을 보내지 않음
+# - 응답 시간이 기준(관측된 최소 응답 시간의 몇 배) 안쪽이면 동시 요청 수와 속도를 조금씩 늘림
+#   처음 과부하 신호를 받기 전까지는 응답마다 1씩 늘려 빠르게 작업자 수까지 올라감 (TCP slow start)
+# 수집(검색 페이지)과 스크랩(기사)이 같은 호스트면 같은 조절기를 사용함
+##########################################################################
+
+import time  # 시각
+import math  # 내림
+import asyncio  # 비동기 대기
+import threading  # 동기화 도구
+import urllib.parse  # 주소 분석
+import email.utils  # Retry-After 날짜 분석
+from collections import deque  # 대기열, 최근 요청 시각
+
+THROTTLE_STATUS = (429, 503, 504)  # 과부하 신호로 볼 응답 코드
+MAX_RETRY_AFTER = 300  # Retry-After를 따를 최대 시간 (초)
+
+
+# Retry-After 헤더를 초로 변환. 없거나 잘못된 값이면 None
+def parse_retry_after(value):
+    if not value:
+        return None
+    try:
+        seconds = float(value)
+    except ValueError:
+        try:
+            seconds = email.utils.parsedate_to_datetime(value).timestamp() - time.time()
+        except (TypeError, ValueError):
+            return None
+    return min(max(seconds, 0.0), MAX_RETRY_AFTER)
+
+
+# 호스트 하나의 조절기
+class HostLimiter:
+
+    MIN_RATE = 0.5  # 최소 초당 요청 수
+    RATE_STEP = 1.0  # 응답이 건강할 때 1초마다 늘릴 초당 요청 수
+    # 최소 응답 시간의 이 배수 + LATENCY_SLACK 안쪽이면 건강한 것으로 봄
+    # 스레드 엔진에서는 클라이언트의 GIL 대기도 응답 시간에 들어가므로 넉넉하게 잡음
+    LATENCY_TOLERANCE = 4.0
+    LATENCY_SLACK = 0.1
+
+    def __init__(self, host, max_concurrency=16, initial_concurrency=4, max_rate=None):
+        self.host = host
+        self.max_concurrency = max_concurrency  # 동시 요청 수 상한 (작업자 수)
+        self.max_rate = max_rate if max_rate is not None else math.inf  # 초당 요청 수 상한
+
+        self.limit = float(min(initial_concurrency, max_concurrency))  # 현재 동시 요청 수 한도
+        self.rate = self.max_rate  # 현재 초당 요청 수 한도
+        self.in_flight = 0  # 진행 중인 요청 수
+
+        self._tokens = 1.0  # 토큰 버킷
+        self._last_refill = time.monotonic()
+        self._blocked_until = 0.0  # Retry-After로 요청을 멈춘 시각까지
+        self._last_decrease = 0.0  # 마지막으로 줄인 시각
+        self._slow_start = True  # 과부하 신호를 받기 전
+        self._min_latency = None  # 관측된 최소 응답 시간
+        self._smoothed_latency = None  # 평균 응답 시간 (지수 이동 평균)
+        self._recent_starts = deque()  # 최근 1초 동안 요청을 시작한 시각
+
+        self._condition = threading.Condition()
+        self._async_waiters = deque()  # 자리를 기다리는 코루틴의 future
+
+    def _refill(self, now):
+        if self.rate == math.inf:
+            self._tokens = 1.0
+        else:
+            burst = max(1.0, self.rate)  # 1초 분량까지 모아둠
+            self._tokens = min(burst, self._tokens + (now - self._last_refill) * self.rate)
+        self._last_refill = now
+
+    # 요청을 시작할 수 있으면 자리를 잡고 0, 아니면 기다릴 시간 (자리가 날 때까지면 None)
+    def _try_acquire(self, now):
+        if now < self._blocked_until:
+            return self._blocked_until - now
+        if self.in_flight >= max(1, math.floor(self.limit)):
+            return None
+
+        self._refill(now)
+        if self._tokens < 1.0:
+            return (1.0 - self._tokens) / self.rate
+
+        self._tokens -= 1.0
+        self.in_flight += 1
+        self._recent_starts.append(now)
+        while self._recent_starts and self._recent_starts[0] < now - 1.0:
+            self._recent_starts.popleft()
+        return 0
+
+    # 요청 시작 전 호출 (스레드). 반환값은 시작 시각이며 release에 넘겨줌
+    def acquire(self):
+        with self._condition:
+            while True:
+                now = time.monotonic()
+                wait = self._try_acquire(now)
+                if wait == 0:
+                    return now
+                self._condition.wait(wait if wait is not None else 1.0)
+
+    # 요청 시작 전 호출 (코루틴)
+    async def acquire_async(self):
+        loop = asyncio.get_running_loop()
+        while True:
+            with self._condition:
+                now = time.monotonic()
+                wait = self._try_acquire(now)
+                if wait == 0:
+                    return now
+                if wait is None:  # 자리가 나면 release가 깨워줌
+                    waiter = loop.create_future()
+                    self._async_waiters.append(waiter)
+
+            if wait is None:
+                try:
+                    await asyncio.wait_for(waiter, 1.0)
+                except asyncio.TimeoutError:
+                    pass
+            else:
+                await asyncio.sleep(wait)
+
+    # 요청 종료 후 호출
+    # throttled: 과부하 신호를 받았는지, retry_after: 서버가 알려준 대기 시간 (초)
+    def release(self, start, throttled=False, retry_after=None):
+        with self._condition:
+            now = time.monotonic()
+            latency = now - start
+            self.in_flight -= 1
+
+            if throttled:
+                self._decrease(now, retry_after)
+            else:
+                self._observe(latency)
+
+            # 빈 자리만큼 기다리는 쪽을 깨움
+            free = max(1, math.floor(self.limit)) - self.in_flight
+            if free > 0:
+                self._condition.notify(free)
+                while free > 0 and self._async_waiters:
+                    waiter = self._async_waiters.popleft()
+                    if not waiter.done():
+                        waiter.get_loop().call_soon_threadsafe(_wake, waiter)
+                        free -= 1
+
+    def _observe(self, latency):  # 정상 응답. 건강하면 가법 증가
+        if self._min_latency is None or latency < self._min_latency:
+            self._min_latency = latency
+        self._smoothed_latency = latency if self._smoothed_latency is None \
+            else 0.8 * self._smoothed_latency + 0.2 * latency
+
+        if latency > self._min_latency * HostLimiter.LATENCY_TOLERANCE + HostLimiter.LATENCY_SLACK:
+            return  # 서버에 요청이 쌓이고 있으므로 늘리지 않음
+
+        # slow start에서는 응답마다, 그 뒤로는 한도만큼 응답을 받을 때마다 동시 요청 수를 1씩 늘림
+        step = 1.0 if self._slow_start else 1.0 / max(self.limit, 1.0)
+        self.limit = min(self.max_concurrency, self.limit + step)
+        # 1초마다 RATE_STEP만큼 늘어나도록 응답마다 조금씩 늘림
+        if self.rate != math.inf:
+            self.rate = min(self.max_rate, self.rate + HostLimiter.RATE_STEP / max(self.rate, 1.0))
+
+    def _decrease(self, now, retry_after):  # 과부하. 승법 감소
+        if retry_after is not None:
+            self._blocked_until = max(self._blocked_until, now + retry_after)
+
+        # 동시에 보낸 요청들이 한꺼번에 실패해도 한 번만 줄이도록 평균 응답 시간 안에는 다시 줄이지 않음
+        if now - self._last_decrease < max(self._smoothed_latency or 0.0, 0.1):
+            return
+        self._last_decrease = now
+        self._slow_start = False
+
+        observed_rate = len(self._recent_starts)  # 최근 1초 동안 보낸 요청 수
+        self.limit = max(1.0, self.limit / 2)
+        self.rate = max(HostLimiter.MIN_RATE, min(self.rate, observed_rate) / 2)
+
+        print(f'Throttled by {self.host}: Concurrency {self.limit:.1f}, Rate {self.rate:.1f}/s')
+
+
+def _wake(waiter):
+    if not waiter.done():
+        waiter.set_result(None)
+
+
+_limiters = {}  # 호스트 -> 조절기
+_limiters_lock = threading.Lock()
+_settings = {'max_concurrency': 16, 'initial_concurrency': 4, 'max_rate': None}
+
+
+# 조절기 설정. 첫 요청 전에 호출해야 함
+# max_concurrency: 호스트당 최대 동시 요청 수, max_rate: 호스트당 최대 초당 요청 수 (None이면 제한 없음)
+def configure(**kwargs):
+    with _limiters_lock:
+        _settings.update(kwargs)
+        _limiters.clear()
+
+
+# 주소의 호스트에 해당하는 조절기 반환
+def get_limiter(url):
+    host = urllib.parse.urlsplit(url).netloc.lower()
+    with _limiters_lock:
+        limiter = _limiters.get(host)
+        if limiter is None:
+            limiter = _limiters[host] = HostLimiter(host, **_settings)
+        return limiter
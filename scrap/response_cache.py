@@ -0,0 +1,129 @@
+##########################################################################
+# HTTP 응답 디스크 캐시
+# 주소별로 받아온 페이지 내용을 압축해서 저장하고, 다시 분석할 때 네트워크 대신 사용함
+# - 전체 크기가 한도를 넘으면 가장 오래 쓰지 않은 항목부터 지움 (LRU)
+# - 검색 결과 페이지는 유효 시간(TTL)이 지나면 다시 받고, 기사 페이지는 계속 사용함
+# - 오프라인 모드에서는 네트워크에 접근하지 않고 캐시에 없으면 오류를 냄
+#
+# 파일의 수정 시각은 받아온 시각(TTL 계산용), 접근 시각은 마지막 사용 시각(LRU용)으로 씀
+##########################################################################
+
+import os  # 파일 도구
+import time  # 시각
+import zlib  # 압축
+import hashlib  # 주소 해시
+import threading  # 동기화 도구
+from collections import OrderedDict  # LRU 순서 보관
+
+
+# 오프라인 모드에서 캐시에 없는 주소를 요청한 경우
+class CacheMissError(Exception):
+    pass
+
+
+class ResponseCache:
+
+    def __init__(self, directory, max_bytes=1024 * 1024 * 1024, page_ttl=3600, offline=False):
+        self.directory = directory  # 캐시 디렉토리
+        self.max_bytes = max_bytes  # 최대 전체 크기
+        self.page_ttl = page_ttl  # 검색 결과 페이지 유효 시간 (초)
+        self.offline = offline  # 오프라인 모드
+
+        self._lock = threading.Lock()
+        self._entries = OrderedDict()  # 파일 경로 -> 크기, 오래 쓰지 않은 순서
+        self._total_bytes = 0
+
+        os.makedirs(directory, exist_ok=True)
+        self._load_entries()
+
+    def _load_entries(self):  # 디스크에 있는 항목을 마지막 사용 순서대로 읽음
+        entries = []
+        for sub_dir in os.scandir(self.directory):
+            if not sub_dir.is_dir():
+                continue
+            for entry in os.scandir(sub_dir.path):
+                if entry.name.endswith('.z'):
+                    stat = entry.stat()
+                    entries.append((stat.st_atime, entry.path, stat.st_size))
+
+        for _, path, size in sorted(entries):
+            self._entries[path] = size
+            self._total_bytes += size
+
+    def _path(self, url):  # 주소에 해당하는 파일 경로
+        key = hashlib.sha1(url.encode('utf8')).hexdigest()
+        return os.path.join(self.directory, key[:2], key + '.z')
+
+    # 캐시된 내용 반환. 없거나 유효 시간이 지났으면 None
+    # kind: 'page' (검색 결과, TTL 적용) | 'article' (기사, 계속 유효)
+    # 같은 디렉토리를 쓰는 다른 프로세스(--worker)가 시작한 뒤에 저장한 항목도 있으므로 색인이 아니라 파일을 확인하고,
+    # 색인에 없던 파일은 색인에 넣음. 파일은 잠금 밖에서 읽음
+    def get(self, url, kind='article'):
+        path = self._path(url)
+
+        try:
+            stat = os.stat(path)
+            if (kind == 'page' and not self.offline
+                    and time.time() - stat.st_mtime > self.page_ttl):  # 만료된 검색 결과
+                return None
+
+            with open(path, 'rb') as cache_file:
+                data = cache_file.read()
+
+            os.utime(path, (time.time(), stat.st_mtime))  # 사용 시각 갱신
+
+        except OSError:  # 없거나 다른 프로세스가 지운 경우
+            with self._lock:
+                self._total_bytes -= self._entries.pop(path, 0)
+            return None
+
+        with self._lock:
+            if path in self._entries:
+                self._entries.move_to_end(path)
+            else:  # 다른 프로세스가 저장한 항목
+                self._entries[path] = stat.st_size
+                self._total_bytes += stat.st_size
+                self._evict()
+
+        return zlib.decompress(data).decode('utf8')
+
+    # 내용 저장 후 한도를 넘으면 오래된 항목 삭제
+    def put(self, url, text):
+        path = self._path(url)
+        data = zlib.compress(text.encode('utf8'))
+
+        os.makedirs(os.path.dirname(path), exist_ok=True)
+        # 같은 캐시 디렉토리를 여러 프로세스(--worker)가 쓰므로 프로세스 번호와 스레드 번호로 구분
+        temp_path = f'{path}.{os.getpid()}.{threading.get_ident()}.tmp'
+        with open(temp_path, 'wb') as cache_file:
+            cache_file.write(data)
+        os.replace(temp_path, path)  # 읽는 쪽이 쓰다 만 파일을 보지 않도록
+
+        with self._lock:
+            self._total_bytes -= self._entries.pop(path, 0)
+            self._entries[path] = len(data)
+            self._total_bytes += len(data)
+            self._evict()
+
+    def _evict(self):  # 한도를 넘으면 오래 쓰지 않은 항목부터 삭제 (잠금을 잡고 호출)
+        while self._total_bytes > self.max_bytes and len(self._entries) > 1:
+            old_path, size = self._entries.popitem(last=False)
+            self._total_bytes -= size
+            try:
+                os.remove(old_path)
+            except OSError:
+                pass
+
+
+_cache = None  # 프로세스 전체에서 공유하는 캐시
+
+
+# 캐시 사용 설정
+def configure(directory, **kwargs):
+    global _cache
+    _cache = ResponseCache(directory, **kwargs)
+
+
+# 공유 캐시 반환. 설정하지 않았으면 None
+def get_cache():
+    return _cache
@@ -0,0 +1,94 @@
+##########################################################################
+# 수집/스크랩 작업 기록 (SQLite)
+# 수집한 기사 링크와 스크랩을 마친 기사 링크를 기록해서
+# 작업이 중간에 멈추면 다시 실행할 때 끝난 작업을 건너뛰고 이어서 진행함
+##########################################################################
+
+import sqlite3  # SQLite 데이터베이스
+import threading  # 동기화 도구
+
+
+class RunJournal:
+
+    def __init__(self, path):
+        self.path = path  # 기록 파일 경로
+
+        # 여러 스레드(수집, 기록)가 같은 연결을 쓰므로 잠금으로 보호함
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, check_same_thread=False)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute('PRAGMA synchronous=NORMAL')
+        self._connection.executescript('''
+            CREATE TABLE IF NOT EXISTS collected (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                url TEXT UNIQUE NOT NULL,
+                title TEXT NOT NULL,
+                press TEXT);
+            CREATE TABLE IF NOT EXISTS scraped (
+                url TEXT PRIMARY KEY);
+        ''')
+
+        # 언론사 열이 없던 이전 기록. 기존 기사의 언론사는 NULL (그 실행의 언론사)로 둠
+        columns = [row[1] for row in self._connection.execute('PRAGMA table_info(collected)')]
+        if 'press' not in columns:
+            self._connection.execute('ALTER TABLE collected ADD COLUMN press TEXT')
+        self._connection.commit()
+
+    def _execute(self, sql, params=()):
+        with self._lock:
+            self._connection.execute(sql, params)
+            self._connection.commit()
+
+    def _execute_many(self, sql, params_list):  # 여러 행을 한 번에 커밋
+        with self._lock:
+            self._connection.executemany(sql, params_list)
+            self._connection.commit()
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return self._connection.execute(sql, params).fetchall()
+
+    # 수집한 기사 기록
+    def add_collected(self, url, title, press=None):
+        self._execute('INSERT OR IGNORE INTO collected (url, title, press) VALUES (?, ?, ?)', (url, title, press))
+
+    # 스크랩을 마친 기사 기록
+    def add_scraped(self, url):
+        self._execute('INSERT OR IGNORE INTO scraped (url) VALUES (?)', (url,))
+
+    # 여러 기사를 한 번에 기록. 저장 형식이 파일에 내보낸 뒤 호출함
+    def add_collected_many(self, articles):  # [(링크, 제목, 언론사), ...]
+        self._execute_many('INSERT OR IGNORE INTO collected (url, title, press) VALUES (?, ?, ?)', articles)
+
+    def add_scraped_many(self, urls):
+        self._execute_many('INSERT OR IGNORE INTO scraped (url) VALUES (?)', [(url,) for url in urls])
+
+    def is_collected(self, url):
+        return bool(self._query('SELECT 1 FROM collected WHERE url = ?', (url,)))
+
+    def is_scraped(self, url):
+        return bool(self._query('SELECT 1 FROM scraped WHERE url = ?', (url,)))
+
+    # 수집한 기사 수. press를 주면 그 언론사의 기사 수 (언론사가 기록되지 않은 이전 기사 포함)
+    def collected_count(self, press=None):
+        if press is None:
+            return self._query('SELECT COUNT(*) FROM collected')[0][0]
+        return self._query('SELECT COUNT(*) FROM collected WHERE press = ? OR press IS NULL', (press,))[0][0]
+
+    # 언론사의 기사 주소를 수집 순서대로 limit개 반환 (언론사가 기록되지 않은 이전 기사 포함)
+    def collected_urls(self, press, limit):
+        return [url for (url,) in self._query(
+            'SELECT url FROM collected WHERE press = ? OR press IS NULL ORDER BY seq LIMIT ?', (press, limit))]
+
+    def scraped_count(self):
+        return self._query('SELECT COUNT(*) FROM scraped')[0][0]
+
+    # 수집은 했지만 아직 스크랩하지 않은 기사들을 수집 순서대로 반환
+    # 언론사가 기록되지 않은 이전 기사는 press가 None
+    def pending_articles(self):
+        return [{'url': url, 'title': title, 'press': press} for url, title, press in self._query(
+            'SELECT url, title, press FROM collected WHERE url NOT IN (SELECT url FROM scraped) ORDER BY seq')]
+
+    def close(self):
+        with self._lock:
+            self._connection.close()
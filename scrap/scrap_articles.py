@@ -2,9 +2,11 @@
 # 특정 언론사 웹 페이지에서 기사 목록(링크)를 스크랩함
 # 한 줄에 하나씩 (링크), (제목) 형식으로 기록함
 #
-# 사용법: [-h] [-p <press>] [-c -n <number> -q <query> -d <detail>] [-s -r <result>] [-l <list>]
+# 사용법: [-h] [-p <press,...>] [-c -n <number> -q <query> -d <detail>] [-s -r <result> -j <jobs>] [-l <list>]
 # -h --help: 도움말
-# -p --press [언론] [joongang | donga]
+# -p --press [언론] [joongang | donga | chosun], 쉼표로 여러 개 또는 all
+#     여러 언론사를 주면 동시에 진행하고 한 파일에 저장하며 맨 앞에 언론사(press) 열을 붙임
+#     수집(-n, -i)과 작업자 수(-j, --async)는 언론사마다 적용됨
 # -c --collect: 기사 목록 검색
 #     -q --query [주 검색어]
 #     -d --detail [부가 포함 검색어]
@@ -15,28 +17,90 @@
 # -s --scrap 기사 내용 스크랩
 #     -l --list-file   (기사 목록 파일명)
 #     -r --result-file (출력 파일명)
+#     -j --jobs        (스크랩 작업자 스레드 수, 기본값 1)
+#
+# -f --format (저장 형식 csv | jsonl.gz | parquet, 기본값 csv)
+#
+# --timeout (HTTP 읽기 타임아웃 초, 기본값 30)
+# --retries (HTTP 최대 재시도 횟수, 기본값 3)
+# --max-rate (호스트당 최대 초당 요청 수, 기본값 제한 없음)
+# --page-window (동시에 받아올 검색 결과 페이지 수, 기본값 4)
+# --async (asyncio 엔진 사용, 인수는 동시 요청 수)
+# --base-url (검색 요청을 보낼 주소, 로컬 대역 서버 시험용)
+# --parser (HTML 분석기 html.parser | lxml | selectolax, 기본값 html.parser)
+# --parse-procs (기사 분석 프로세스 수. 주면 작업자는 받아오기만 하고 분석은 프로세스들이 나눠서 함, 기본값 0)
+#
+# --cache (HTTP 응답 캐시 디렉토리)
+#     --cache-size (캐시 최대 크기 MB, 기본값 1024)
+#     --page-ttl   (검색 결과 페이지 캐시 유효 시간 초, 기본값 3600)
+#     --from-cache (네트워크에 접근하지 않고 캐시만 사용)
+#
+# --journal (작업 기록 파일명, 기본값 {출력 파일명}.journal)
+# --restart (작업 기록을 지우고 처음부터 다시 작업)
+# --dedup (중복 기사 색인 파일명. 여러 실행과 언론사에 걸쳐 이미 수집한 기사는 건너뜀)
+# --since-last (증분 수집 상태 파일명. 지난 실행에서 수집한 최신 기사에 도달하면 수집을 멈춤)
+#
+# --store (기사 저장소 파일명. 주면 스크랩한 기사를 결과 파일과 함께 저장소(SQLite)에도 쌓음.
+#          언론사, 날짜, 검색어로 골라서 꺼내려면 article_store.py)
+#
+# --nouns (명사 파일명. 주면 스크랩한 기사를 바로 명사 추출하여 이 파일만 저장함. 목록/결과 파일은 쓰지 않음)
+#     --tagger     (형태소 분석기, noun_extract.py의 -t, 기본값 hannanum)
+#     --noun-procs (형태소 분석 프로세스 수, 기본값 CPU 코어 수)
+#     --stopwords  (불용어 파일명. 끝나면 저빈도 단어와 함께 제거함)
+#     --matrix     (문서-단어 행렬을 저장할 디렉토리. 주면 끝날 때 term_matrix.py의 출력도 저장함)
+#
+# --queue (작업 큐 파일명. -c와 함께 주면 수집한 기사를 작업 큐에 올림)
+# --worker (작업 큐에서 기사를 빌려 스크랩. 여러 프로세스, 여러 컴퓨터에서 동시에 실행할 수 있음)
+#     -r --result-file (이 작업자의 출력 파일명, 기본값 {작업 큐 파일명}_{호스트}-{pid})
+#     --lease-size (한 번에 빌릴 기사 수, 기본값 100)
+#     --lease-time (빌린 기사의 유효 시간 초, 기본값 300. 작업자가 이 시간 동안 응답이 없으면 다른 작업자가 가져감)
+#
+# --metrics (단계별 측정값을 저장할 파일명. .prom, .txt면 Prometheus 텍스트, 나머지는 JSON.
+#            실행 중 SIGUSR1을 받으면 그때까지의 값을 저장함)
+# -v --verbose (기사마다 진행 상황을 한 줄씩 출력. 기본값은 진행 상황을 한 줄로 갱신하여 출력)
 #
 ##################################################################################################
 
 import sys  # 시스템 모듈
+import os  # 파일 도구
 import datetime  # 시각 모듈
 import getopt  # 명령행 인수 파서
 import inspect  # 텍스트 도구
-import csv  # csv 파서
 import traceback  # 오류 추적 모듈
 import queue  # 작업 공유용 큐
+import itertools  # 순번 생성
+import asyncio  # 비동기 이벤트 루프
+import contextlib  # 비동기 컨텍스트 관리
+import socket  # 호스트 이름
 import time  # 스레드 시간 처리 모듈
-from threading import Thread  # 스레드 모듈
-
-from scraper_press import JoongangScraper, DongaScraper, ChosunScraper  # 링크 스크래퍼 클래스
+from threading import Thread, Event, Condition  # 스레드 모듈
+
+import article_sink  # 저장 형식
+import collect_state  # 증분 수집 상태
+import http_session  # 공유 HTTP 세션
+import html_parser  # HTML 분석기 선택
+import metrics  # 단계별 처리 시간 측정
+import noun_extract  # 명사 추출
+import noun_filter  # 저빈도 단어와 불용어 제거
+import term_matrix  # 문서-단어 행렬
+import rate_limiter  # 호스트별 요청 속도 조절
+import response_cache  # HTTP 응답 디스크 캐시
+from run_journal import RunJournal  # 작업 기록
+from work_queue import WorkQueue  # 스크랩 작업 큐
+from article_store import ArticleStore, StoreSink  # 기사 저장소
+from dedup_index import DedupIndex  # 중복 기사 색인
+from parse_pool import ParsePool  # 기사 분석용 프로세스 풀
+from scraper_press import SCRAPERS  # 언론사별 스크래퍼 클래스
 
 
 # 커맨드라인 도움말 출력 및 종료
 def print_help(exit_code):
     print(inspect.cleandoc(
-        '''사용법: [-h] [-p <press>] [-c -q <query> -d <detail> -n <number> -i <ignore>] [-s -r <result>] [-l <list>]
+        '''사용법: [-h] [-p <press,...>] [-c -q <query> -d <detail> -n <number> -i <ignore>] [-s -r <result> -j <jobs>] [-l <list>]
             -h --help: 도움말
-            -p --press [언론] [joongang | donga]
+            -p --press [언론] [joongang | donga | chosun], 쉼표로 여러 개 또는 all
+                여러 언론사를 주면 동시에 진행하고 한 파일에 저장하며 맨 앞에 언론사(press) 열을 붙임
+                수집(-n, -i)과 작업자 수(-j, --async)는 언론사마다 적용됨
             -c --collect: 기사 목록 검색
                 -q --query [주 검색어]
                 -d --detail [부가 포함 검색어]
@@ -46,14 +110,55 @@ def print_help(exit_code):
 
             -s --scrap 기사 내용 스크랩
                 -l --list-file   (기사 목록 파일명)
-                -r --result-file (출력 파일명)'''))
+                -r --result-file (출력 파일명)
+                -j --jobs        (스크랩 작업자 스레드 수, 기본값 1)
+
+            -f --format (저장 형식 csv | jsonl.gz | parquet, 기본값 csv)
+
+            --timeout (HTTP 읽기 타임아웃 초, 기본값 30)
+            --retries (HTTP 최대 재시도 횟수, 기본값 3)
+            --max-rate (호스트당 최대 초당 요청 수, 기본값 제한 없음)
+            --page-window (동시에 받아올 검색 결과 페이지 수, 기본값 4)
+            --async (asyncio 엔진 사용, 인수는 동시 요청 수)
+            --base-url (검색 요청을 보낼 주소, 로컬 대역 서버 시험용)
+            --parser (HTML 분석기 html.parser | lxml | selectolax, 기본값 html.parser)
+            --parse-procs (기사 분석 프로세스 수. 주면 작업자는 받아오기만 하고 분석은 프로세스들이 나눠서 함, 기본값 0)
+
+            --cache (HTTP 응답 캐시 디렉토리)
+                --cache-size (캐시 최대 크기 MB, 기본값 1024)
+                --page-ttl   (검색 결과 페이지 캐시 유효 시간 초, 기본값 3600)
+                --from-cache (네트워크에 접근하지 않고 캐시만 사용)
+
+            --journal (작업 기록 파일명, 기본값 {출력 파일명}.journal)
+            --restart (작업 기록을 지우고 처음부터 다시 작업)
+            --dedup (중복 기사 색인 파일명. 여러 실행과 언론사에 걸쳐 이미 수집한 기사는 건너뜀)
+            --since-last (증분 수집 상태 파일명. 지난 실행에서 수집한 최신 기사에 도달하면 수집을 멈춤)
+
+            --store (기사 저장소 파일명. 주면 스크랩한 기사를 결과 파일과 함께 저장소(SQLite)에도 쌓음.
+                     언론사, 날짜, 검색어로 골라서 꺼내려면 article_store.py)
+
+            --nouns (명사 파일명. 주면 스크랩한 기사를 바로 명사 추출하여 이 파일만 저장함. 목록/결과 파일은 쓰지 않음)
+                --tagger     (형태소 분석기, noun_extract.py의 -t, 기본값 hannanum)
+                --noun-procs (형태소 분석 프로세스 수, 기본값 CPU 코어 수)
+                --stopwords  (불용어 파일명. 끝나면 저빈도 단어와 함께 제거함)
+                --matrix     (문서-단어 행렬을 저장할 디렉토리. 주면 끝날 때 term_matrix.py의 출력도 저장함)
+
+            --queue (작업 큐 파일명. -c와 함께 주면 수집한 기사를 작업 큐에 올림)
+            --worker (작업 큐에서 기사를 빌려 스크랩. 여러 프로세스, 여러 컴퓨터에서 동시에 실행할 수 있음)
+                -r --result-file (이 작업자의 출력 파일명, 기본값 {작업 큐 파일명}_{호스트}-{pid})
+                --lease-size (한 번에 빌릴 기사 수, 기본값 100)
+                --lease-time (빌린 기사의 유효 시간 초, 기본값 300. 작업자가 이 시간 동안 응답이 없으면 다른 작업자가 가져감)
+
+            --metrics (단계별 측정값을 저장할 파일명. .prom, .txt면 Prometheus 텍스트, 나머지는 JSON.
+                       실행 중 SIGUSR1을 받으면 그때까지의 값을 저장함)
+            -v --verbose (기사마다 진행 상황을 한 줄씩 출력. 기본값은 진행 상황을 한 줄로 갱신하여 출력)'''))
     sys.exit(exit_code)
 
 
 # 메인 루틴
 def main(argv):
 
-    press = None  # 언론
+    presses = []  # 언론
 
     will_collect = False  # 기사 수집작업
     collect_count = None  # 찾을 기사 수
@@ -63,13 +168,55 @@ def main(argv):
 
     will_scrap = False  # 기사 스크랩 작업
     result_file_name = None  # 결과 파일명
+    num_jobs = 1  # 스크랩 작업자 스레드 수
 
     list_file_name = None  # 기사 리스트 파일명
+    sink_format = 'csv'  # 저장 형식
+
+    http_timeout = 30  # HTTP 읽기 타임아웃
+    http_retries = 3  # HTTP 최대 재시도 횟수
+    max_rate = None  # 호스트당 최대 초당 요청 수
+    page_window = 4  # 동시에 받아올 검색 결과 페이지 수
+    async_concurrency = None  # asyncio 엔진 동시 요청 수. None이면 스레드 엔진 사용
+    base_url = None  # 검색 요청 주소
+    parse_procs = 0  # 기사 분석 프로세스 수. 0이면 작업자가 직접 분석
+
+    cache_dir_name = None  # HTTP 응답 캐시 디렉토리
+    cache_size = 1024  # 캐시 최대 크기 MB
+    page_ttl = 3600  # 검색 결과 페이지 캐시 유효 시간
+    from_cache = False  # 캐시만 사용
+
+    journal_file_name = None  # 작업 기록 파일명
+    restart = False  # 처음부터 다시 작업
+    dedup_file_name = None  # 중복 기사 색인 파일명
+    since_last_file_name = None  # 증분 수집 상태 파일명
+
+    store_file_name = None  # 기사 저장소 파일명
+
+    nouns_file_name = None  # 명사 파일명. 있으면 스크랩 결과 대신 명사를 저장함
+    tagger_name = 'hannanum'  # 형태소 분석기
+    noun_procs = os.cpu_count() or 1  # 형태소 분석 프로세스 수
+    stopwords_file_name = None  # 불용어 파일명
+    matrix_dir_name = None  # 문서-단어 행렬 디렉토리
+
+    queue_file_name = None  # 작업 큐 파일명
+    worker = False  # 작업 큐에서 기사를 빌려 스크랩
+    lease_size = 100  # 한 번에 빌릴 기사 수
+    lease_seconds = 300  # 빌린 기사의 유효 시간
+
+    metrics_file_name = None  # 처리 시간 측정 결과 파일명
+    verbose = False  # 기사마다 진행 상황 출력
 
     try:  # 명령행 인수 파싱
-        opts, _ = getopt.getopt(argv, 'hp:cn:q:d:i:sr:l:', [
+        opts, _ = getopt.getopt(argv, 'hp:cn:q:d:i:sr:l:j:f:v', [
             'help', 'press=', 'collect', 'number=', 'query=',
-            'detail=', 'ignore=', 'scrap', 'result-file=', 'list-file='])
+            'detail=', 'ignore=', 'scrap', 'result-file=', 'list-file=', 'jobs=', 'format=',
+            'timeout=', 'retries=', 'max-rate=', 'page-window=', 'async=', 'base-url=', 'parser=',
+            'parse-procs=',
+            'cache=', 'cache-size=', 'page-ttl=', 'from-cache',
+            'journal=', 'restart', 'dedup=', 'since-last=', 'store=',
+            'nouns=', 'tagger=', 'noun-procs=', 'stopwords=', 'matrix=',
+            'queue=', 'worker', 'lease-size=', 'lease-time=', 'metrics=', 'verbose'])
 
     except getopt.GetoptError as error:  # 오류 발생 (잘못된 입력)
         print(error)
@@ -78,10 +225,9 @@ def main(argv):
     for opt, arg in opts:
         if opt in ('-h', '--help'):  # 도움말
             print_help(0)
-        elif opt in ('-p', '--press'):  # 언론
-            if arg in ('joongang', 'donga', 'chosun'):
-                press = arg
-            else:
+        elif opt in ('-p', '--press'):  # 언론. 쉼표로 여러 개 또는 all
+            presses = list(SCRAPERS) if arg == 'all' else list(dict.fromkeys(arg.split(',')))
+            if not presses or not set(presses) <= set(SCRAPERS):
                 print_help(1)
         elif opt in ('-c', '--collect'):  # 기사 목록 수집
             will_collect = True
@@ -99,6 +245,86 @@ def main(argv):
             result_file_name = arg
         elif opt in ('-l', '--list-file'):  # 리스트 파일명
             list_file_name = arg
+        elif opt in ('-j', '--jobs'):  # 스크랩 작업자 스레드 수
+            num_jobs = int(arg)
+            if num_jobs < 1:
+                print_help(1)
+        elif opt in ('-f', '--format'):  # 저장 형식
+            if arg not in article_sink.FORMATS:
+                print_help(1)
+            sink_format = arg
+        elif opt == '--timeout':  # HTTP 타임아웃
+            http_timeout = float(arg)
+        elif opt == '--retries':  # HTTP 재시도 횟수
+            http_retries = int(arg)
+        elif opt == '--max-rate':  # 호스트당 최대 초당 요청 수
+            max_rate = float(arg)
+            if max_rate <= 0:
+                print_help(1)
+        elif opt == '--page-window':  # 검색 페이지 동시 요청 수
+            page_window = int(arg)
+            if page_window < 1:
+                print_help(1)
+        elif opt == '--async':  # asyncio 엔진
+            async_concurrency = int(arg)
+            if async_concurrency < 1:
+                print_help(1)
+        elif opt == '--base-url':  # 검색 요청 주소
+            base_url = arg.rstrip('/')
+        elif opt == '--parser':  # HTML 분석기
+            if arg not in html_parser.BACKENDS:
+                print_help(1)
+            html_parser.set_backend(arg)
+        elif opt == '--parse-procs':  # 기사 분석 프로세스 수
+            parse_procs = int(arg)
+            if parse_procs < 0:
+                print_help(1)
+        elif opt == '--cache':  # 캐시 디렉토리
+            cache_dir_name = arg
+        elif opt == '--cache-size':  # 캐시 최대 크기
+            cache_size = int(arg)
+        elif opt == '--page-ttl':  # 검색 결과 캐시 유효 시간
+            page_ttl = int(arg)
+        elif opt == '--from-cache':  # 캐시만 사용
+            from_cache = True
+        elif opt == '--journal':  # 작업 기록 파일명
+            journal_file_name = arg
+        elif opt == '--restart':  # 처음부터 다시 작업
+            restart = True
+        elif opt == '--dedup':  # 중복 기사 색인
+            dedup_file_name = arg
+        elif opt == '--since-last':  # 증분 수집 상태
+            since_last_file_name = arg
+        elif opt == '--store':  # 기사 저장소 파일명
+            store_file_name = arg
+        elif opt == '--nouns':  # 명사 파일명
+            nouns_file_name = arg
+        elif opt == '--tagger':  # 형태소 분석기
+            tagger_name = arg
+        elif opt == '--noun-procs':  # 형태소 분석 프로세스 수
+            noun_procs = int(arg)
+            if noun_procs < 0:
+                print_help(1)
+        elif opt == '--stopwords':  # 불용어 파일명
+            stopwords_file_name = arg
+        elif opt == '--matrix':  # 문서-단어 행렬 디렉토리
+            matrix_dir_name = arg
+        elif opt == '--queue':  # 작업 큐 파일명
+            queue_file_name = arg
+        elif opt == '--worker':  # 작업 큐에서 빌려 스크랩
+            worker = True
+        elif opt == '--lease-size':  # 한 번에 빌릴 기사 수
+            lease_size = int(arg)
+            if lease_size < 1:
+                print_help(1)
+        elif opt == '--lease-time':  # 빌린 기사의 유효 시간
+            lease_seconds = float(arg)
+            if lease_seconds <= 0:
+                print_help(1)
+        elif opt == '--metrics':  # 처리 시간 측정 결과 파일명
+            metrics_file_name = arg
+        elif opt in ('-v', '--verbose'):  # 기사마다 진행 상황 출력
+            verbose = True
         else:
             print_help(1)
 
@@ -111,229 +337,940 @@ def main(argv):
         if (will_collect is False) and (list_file_name is None):  # 수집 작업 없이 리스트 파일 입력 안함
             print_help(1)
 
-    if (will_collect is False) and (will_scrap is False):  # 작업 선택 안함
+    if worker:  # 작업자는 작업 큐의 기사만 스크랩함 (스레드 엔진)
+        if queue_file_name is None or will_collect or will_scrap or nouns_file_name is not None \
+                or async_concurrency is not None:
+            print_help(1)
+    elif (will_collect is False) and (will_scrap is False):  # 작업 선택 안함
+        print_help(1)
+
+    if queue_file_name is not None and will_scrap:  # 작업 큐에 올리면서 직접 스크랩
+        print_help(1)
+
+    if not presses:  # 언론 선택 안함
+        print_help(1)
+
+    if from_cache and cache_dir_name is None:  # 캐시 디렉토리 없이 캐시만 사용
+        print_help(1)
+
+    if nouns_file_name is not None and will_scrap is False:  # 스크랩 없이 명사 추출
+        print_help(1)
+
+    if store_file_name is not None and will_scrap is False and not worker:  # 스크랩 없이 저장소에 저장
         print_help(1)
 
     if list_file_name is None:  # 리스트 파일 이름 기본값
-        list_file_name = f'articles_list_{press}_' + \
+        list_file_name = f'articles_list_{"-".join(presses)}_' + \
             (f"{query_word}_" if query_word is not None else "") + \
             (f"_{detail_word}_" if detail_word != '' else "") + \
-            f'{datetime.datetime.now().strftime("%Y-%m-%d")}.csv'
+            f'{datetime.datetime.now().strftime("%Y-%m-%d")}{article_sink.EXTENSIONS[sink_format]}'
+
+    worker_name = f'{socket.gethostname()}-{os.getpid()}'  # 작업 큐에서 이 작업자의 이름
+    if worker and result_file_name is None:  # 작업자마다 따로 저장 (샤드)
+        result_file_name = f'{os.path.splitext(queue_file_name)[0]}_{worker_name}{article_sink.EXTENSIONS[sink_format]}'
 
     if result_file_name is None:  # 기본 출력 파일명 지정
-        result_file_name = f'articles_scrap_{press}_' + \
+        result_file_name = f'articles_scrap_{"-".join(presses)}_' + \
             (f"{query_word}_" if query_word is not None else "") + \
             (f"_{detail_word}_" if detail_word != '' else "") + \
-            f'{datetime.datetime.now().strftime("%Y-%m-%d")}.csv'
+            f'{datetime.datetime.now().strftime("%Y-%m-%d")}{article_sink.EXTENSIONS[sink_format]}'
 
     # 작업 진행
 
-    # 스크래퍼 선택
+    # 공유 HTTP 세션 설정. 작업자 스레드 수만큼 호스트당 연결을 유지함
+    http_session.configure(timeout=(5, http_timeout), retries=http_retries,
+                           pool_size=max(num_jobs + page_window, 16))
 
-    if press == 'joongang':
-        scraper = JoongangScraper()
-    elif press == 'donga':
-        scraper = DongaScraper()
-    elif press == 'chosun':
-        scraper = ChosunScraper()
-    else:
-        print_help(1)
+    # 호스트별 요청 조절. 동시 요청 수는 작업자 수까지 서버 응답을 보며 늘리고 줄임
+    # 대역 서버는 모든 언론사가 같은 호스트이므로 언론사 수만큼 늘림
+    max_concurrency = async_concurrency if async_concurrency is not None else num_jobs + page_window
+    if base_url is not None:
+        max_concurrency *= len(presses)
+    rate_limiter.configure(max_concurrency=max_concurrency, max_rate=max_rate)
+
+    # HTTP 응답 캐시 설정
+    if cache_dir_name is not None:
+        response_cache.configure(cache_dir_name, max_bytes=cache_size * 1024 * 1024,
+                                 page_ttl=page_ttl, offline=from_cache)
+
+    # 스크래퍼 선택. 언론사 -> 스크래퍼 (선택한 순서)
+    scrapers = {press: SCRAPERS[press](page_window, base_url) for press in presses}
 
-    # 문제: 스레드 및 큐 join 중 SIGINT 무시됨.
-    if will_collect is True and will_scrap is True:
+    # 작업 큐. 수집하면 기사를 올리고, 작업자는 빌려서 스크랩함
+    work_queue = WorkQueue(queue_file_name) if queue_file_name is not None else None
+
+    if worker:  # 작업 큐에서 빌려 스크랩. 작업 기록 대신 작업 큐에 끝난 기사를 남김
+        if sink_format == 'parquet' and os.path.exists(result_file_name):  # parquet 파일은 이어 쓸 수 없음
+            print(f'Parquet Output cannot be Resumed, Use Another Result File than {result_file_name}')
+            work_queue.close()
+            sys.exit(1)
+        if metrics_file_name is not None:
+            metrics.dump_on_signal(metrics_file_name)
+        progress = metrics.Progress().start() if not verbose else None
         try:
-            with open(list_file_name, 'w', encoding='utf8') as list_file, \
-                    open(result_file_name, 'w', encoding='utf8') as result_file:
+            run_worker(scrapers, work_queue, worker_name, sink_format, result_file_name, num_jobs,
+                       lease_size, lease_seconds, verbose, parse_procs, store_file_name)
+        finally:
+            if progress is not None:
+                progress.stop()
+            work_queue.close()
+        if metrics_file_name is not None:
+            metrics.dump(metrics_file_name)
+        return
+
+    # 작업 기록. 같은 출력 파일로 다시 실행하면 끝난 작업을 건너뛰고 이어서 진행함
+    if journal_file_name is None:
+        if nouns_file_name is not None:
+            journal_file_name = nouns_file_name + '.journal'
+        else:
+            journal_file_name = (result_file_name if will_scrap else list_file_name) + '.journal'
 
-                list_file.write('"url", "title"\n')
-                result_file.write('"date", "title", "body"\n')
+    if restart:  # 이전 기록을 지우고 처음부터
+        for suffix in ('', '-wal', '-shm'):
+            if os.path.exists(journal_file_name + suffix):
+                os.remove(journal_file_name + suffix)
 
-                # 작업 큐 및 스레드 생성
-                article_queue = queue.Queue(5000)  # 작업 큐. 최대 대기열 수 지정
+    journal = RunJournal(journal_file_name)
 
-                # 생산자 스레드
-                collect_thread = Thread(target=collect, args=(
-                    scraper, collect_count, ignore_count, query_word, detail_word, list_file,
-                    article_queue.put
-                ), daemon=True)
+    resume_collect = journal.collected_count() > 0  # 이어서 수집
+    resume_scrap = journal.scraped_count() > 0  # 이어서 스크랩
 
-                # 소비자 스레드
-                scrap_thread = Thread(target=scrap, args=(
-                    scraper, result_file, article_queue
-                ))
+    if resume_collect or resume_scrap:
+        print(f'Resuming from {journal_file_name}: {journal.collected_count()} Articles Collected, '
+              f'{journal.scraped_count()} Articles Scraped Before')
 
-                # 스레드 시작
-                collect_thread.start()
-                scrap_thread.start()
+        if sink_format == 'parquet' and nouns_file_name is None:  # parquet 파일은 이어 쓸 수 없음
+            print('Parquet Output cannot be Resumed, Use --restart')
+            journal.close()
+            sys.exit(1)
 
-                # 작업 완료까지 대기
-                # 스레드 및 큐의 join 메서드는 SIGINT를 무시하는 버그 있음
-                # 따라서 작업 종료를 직접 확인하고 join에 타임아웃 부여
-                # 스레드를 데몬으로 하고 작업 종료 전까지만 메인 프로세스를 살려놓음
-                while article_queue.empty():
-                    collect_thread.join(1)
+    # 중복 기사 색인. 수집할 때 이미 본 기사는 작업 큐에 넣지 않음
+    dedup = DedupIndex(dedup_file_name) if dedup_file_name is not None else None
+
+    # 증분 수집 상태. 목록 파일을 다 쓴 뒤에만 저장함
+    since_last = collect_state.CollectState(since_last_file_name) if since_last_file_name is not None else None
+
+    # 저장 객체 생성. 파일에 내보낸 기사만 작업 기록과 중복 기사 색인에 남김
+    # 여러 언론사를 한 파일에 저장할 때는 맨 앞에 언론사 열을 붙임
+    press_columns = (article_sink.PRESS_COLUMN,) if len(presses) > 1 else ()
+
+    def on_list_flush(articles):  # [(링크, 제목, 언론사), ...]
+        journal.add_collected_many(articles)
+        if dedup is not None:
+            dedup.add_many(articles)
+        if work_queue is not None:
+            work_queue.publish_many(articles)
+
+    # --nouns면 목록 파일과 결과 파일을 쓰지 않고, 스크랩한 기사를 바로 명사 추출하여 명사 파일에 저장함
+    # 수집한 기사 목록은 작업 기록에 남으므로 이어서 작업할 수 있음
+    def open_list_sink():
+        if nouns_file_name is not None and will_scrap:
+            return article_sink.NullSink(press_columns + article_sink.LIST_COLUMNS, on_list_flush)
+        return article_sink.open_sink(sink_format, list_file_name, press_columns + article_sink.LIST_COLUMNS,
+                                      resume_collect, on_list_flush)
+
+    # --store면 결과 파일(명사 파일)과 함께 기사 저장소에도 저장함
+    def open_result_sink():
+        if nouns_file_name is not None:
+            sink = noun_extract.NounSink(nouns_file_name, press_columns + article_sink.RESULT_COLUMNS, tagger_name,
+                                         nouns_file_name + '.cache', noun_procs, resume=resume_scrap,
+                                         on_flush=journal.add_scraped_many)
+        else:
+            sink = article_sink.open_sink(sink_format, result_file_name, press_columns + article_sink.RESULT_COLUMNS,
+                                          resume_scrap, journal.add_scraped_many)
+        return StoreSink(sink, ArticleStore(store_file_name)) if store_file_name is not None else sink
 
-                while True:
-                    collect_thread.join(0.5)
-                    time.sleep(0.5)
-                    if article_queue.empty():
-                        # 소비자 스레드 종료
-                        article_queue.put(None)
-                        break
+    # 측정값 저장 신호와 진행 상황 출력
+    if metrics_file_name is not None:
+        metrics.dump_on_signal(metrics_file_name)
+    progress = metrics.Progress().start() if not verbose else None
 
-                # 소비자 스레드 완료까지 대기
-                while not article_queue.empty():
-                    scrap_thread.join(1)
+    collect_params = (collect_count, ignore_count, query_word, detail_word)
 
-                print("Process Completed")
+    try:
+        # 문제: 스레드 및 큐 join 중 SIGINT 무시됨.
+        if will_collect is True and will_scrap is True:
+            try:
+                with open_list_sink() as list_sink, open_result_sink() as result_sink:
 
-        except KeyboardInterrupt:
-            print('Process Aborted by KeyboardInterrupt')
-            while not article_queue.empty():
-                article_queue.get_nowait()
-            article_queue.put(None)
-        except:
-            print("Process Failed")
-            traceback.print_exc(file=sys.stdout)
-            sys.exit(1)
+                    if async_concurrency is not None:  # asyncio 엔진
+                        asyncio.run(run_async(
+                            scrapers, async_concurrency, list_sink, result_sink, collect_params,
+                            http_timeout, http_retries, journal, dedup=dedup, verbose=verbose,
+                            parse_procs=parse_procs, since_last=since_last))
 
-    elif will_collect is True:  # 기사 수집만 진행
-        try:
-            with open(list_file_name, 'w', encoding='utf8') as list_file:
-                list_file.write('"url", "title"\n')
+                    else:
+                        # 생산자: 이전에 수집만 하고 스크랩하지 못한 기사를 넣고,
+                        # 이어서 기사 목록을 수집하면서 작업 큐에 추가
+                        def produce(enqueue):
+                            for article in journal.pending_articles():
+                                enqueue(article)
 
-                collect(scraper, collect_count, ignore_count,
-                        query_word, detail_word, list_file)
+                            # 수집 기록을 내보내기 전에 멈춘 경우 스크랩까지 마친 기사가 다시 수집될 수 있음
+                            def enqueue_unscraped(article):
+                                if not journal.is_scraped(article['url']):
+                                    enqueue(article)
 
-        except KeyboardInterrupt:
-            print('Collection Aborted by KeyboardInterrupt')
+                            collect_all(scrapers, collect_params, list_sink, enqueue_unscraped,
+                                        journal, dedup, verbose, since_last)
 
-        except:
-            print('Collection Failed')
-            traceback.print_exc(file=sys.stdout)
-            sys.exit(1)
+                        run_scrap_workers(scrapers, produce, result_sink, num_jobs, verbose, parse_procs)
 
-    elif will_scrap is True:  # 기사 스크랩만 진행
-        try:
-            with open(list_file_name, 'r', encoding='utf8') as list_file, \
-                    open(result_file_name, 'w', encoding='utf8') as result_file:
+                if since_last is not None:
+                    since_last.save()
+
+                if nouns_file_name is not None:
+                    finish_nouns(nouns_file_name, stopwords_file_name, matrix_dir_name)
 
-                list_reader = csv.DictReader(list_file)
+                print("Process Completed")
 
-                result_file.write('"date", "title", "body"\n')
+            except KeyboardInterrupt:
+                print('Process Aborted by KeyboardInterrupt')
+            except:
+                print("Process Failed")
+                traceback.print_exc(file=sys.stdout)
+                sys.exit(1)
+
+        elif will_collect is True:  # 기사 수집만 진행
+            try:
+                if work_queue is not None:  # 수집하는 동안 작업자가 끝내지 않도록
+                    work_queue.reopen_publishing()
+
+                with open_list_sink() as list_sink:
+
+                    if async_concurrency is not None:  # asyncio 엔진
+                        asyncio.run(run_async(
+                            scrapers, async_concurrency, list_sink, None, collect_params,
+                            http_timeout, http_retries, journal, dedup=dedup, verbose=verbose,
+                            since_last=since_last))
+                    else:
+                        collect_all(scrapers, collect_params, list_sink, journal=journal, dedup=dedup,
+                                    verbose=verbose, since_last=since_last)
+
+                if since_last is not None:
+                    since_last.save()
+
+                if work_queue is not None:  # 남은 기사를 마치면 작업자가 끝남
+                    work_queue.finish_publishing()
+                    print(f'Published to {queue_file_name}: {work_queue.counts()}')
+
+            except KeyboardInterrupt:
+                print('Collection Aborted by KeyboardInterrupt')
+
+            except:
+                print('Collection Failed')
+                traceback.print_exc(file=sys.stdout)
+                sys.exit(1)
+
+        elif will_scrap is True:  # 기사 스크랩만 진행
+            try:
+                # 기사 목록 형식은 확장자로 판단
+                articles = read_article_list(list_file_name, presses)
+
+                with open_result_sink() as result_sink:
+
+                    if async_concurrency is not None:  # asyncio 엔진
+                        asyncio.run(run_async(
+                            scrapers, async_concurrency, None, result_sink,
+                            http_timeout=http_timeout, http_retries=http_retries, journal=journal,
+                            articles=articles, verbose=verbose, parse_procs=parse_procs))
+
+                    else:
+                        # 생산자: 리스트 파일을 읽어 스크랩하지 않은 기사만 작업 큐에 추가
+                        def produce(enqueue):
+                            num_skipped = 0
+                            for article in articles:
+                                if journal.is_scraped(article['url']):
+                                    num_skipped += 1
+                                    continue
+                                enqueue(article)
+                            if num_skipped > 0:
+                                print(f'Skipped {num_skipped} Articles Already Scraped')
+
+                        run_scrap_workers(scrapers, produce, result_sink, num_jobs, verbose, parse_procs)
+
+                if nouns_file_name is not None:
+                    finish_nouns(nouns_file_name, stopwords_file_name, matrix_dir_name)
+
+            except KeyboardInterrupt:
+                print('Scraping Aborted by KeyboardInterrupt')
+            except:
+                print('Scraping Failed')
+                traceback.print_exc(file=sys.stdout)
+                sys.exit(1)
+
+    finally:
+        if progress is not None:
+            progress.stop()
+
+    journal.close()
+    if dedup is not None:
+        dedup.report()
+        dedup.close()
+    if since_last is not None:
+        since_last.close()
+    if work_queue is not None:
+        work_queue.close()
+
+    if metrics_file_name is not None:
+        metrics.dump(metrics_file_name)
+
+
+# 명사 파일의 저빈도 단어와 불용어를 제거 (--nouns)
+# 저빈도 단어는 모든 기사의 빈도수를 알아야 하므로 스크랩이 끝난 뒤 명사 파일을 다시 읽어 제거함
+# matrix_dir_name이 있으면 같은 패스에서 문서-단어 행렬을 만들어 저장함
+def finish_nouns(nouns_file_name, stopwords_file_name=None, matrix_dir_name=None):
+    print('Removing Infrequent Words and Stopwords... ', end='', flush=True)
+    stopwords = noun_filter.read_stopwords(stopwords_file_name) if stopwords_file_name is not None else ()
+    builder = term_matrix.TermMatrixBuilder() if matrix_dir_name is not None else None
+
+    num_articles, num_words, num_removed = noun_filter.filter_nouns(
+        nouns_file_name, nouns_file_name, stopwords, on_body=builder.add if builder is not None else None)
+    print(f'[DONE] {num_articles} Articles, Removed {num_removed} of {num_words} Words')
+
+    if builder is not None:
+        term_matrix.write_all(builder.matrix().sorted_by_frequency(), matrix_dir_name)
+        print(f'Document Term Matrix Saved to {matrix_dir_name}')
+
+
+# 기사 목록 파일 읽기. {'url': (링크), 'title': (제목), 'press': (언론사)} 딕셔너리를 반환하는 제너레이터
+# 언론사 열이 있으면 presses의 기사만 반환하고, 없으면 모두 presses[0]의 기사로 봄
+# 언론사 열이 없는데 여러 언론사를 선택하면 읽기 전에 ValueError
+def read_article_list(file_name, presses):
+    rows = article_sink.read_articles(file_name)
+    first_row = next(rows, None)
+    if first_row is None:
+        return iter(())
+
+    has_press = article_sink.PRESS_COLUMN in first_row
+    if not has_press and len(presses) > 1:
+        raise ValueError(f'{file_name} has no {article_sink.PRESS_COLUMN} Column, Select One Press')
+
+    def articles():
+        for row in itertools.chain((first_row,), rows):
+            press = row[article_sink.PRESS_COLUMN] if has_press else presses[0]
+            if press in presses:
+                yield {'url': row['url'], 'title': row['title'], 'press': press}
+
+    return articles()
+
+
+# 기사의 언론사. 언론사가 기록되지 않은 이전 작업 기록의 기사는 첫 언론사의 기사로 봄
+def press_of(article, scrapers):
+    return article.get('press') or next(iter(scrapers))
+
+
+# 스레드가 끝날 때까지 대기
+# 스레드 및 큐의 join 메서드는 SIGINT를 무시하는 버그 있음
+# 따라서 join에 타임아웃을 주고 반복해서 확인함
+def wait_thread(thread):
+    while thread.is_alive():
+        thread.join(0.5)
+
+
+# 생산자 스레드 1개, 언론사마다 스크랩 작업자 스레드 num_jobs개, 기록 스레드 1개로 스크랩 진행
+# produce(enqueue): 기사 딕셔너리를 enqueue로 넘겨주는 함수
+# 작업 큐는 언론사마다 따로 두어 한 언론사가 느려도 다른 언론사의 작업자는 계속 진행함
+# parse_procs가 있으면 작업자는 받아오기만 하고 분석은 그만큼의 프로세스가 나눠서 함
+# on_failed(url)가 있으면 스크랩에 실패한 기사마다 기록 스레드에서 호출함
+def run_scrap_workers(scrapers, produce, result_sink, num_jobs, verbose=False, parse_procs=0, on_failed=None):
+
+    article_queues = {press: queue.Queue(5000) for press in scrapers}  # 언론사별 작업 큐. 최대 대기열 수 지정
+    result_queue = queue.Queue(5000)  # 결과 큐. 기록 스레드만 파일에 씀. 기록이 밀리면 작업자도 기다림
+    writer = ResultWriter(result_sink, verbose, on_failed)
+
+    # 큐 길이. 작업 큐가 비어 있으면 수집이, 결과가 쌓이면 기록이나 앞 순번 기사가 병목임
+    metrics.set_gauge('article_queue', lambda: sum(article_queue.qsize() for article_queue in article_queues.values()))
+    metrics.set_gauge('result_queue', result_queue.qsize)
+    metrics.set_gauge('pending_results', lambda: len(writer.pending))
+
+    # 언론사별 기사 순번. 기록 스레드가 언론사마다 목록 순서대로 쓰기 위해 사용
+    sequences = {press: itertools.count() for press in scrapers}
 
-                # 작업 큐 생성 및 스레드 생성
-                article_queue = queue.Queue(5000)  # 작업 큐. 최대 대기열 1000개로 지정
+    def enqueue(article):
+        press = press_of(article, scrapers)
+        article_queues[press].put((next(sequences[press]), article))
+
+    # 생산자 스레드 동작. 끝나면 작업자 수만큼 종료 신호를 넣음
+    def run_producer():
+        try:
+            produce(enqueue)
+        finally:
+            for article_queue in article_queues.values():
+                for _ in range(num_jobs):
+                    article_queue.put(None)
+
+    # 분석 프로세스가 끝낸 기사는 결과 큐로 넘김
+    def on_parsed(item, content, error):
+        press, seq, url, start = item
+        if error is not None:
+            report_failure(press, seq, url, error)
+        else:
+            metrics.observe('article', time.perf_counter() - start, press)
+        result_queue.put((press, seq, url, content))
 
-                # 생산자 스레드 동작 (파일 읽기)
-                def enqueue_list_reader():
-                    for article in list_reader:
-                        article_queue.put(article)
+    parse_pool = ParsePool(parse_procs, on_parsed) if parse_procs > 0 else None
 
-                # 생산자 스레드
-                read_thread = Thread(target=enqueue_list_reader, daemon=True)
+    # 스레드를 데몬으로 하고 작업 종료 전까지만 메인 프로세스를 살려놓음
+    producer_thread = Thread(target=run_producer, daemon=True)
+    worker_threads = [Thread(target=scrap, args=(scraper, article_queues[press], result_queue, parse_pool),
+                             daemon=True)
+                      for press, scraper in scrapers.items() for _ in range(num_jobs)]
+    write_thread = Thread(target=write_results, args=(writer, result_queue), daemon=True)
 
-                # 소비자 스레드
-                scrap_thread = Thread(target=scrap, args=(
-                    scraper, result_file, article_queue), daemon=True)
+    # 스레드 시작
+    producer_thread.start()
+    for worker_thread in worker_threads:
+        worker_thread.start()
+    write_thread.start()
 
-                # 스레드 시작
-                read_thread.start()
-                scrap_thread.start()
+    # 작업 완료까지 대기. 작업자와 분석 프로세스가 모두 끝나면 기록 스레드에 종료 신호를 보냄
+    try:
+        wait_thread(producer_thread)
+        for worker_thread in worker_threads:
+            wait_thread(worker_thread)
+        if parse_pool is not None:
+            parse_pool.close()
+    except BaseException:
+        if parse_pool is not None:
+            parse_pool.terminate()
+        raise
+
+    result_queue.put(None)
+    wait_thread(write_thread)
+
+    for name in ('article_queue', 'result_queue', 'pending_results'):
+        metrics.set_gauge(name, None)
+
+
+# 작업 큐에서 기사를 빌려 스크랩하여 이 작업자의 파일(샤드)에 저장 (--worker)
+# 끝나지 않은 빌린 기사가 lease_size의 두 배를 넘으면 더 빌리지 않아 한 작업자가 기사를 쌓아두지 않음
+# 저장 객체는 행을 쓸 때만 내보내므로, 기다리는 동안 끝나지 않으면 직접 내보내 완료로 표시함
+# 이어 쓰므로 같은 파일로 다시 실행해도 이미 완료로 표시된 기사가 지워지지 않음 (parquet은 새 파일만)
+# 살아있는 동안 유효 시간 갱신 스레드가 빌린 기사의 유효 시간을 늘리고, 끝나면 남은 기사를 돌려줌
+# 파일에 내보낸 기사는 작업 큐에 완료로, 실패한 기사는 다시 기다리도록(MAX_ATTEMPTS번까지) 표시함
+def run_worker(scrapers, work_queue, worker_name, sink_format, result_file_name, num_jobs,
+               lease_size, lease_seconds, verbose=False, parse_procs=0, store_file_name=None):
+    presses = list(scrapers)
+    press_columns = (article_sink.PRESS_COLUMN,) if len(presses) > 1 else ()
+    max_in_flight = lease_size * 2  # 끝나지 않은 빌린 기사 수 한도
+    in_flight = [0]  # 끝나지 않은 빌린 기사 수
+    finished = Condition()  # 빌린 기사가 끝날 때 알림
+
+    def on_done(count):
+        with finished:
+            in_flight[0] -= count
+            finished.notify_all()
+
+    def on_flush(urls):  # 파일에 내보낸 기사
+        work_queue.complete_many(urls)
+        on_done(len(urls))
+
+    def on_failed(url):
+        work_queue.fail(url)
+        on_done(1)
+
+    print(f'Worker {worker_name}: Leasing from {work_queue.path}, Saving to {result_file_name}')
+
+    stop_renew = Event()
+
+    def run_renew():  # 유효 시간의 1/3마다 갱신
+        while not stop_renew.wait(lease_seconds / 3):
+            try:
+                work_queue.renew(worker_name, lease_seconds)
+            except Exception:
+                traceback.print_exc(limit=3, file=sys.stdout)
+
+    renew_thread = Thread(target=run_renew, daemon=True)
+    renew_thread.start()
 
-                # 작업 완료까지 대기
-                # 스레드 및 큐의 join 메서드는 SIGINT를 무시하는 버그 있음
-                # 따라서 작업 종료를 직접 확인하고 join에 타임아웃 부여
-                # 스레드를 데몬으로 하고 작업 종료 전까지만 메인 프로세스를 살려놓음
+    try:
+        result_sink = article_sink.open_sink(sink_format, result_file_name,
+                                             press_columns + article_sink.RESULT_COLUMNS, resume=True,
+                                             on_flush=on_flush)
+        if store_file_name is not None:  # 여러 작업자가 같은 저장소에 쌓아도 됨 (쓰기는 차례로)
+            result_sink = StoreSink(result_sink, ArticleStore(store_file_name))
+
+        with result_sink:
+
+            # 생산자: 빌릴 기사가 없으면 기다렸다가 다시 확인하고, 수집이 끝났고 남은 기사가 없으면 끝냄
+            def produce(enqueue):
                 while True:
-                    read_thread.join(1)
-                    time.sleep(0)
-                    if article_queue.empty():
-                        # 소비자 스레드 종료
-                        article_queue.put(None)
+                    # 기록 스레드가 저장 객체를 잡은 채 on_done을 기다릴 수 있으므로 내보내기는 finished 밖에서
+                    while True:
+                        with finished:
+                            if finished.wait_for(lambda: in_flight[0] < max_in_flight, 0.5):
+                                break
+                        result_sink.flush()
+
+                    articles = work_queue.lease(worker_name, lease_size, lease_seconds, presses)
+                    if articles:
+                        with finished:
+                            in_flight[0] += len(articles)
+                        for article in articles:
+                            enqueue(article)
+                        continue
+
+                    result_sink.flush()  # 마지막 기사들도 완료로 표시되도록
+                    if in_flight[0] == 0 and work_queue.is_drained(presses):
                         break
+                    time.sleep(1.0)
 
-                # 소비자 스레드 완료까지 대기
-                while not article_queue.empty():
-                    scrap_thread.join(1)
+            run_scrap_workers(scrapers, produce, result_sink, num_jobs, verbose, parse_procs, on_failed)
 
-        except KeyboardInterrupt:
-            print('Scraping Aborted by KeyboardInterrupt')
-            while not article_queue.empty():
-                article_queue.get_nowait()
-            article_queue.put(None)
-        except:
-            print('Scraping Failed')
-            traceback.print_exc(file=sys.stdout)
-            sys.exit(1)
+        print(f'Worker {worker_name} Completed: {work_queue.counts()}')
+
+    except KeyboardInterrupt:
+        print('Worker Aborted by KeyboardInterrupt')
+    except:
+        print('Worker Failed')
+        traceback.print_exc(file=sys.stdout)
+        sys.exit(1)
+
+    finally:  # 파일에 내보내지 못한 기사는 다른 작업자가 가져가도록 돌려줌
+        stop_renew.set()
+        work_queue.release(worker_name)
+
+
+# 같은 위치에서 연속으로 이만큼 실패하면 그 기사는 건너뜀
+MAX_COLLECT_FAILURES = 3
+
+
+# 언론사마다 스레드 하나씩 동시에 수집
+# collect_params: (collect_count, ignore_count, query_word, detail_word), 기사 수는 언론사마다 적용됨
+def collect_all(scrapers, collect_params, list_sink, method_save=None, journal=None, dedup=None, verbose=False,
+                since_last=None):
+    if len(scrapers) == 1:
+        collect(next(iter(scrapers.values())), *collect_params, list_sink, method_save, journal, dedup, verbose,
+                since_last)
+        return
+
+    threads = [Thread(target=collect, args=(scraper, *collect_params, list_sink, method_save, journal, dedup,
+                                             verbose, since_last), daemon=True)
+               for scraper in scrapers.values()]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        wait_thread(thread)
+
+
+# 지난 실행에서 본 최신 기사 주소들을 집합으로 반환 (증분 수집)
+def last_head(since_last, press, query_word, detail_word):
+    head_urls, updated = since_last.head(press, query_word, detail_word)
+    if updated is None:
+        print(f'No Previous Run for {press}, Collecting Up to the Number of Articles')
+    else:
+        print(f'Collecting Articles Since {datetime.datetime.fromtimestamp(updated):%Y-%m-%d %H:%M} from {press}')
+    return set(head_urls)
+
+
+# 언론사 하나의 수집 상태. 동기(collect)와 비동기(collect_async) 수집이 함께 씀
+# journal이 있으면 이미 수집한 기사는 건너뛰고 이어서 수집함
+# dedup이 있으면 이전 실행이나 다른 언론사에서 이미 수집한 기사도 건너뜀
+# since_last가 있으면 지난 실행에서 본 최신 기사에 도달할 때 멈추고, 이번에 본 최신 기사들을 기록함
+# 이때는 이어서 수집하더라도 처음부터 다시 넘기며, 이미 수집한 기사는 작업 기록을 보고 건너뜀
+# verbose면 기사마다 한 줄씩 출력함
+class PressCollection:
+
+    def __init__(self, press, collect_params, list_sink, journal=None, dedup=None, verbose=False,
+                 since_last=None):
+        self.press = press
+        self.collect_count, self.ignore_count, self.query_word, self.detail_word = collect_params
+        self.list_sink = list_sink
+        self.journal = journal
+        self.dedup = dedup
+        self.verbose = verbose
+        self.since_last = since_last
+        print(f'Collecting Articles: {press}')
+
+        self.collected = journal.collected_count(press) if journal is not None else 0  # 수집한 기사 수 (이전 실행 포함)
+        self.position = self.ignore_count + (self.collected if since_last is None else 0)  # 다음에 가져올 검색 결과 위치
+        self.failures = 0  # 같은 위치에서 연속으로 실패한 횟수
+        self.collected_urls = set()  # 이번 실행에서 수집한 기사 (아직 작업 기록에 없을 수 있음)
+
+        self.known_urls = last_head(since_last, press, self.query_word, self.detail_word) \
+            if since_last is not None else set()
+        self.head_urls = []  # 이번 실행에서 본 최신 기사 주소 (최신순)
+        self.reached_known = False  # 지난 실행에서 본 기사에 도달함
+
+        if self.collected > 0:
+            print(f'Resuming Collection: {self.collected} Articles Already Collected from {press}')
+        print(f'Ignoring {self.position} Articles from {press}')
+
+    # 더 수집해야 함
+    def wants_more(self):
+        return self.collected < self.collect_count and not self.reached_known
+
+    # 더 수집할 기사 수
+    def remaining(self):
+        return self.collect_count - self.collected
+
+    # 검색 결과에서 받은 기사 하나 처리. 새 기사면 목록에 저장하고 True 반환
+    # 지난 실행에서 본 기사에 도달하면 reached_known이 되며, 호출한 쪽은 더 넘기지 않아야 함
+    def add(self, article):
+        press = self.press
+        self.position += 1
+        self.failures = 0
+
+        # 지난 실행에서 본 기사부터는 모두 수집한 기사이므로 더 넘기지 않음
+        if article['url'] in self.known_urls:
+            print(f'Reached Articles Collected Last Run at [{self.position}] {press}')
+            self.reached_known = True
+            return False
+        if len(self.head_urls) < collect_state.HEAD_SIZE:
+            self.head_urls.append(article['url'])
+
+        # 새 기사가 올라와 이미 수집한 기사가 뒤로 밀린 경우
+        if article['url'] in self.collected_urls or (
+                self.journal is not None and self.journal.is_collected(article['url'])):
+            if self.verbose:
+                print(f'Already Collected {article["url"]}')
+            return False
+
+        # 다른 검색어나 언론사로 이미 수집한 기사
+        if self.dedup is not None:
+            reason = self.dedup.check(article)
+            if reason is not None:
+                metrics.count('duplicate', press=press)
+                if self.verbose:
+                    print(f'Duplicate ({reason}) {article["url"]}')
+                return False
+
+        # 저장
+        article['press'] = press
+        self.list_sink.write(article, key=(article['url'], article['title'], press))
+        self.collected_urls.add(article['url'])
+        self.collected += 1
+        metrics.count('collected', press=press)
+
+        # 작업 상황 출력
+        if self.verbose:
+            print(f'Collected [{self.ignore_count + self.collected}] {article["url"]}')
+        return True
+
+    # 수집 실패. 같은 위치에서 MAX_COLLECT_FAILURES번 연속으로 실패하면 그 기사는 건너뜀
+    # 호출한 쪽은 position부터 다시 수집함
+    def fail(self):
+        self.failures += 1
+        print(f'Collecting Failed at [{self.position + 1}] {self.press}')
+        traceback.print_exc(limit=3, file=sys.stdout)
 
+        if self.failures >= MAX_COLLECT_FAILURES:
+            print(f'Skip Article [{self.position + 1}] and Resume...')
+            self.position += 1
+            self.failures = 0
+        else:
+            print('Ignore it and Resume...')
 
-# 수집 수행
+    # 수집 끝
+    def finish(self):
+        if self.wants_more():
+            print(f'Not Enough Articles to Collect from {self.press}')
+        print(f'Collecting Completed: {self.press}')
+
+        # 처음부터 넘긴 경우에만 이번에 본 기사들이 최신 기사임
+        # 이전 실행에서 이미 목표 수만큼 수집해서 넘기지 않았으면 작업 기록의 처음 기사들이 최신 기사임
+        if self.since_last is not None and self.ignore_count == 0:
+            # 지난 실행에서 본 기사에 닿기 전에 기사 수에서 멈췄으면 그 사이의 기사를 다음 실행에서 수집하도록
+            # 지난 기록을 그대로 둠 (검색 결과가 끝났거나 지난 기록이 없으면 새로 기록함)
+            if self.known_urls and not self.reached_known and not self.wants_more():
+                print(f'Warning: Collected {self.collect_count} Articles before Reaching Articles Collected '
+                      f'Last Run from {self.press}, Keeping the Last Run (Increase -n to Collect the Rest)')
+                return
+
+            head_urls = self.head_urls
+            if not head_urls and self.journal is not None:
+                head_urls = self.journal.collected_urls(self.press, collect_state.HEAD_SIZE)
+            self.since_last.record(self.press, self.query_word, self.detail_word, head_urls)
+
+
+# 수집 수행. 실패하면 실패한 위치부터 다시 수집함
 def collect(scraper, collect_count, ignore_count, query_word, detail_word,
-            list_file, method_save=None):
-    print('Collecting Articles')
+            list_sink, method_save=None, journal=None, dedup=None, verbose=False, since_last=None):
+    collection = PressCollection(scraper.PRESS, (collect_count, ignore_count, query_word, detail_word),
+                                 list_sink, journal, dedup, verbose, since_last)
 
-    num = ignore_count + 1  # 기사 카운터
-
-    print(f'Ignoring {ignore_count} Articles')
+    while collection.wants_more():
+        num_yielded = 0  # 이번 시도에서 받은 기사 수
+        try:
+            for article in scraper.collect_articles(collection.remaining(), collection.position,
+                                                    query_word, detail_word):
+                num_yielded += 1
+                if collection.add(article) and method_save is not None:
+                    method_save(article)
+                if collection.reached_known:
+                    break
+
+            if num_yielded == 0:  # 검색 결과 끝
+                break
 
-    try:
-        for article in scraper.collect_articles(collect_count, ignore_count,
-                                                query_word, detail_word):
+        except response_cache.CacheMissError as error:  # 오프라인 모드에서 캐시된 페이지가 끝남
+            print(f'Not in Cache: {error}')
+            break
 
-            # 저장
-            list_file.write(f'{article["url"]}, "{article["title"]}"\n')
-            if method_save is not None:
-                method_save(article)
+        except:
+            collection.fail()
 
-            # 작업 상황 출력
-            print(f'Collected [{num}] {article["url"]}')
-            num += 1
+    collection.finish()
 
-        if num < collect_count:
-            print("Not Enough Articles to Collect")
-        print('Collecting Completed')
 
-    except:
-        print(f'Collecting Failed at [{num}] ')
+# 스크랩 실패 출력. error는 오류 메시지이며 None이면 지금 처리 중인 예외를 출력함
+def report_failure(press, seq, url, error=None):
+    print(f'Scraping Failed [{seq + 1}] {url}')
+    if error is None:
         traceback.print_exc(limit=3, file=sys.stdout)
-        print('Ignore it and Resume...')
-        collect(scraper, (collect_count - num - 1), num, query_word,
-                detail_word, list_file, method_save)
+    else:
+        print(error, end='')
+    print('Ignore it and Resume...')
+    metrics.count('failed', press=press)
 
 
-# 스크래핑 수행
-def scrap(scraper, result_file, article_source_queue):
-    print('Scraping Articles')
+# 스크래핑 수행 (작업자 스레드)
+# 작업 큐에서 (순번, 기사)를 꺼내 스크랩하고 (언론사, 순번, 링크, 내용)을 결과 큐에 넣음
+# parse_pool이 있으면 받아온 내용을 분석 프로세스로 넘기고, 결과는 분석이 끝난 뒤 결과 큐에 들어감
+def scrap(scraper, article_source_queue, result_queue, parse_pool=None):
+    press = scraper.PRESS
 
-    num = 0  # 횟수 카운터
     while True:
+        item = article_source_queue.get()
+
+        if item is None:  # 종료 신호
+            break
+
+        seq, article = item
+        url = article['url']
+
         try:
-            num += 1
-            article = article_source_queue.get()
+            if parse_pool is not None:
+                start = time.perf_counter()
+                content = scraper.fetch_article(url)  # 받아오기만 함
+                parse_pool.submit(press, (press, seq, url, start), content)
+                continue
 
-            if article is None:
-                break
+            with metrics.timer('article', press):  # 기사 하나를 받아 분석하기까지 걸린 시간
+                content = scraper.scrap_articles(url)  # 내용 스크랩
 
-            url = article['url']
-            content = scraper.scrap_articles(url)  # 내용 스크랩
+        except:
+            report_failure(press, seq, url)
+            content = None  # 실패한 기사도 순번은 넘겨야 기록 스레드가 기다리지 않음
+
+        result_queue.put((press, seq, url, content))
+
+
+# 스크랩 결과 기록기
+# 작업자들이 넘긴 결과를 언론사마다 목록 순서대로 모아서 파일에 씀
+# 앞 순번의 결과가 도착할 때까지 뒤 순번 결과를 보관함
+class ResultWriter:
+
+    def __init__(self, result_sink, verbose=False, on_failed=None):
+        print('Scraping Articles')
+
+        self.result_sink = result_sink
+        self.verbose = verbose  # 기사마다 출력
+        self.on_failed = on_failed  # 스크랩에 실패한 기사의 링크를 받는 함수
+        self.pending = {}  # 앞 순번을 기다리는 결과. (언론사, 순번) -> (링크, 내용)
+        self.next_seq = {}  # 언론사 -> 다음에 기록할 순번
+        self.num = 0  # 기록한 기사 수
+        self.start_time = time.monotonic()
+
+    # 결과 추가. content가 None이면 스크랩 실패한 기사
+    def add(self, press, seq, url, content):
+        self.pending[(press, seq)] = (url, content)
+
+        next_seq = self.next_seq.get(press, 0)
+        while (press, next_seq) in self.pending:
+            url, content = self.pending.pop((press, next_seq))
+            next_seq += 1
 
-            # 저장
-            result_file.write(
-                f'"{content["date"]}", "{content["title"]}", "{content["body"]}"\n')
+            if content is None:  # 스크랩 실패한 기사
+                if self.on_failed is not None:
+                    self.on_failed(url)
+                continue
+
+            # 저장. 여러 언론사를 한 파일에 저장하면 언론사 열에 들어감
+            content['press'] = press
+            with metrics.timer('write', press):
+                self.result_sink.write(content, key=url)  # 파일에 내보낸 뒤 작업 기록에 남음
+            self.num += 1
+            metrics.count('scraped', press=press)
 
             # 작업 상황 출력
-            print(f'Scraped [{num}] {url}')
+            if self.verbose:
+                print(f'Scraped [{self.num}] {url}')
 
-            article_source_queue.task_done()
+        self.next_seq[press] = next_seq
 
-        except:
-            print(f'Scraping Failed [{num}] {url}')
-            traceback.print_exc(limit=3, file=sys.stdout)
-            print('Ignore it and Resume...')
-            continue
+    # 기록 완료 및 처리 속도 출력
+    def finish(self):
+        self.result_sink.flush()
+        elapsed_time = time.monotonic() - self.start_time
+        print(f'Scraping Completed: {self.num} Articles in {elapsed_time:.1f}s '
+              f'({self.num / elapsed_time if elapsed_time > 0 else 0:.2f} articles/sec)')
+
+
+# 결과 기록 (기록 스레드)
+# 하나의 스레드에서만 파일에 쓰므로 행이 섞이지 않음
+# 작업자와 분석 프로세스가 모두 끝나면 결과 큐에 종료 신호(None)가 들어옴
+def write_results(writer, result_queue):
+    while True:
+        item = result_queue.get()
+
+        if item is None:
+            break
+
+        writer.add(*item)
 
-    print('Scraping Completed')
+    writer.finish()
+
+
+# 비동기 엔진으로 기사 목록 수집 (언론사 하나)
+# 수집한 기사는 list_sink에 기록하고, enqueue가 있으면 스크랩하도록 넘김
+# 건너뛰기, 실패 처리, since_last는 collect와 같음 (PressCollection)
+async def collect_async(async_scraper, collect_params, list_sink, enqueue=None,
+                        journal=None, dedup=None, verbose=False, since_last=None):
+    collection = PressCollection(async_scraper.scraper.PRESS, collect_params, list_sink, journal, dedup, verbose,
+                                 since_last)
+    _, _, query_word, detail_word = collect_params
+
+    # 건너뛴 기사만큼 더 받아오도록 목표 수에 도달하거나 검색 결과가 끝날 때까지 반복
+    while collection.wants_more():
+        num_yielded = 0  # 이번 시도에서 받은 기사 수
+        try:
+            async for article in async_scraper.collect_articles(
+                    collection.remaining(), collection.position, query_word, detail_word):
+                num_yielded += 1
+                if collection.add(article) and enqueue is not None \
+                        and not (journal is not None and journal.is_scraped(article['url'])):
+                    await enqueue(article)
+                if collection.reached_known:
+                    break
+
+            if num_yielded == 0:  # 검색 결과 끝
+                break
+
+        except response_cache.CacheMissError as error:  # 오프라인 모드에서 캐시된 페이지가 끝남
+            print(f'Not in Cache: {error}')
+            break
+
+        except Exception:
+            collection.fail()
+
+    collection.finish()
+
+
+# 비동기 엔진으로 수집 및 스크랩 진행
+# collect_params가 있으면 (collect_count, ignore_count, query_word, detail_word)로 수집하고 list_sink에 기록
+# 없으면 articles의 기사 목록을 스크랩함. result_sink가 None이면 수집만 함
+# 언론사마다 동시 요청 수 concurrency인 스크래퍼와 작업 큐를 따로 두고 모두 동시에 진행함
+async def run_async(scrapers, concurrency, list_sink, result_sink, collect_params=None,
+                    http_timeout=30, http_retries=3, journal=None, articles=None, dedup=None,
+                    verbose=False, parse_procs=0, since_last=None):
+    # aiohttp는 비동기 엔진을 쓸 때만 필요함
+    from async_scraper import AsyncScraper
+
+    async with contextlib.AsyncExitStack() as stack:
+        async_scrapers = {press: await stack.enter_async_context(
+            AsyncScraper(scraper, concurrency, http_timeout, http_retries)) for press, scraper in scrapers.items()}
+
+        article_queues = {press: asyncio.Queue(5000) for press in scrapers}  # 언론사별 작업 큐. 최대 대기열 수 지정
+        sequences = {press: itertools.count() for press in scrapers}  # 언론사별 기사 순번
+        writer = ResultWriter(result_sink, verbose) if result_sink is not None else None
+
+        metrics.set_gauge('article_queue', lambda: sum(article_queue.qsize() for article_queue in article_queues.values()))
+        if writer is not None:
+            metrics.set_gauge('pending_results', lambda: len(writer.pending))
+
+        # 분석 프로세스가 끝낸 기사는 이벤트 루프에서 기록함
+        loop = asyncio.get_running_loop()
+
+        def add_parsed(item, content, error):
+            press, seq, url, start = item
+            if error is not None:
+                report_failure(press, seq, url, error)
+            else:
+                metrics.observe('article', time.perf_counter() - start, press)
+            writer.add(press, seq, url, content)
+
+        parse_pool = None
+        if parse_procs > 0 and writer is not None:
+            parse_pool = ParsePool(
+                parse_procs, lambda *result: loop.call_soon_threadsafe(add_parsed, *result))
+
+        async def enqueue(article):
+            press = press_of(article, scrapers)
+            await article_queues[press].put((next(sequences[press]), article))
+
+        # 스크랩 작업자 코루틴
+        async def scrap_worker(press):
+            async_scraper = async_scrapers[press]
+            article_queue = article_queues[press]
+
+            while True:
+                item = await article_queue.get()
+
+                if item is None:  # 종료 신호
+                    break
+
+                seq, article = item
+                url = article['url']
+
+                try:
+                    start = time.perf_counter()
+                    if parse_pool is not None:
+                        content = await async_scraper.fetch_article(url)  # 받아오기만 함
+                        # 처리 중인 묶음이 많으면 submit이 기다리므로 이벤트 루프를 막지 않도록 스레드에서 호출
+                        await asyncio.to_thread(parse_pool.submit, press, (press, seq, url, start), content)
+                        continue
+
+                    content = await async_scraper.scrap_articles(url)  # 내용 스크랩
+                    metrics.observe('article', time.perf_counter() - start, press)
+
+                except Exception:
+                    report_failure(press, seq, url)
+                    content = None
+
+                writer.add(press, seq, url, content)
+
+        num_workers = concurrency if writer is not None else 0  # 언론사별 작업자 수
+        workers = [asyncio.ensure_future(scrap_worker(press)) for press in scrapers for _ in range(num_workers)]
+
+        try:
+            if collect_params is not None:  # 기사 목록 수집
+                if journal is not None and writer is not None:  # 수집은 했지만 스크랩하지 못한 기사부터 처리
+                    for article in journal.pending_articles():
+                        await enqueue(article)
+
+                await asyncio.gather(*(
+                    collect_async(async_scraper, collect_params, list_sink,
+                                  enqueue if writer is not None else None, journal, dedup, verbose,
+                                  since_last)
+                    for async_scraper in async_scrapers.values()))
+
+            else:  # 기사 목록 읽기
+                for article in articles:
+                    if journal is not None and journal.is_scraped(article['url']):  # 스크랩한 기사
+                        continue
+                    await enqueue(article)
+
+        finally:  # 작업자 종료
+            for article_queue in article_queues.values():
+                for _ in range(num_workers):
+                    await article_queue.put(None)
+
+        try:
+            await asyncio.gather(*workers)
+            if parse_pool is not None:  # 남은 기사 분석. 결과는 이벤트 루프로 넘어와 기록됨
+                await asyncio.to_thread(parse_pool.close)
+        except BaseException:
+            if parse_pool is not None:
+                parse_pool.terminate()
+            raise
+
+        metrics.set_gauge('article_queue', None)
+        metrics.set_gauge('pending_results', None)
+
+        if writer is not None:
+            writer.finish()
 
 
 if __name__ == '__main__':
@@ -4,36 +4,79 @@
 
 import re  # 정규표현식
 import json  # JSON(Javascript Object Notation) 도구
-
-from functools import reduce  # 고차함수
+import html  # HTML 엔티티 변환
+import time  # 시각
+import datetime  # 시각 모듈
+import threading  # 동기화 도구
+from collections import deque  # 요청 순서 보관용 큐
+from concurrent.futures import ThreadPoolExecutor  # 검색 페이지 동시 요청
 
 import requests  # HTTP REQUEST를 위한 모듈
-from bs4 import BeautifulSoup  # HTML 분석기
+
+import html_parser  # HTML 분석기 선택
+import http_session  # 공유 HTTP 세션
+import metrics  # 단계별 처리 시간 측정
+import response_cache  # HTTP 응답 디스크 캐시
+import text_normalize  # 텍스트 정리, 날짜 추출
+
+
+# 스레드별 정리(clean) 시간 합계 (초)
+# 필드마다 측정값에 기록하면 모든 스크랩 스레드가 측정값 잠금을 잡으므로, 더해두었다가 페이지마다 한 번 기록함
+_clean_time = threading.local()
+
+
+# 받아온 바이트를 문자열로 변환. response.text와 같이 내용으로 인코딩을 판별함
+def decode_content(content):
+    response = requests.Response()
+    response._content = content
+    response.encoding = None  # 한글 깨짐을 방지하기 위한 인코딩 자동 변환 방지
+    return response.text
 
 
 # 기사 스크래퍼를 위한 추상 클래스
 class Scraper:
 
-    CHARACTER_FILTER = re.compile(
-        r'[^ 가-힣]+')  # 특수 문자나 필요없는 문자들을 제외하기 위한 정규식
-
-    DATE_REGEX = re.compile(
-        r'.*((?:19|20)(?:\d{2}))[-.](0[1-9]|1[0-2])[-.]([012][0-9]|3[01]).*')  # 날짜 검출용 정규식
+    PAGE_WINDOW = 4  # 검색 결과 페이지를 동시에 받아올 개수
 
     @staticmethod
-    def _extract_date(text):  # 정규식으로 날짜만 분리
-        match = re.search(Scraper.DATE_REGEX, text)  # 텍스트에서 정규식 매치
-        # 그룹으로 매치된 날짜 (YYYY-MM-DD) 반환
-        return f'{match.group(1)}-{match.group(2)}-{match.group(3)}'
+    def _extract_date(text):  # 날짜만 분리 (YYYY-MM-DD)
+        return text_normalize.extract_date(text)
 
     @staticmethod
     def _clean_text(text):  # 필요한 문자만 남기기 위한 함수
-        return re.sub(r' +', ' ', Scraper.CHARACTER_FILTER.sub(' ', text))
+        start = time.perf_counter()
+        text = text_normalize.clean_text(text)
+        _clean_time.seconds = getattr(_clean_time, 'seconds', 0.0) + time.perf_counter() - start
+        return text
+
+    @staticmethod
+    def _join_clean(texts):  # 여러 요소의 텍스트를 각각 정리해서 하나로 합침
+        start = time.perf_counter()
+        text = text_normalize.join_clean(texts)
+        _clean_time.seconds = getattr(_clean_time, 'seconds', 0.0) + time.perf_counter() - start
+        return text
+
+    # parse(text)로 분석하고 (결과, 그동안 정리에 걸린 시간) 반환
+    @staticmethod
+    def _clean_timed(parse, text):
+        _clean_time.seconds = 0.0
+        result = parse(text)
+        return result, _clean_time.seconds
+
+    # parse(text)로 분석하면서 분석 시간은 timer_name으로, 정리 시간은 clean으로 한 번씩 기록
+    # 동기/비동기 스크래퍼가 함께 사용함
+    @staticmethod
+    def _parse_timed(parse, text, timer_name):
+        with metrics.timer(timer_name):  # 정리 시간 포함
+            result, clean_seconds = Scraper._clean_timed(parse, text)
+        metrics.observe('clean', clean_seconds)
+        return result
 
     @staticmethod
     def _request_get(url):  # HTTP GET 함수
         try:
-            response = requests.get(url)  # HTTP GET
+            with metrics.timer('fetch'):
+                response = http_session.get_session().get(url)  # HTTP GET (연결 재사용, 재시도 포함)
             response.encoding = None  # 한글 깨짐을 방지하기 위한 인코딩 자동 변환 방지
             return response
         except requests.exceptions.HTTPError as error:
@@ -43,45 +86,79 @@ class Scraper:
             print(error)
             raise error
 
-    # {'url': (링크), 'title': (제목)} 딕셔너리를 제너레이터로 반환할것
-    def collect_articles(self, collect_count, ignore_count, query_word, detail_word):
-        raise NotImplementedError
-
-    # {'date': (날짜), 'title': (제목), 'body': (내용)} 딕셔너리로 반환할것
-    def scrap_articles(self, article_url):
-        raise NotImplementedError
+    @staticmethod
+    def _get_text(url, kind='article'):  # 페이지 내용 반환. 캐시를 설정했으면 캐시를 먼저 확인
+        cache = response_cache.get_cache()
+        if cache is None:
+            return Scraper._request_get(url).text
+
+        text = cache.get(url, kind)
+        if text is None:
+            if cache.offline:  # 오프라인 모드에서는 네트워크에 접근하지 않음
+                raise response_cache.CacheMissError(url)
+            text = Scraper._request_get(url).text
+            cache.put(url, text)
+        return text
+
+    def __init__(self, page_window=PAGE_WINDOW, base_url=None):
+        self.page_window = page_window
+        # 검색 요청을 보낼 주소. 로컬 대역 서버로 바꿔 시험할 수 있음
+        self.base_url = base_url if base_url is not None else self.BASE_URL
+
+    # 검색 결과 페이지 하나를 받아 기사 목록으로 분석
+    def _fetch_search_page(self, page_url):
+        with metrics.press_label(self.PRESS):
+            text = Scraper._get_text(page_url, 'page')
+            return Scraper._parse_timed(self._parse_search_page, text, 'parse_page')
+
+    # 검색 결과 페이지를 page_window개씩 동시에 받아오되 페이지 순서대로 반환하는 제너레이터
+    # 빈 페이지가 오면 더 이상 새 페이지를 요청하지 않음
+    def _prefetch_pages(self, page_urls):
+        page_urls = iter(page_urls)
+        executor = ThreadPoolExecutor(max_workers=self.page_window)
+        futures = deque()  # 요청 순서대로 보관
+        exhausted = threading.Event()  # 빈 페이지 도착 여부
+
+        def on_done(future):
+            if future.cancelled() or future.exception() is not None:
+                return
+            if not future.result():
+                exhausted.set()
+
+        def submit_next():
+            if exhausted.is_set():
+                return
+            page_url = next(page_urls, None)
+            if page_url is not None:
+                future = executor.submit(self._fetch_search_page, page_url)
+                future.add_done_callback(on_done)
+                futures.append(future)
 
+        try:
+            for _ in range(self.page_window):
+                submit_next()
 
-# 중앙일보 스크래퍼
-class JoongangScraper(Scraper):
+            while futures:
+                articles = futures.popleft().result()
+                if not articles:  # 검색 결과 끝
+                    break
+                submit_next()
+                yield articles
 
-    NUM_ARTICLE_PER_QUERY = 10  # 페이지당 기사 수
+        finally:  # 소비자가 중간에 멈추면 남은 요청은 취소
+            executor.shutdown(wait=False, cancel_futures=True)
 
+    # {'url': (링크), 'title': (제목)} 딕셔너리를 제너레이터로 반환
     def collect_articles(self, collect_count, ignore_count, query_word, detail_word):
         # 찾은 기사 수
         num = 0
 
-        # 무시한 페이지 수
-        page_ignore = ignore_count // JoongangScraper.NUM_ARTICLE_PER_QUERY
-        # 무시할 기사 수
-        skip = ignore_count - page_ignore * JoongangScraper.NUM_ARTICLE_PER_QUERY
-
-        for page in range(page_ignore + 1,
-                          (collect_count + ignore_count) // JoongangScraper.NUM_ARTICLE_PER_QUERY + 2):
-            # 중앙일보 웹 서버로 HTTP GET
-            # 상세 검색 기능도 함께 이용하여 IncludeKeyword에 명시된 키워드를 포함하는 기사만 검색
-            soup = BeautifulSoup(
-                Scraper._request_get(
-                    f'https://news.joins.com/search/JoongangNews?page={page}&Keyword={query_word}&SortType=New&SearchCategoryType=JoongangNews&IncludeKeyword={detail_word}')
-                .text, 'html.parser')
-
-            # 검색 결과의 제목과 사이트 주소가 포함되어 있는 부분의 css selector.
-            # 리스트 형식으로 여러개 반환
-            link_elements = soup.select(
-                '#content > div.section_news > div.bd > ul > li > div > h2 > a')
-
-            # 검색 결과가 여러 개(중앙일보 사이트는 10개)인 경우 리스트 요소들로부터 하나씩 불러와서 작업하기 위한 반복문
-            for element in link_elements:
+        page_urls, skip = self._collect_plan(
+            collect_count, ignore_count, query_word, detail_word)
+
+        for articles in self._prefetch_pages(page_urls):
+            # 검색 결과가 여러 개인 경우 리스트 요소들로부터 하나씩 불러와서 작업하기 위한 반복문
+            for article in articles:
                 # 기사 무시
                 if skip > 0:
                     print(f'Ignored Article, {skip} left.')
@@ -90,18 +167,101 @@ class JoongangScraper(Scraper):
 
                 # 목표 기사 수 도달
                 if num >= collect_count:
-                    break
+                    return
 
-                # 기사 정보 딕셔너리
-                article = {'url': element.get("href"),
-                           'title': Scraper._clean_text(element.get_text())}
                 yield article
                 num += 1
 
+    # 검색 결과 페이지 주소 목록과 처음 페이지에서 무시할 기사 수를 반환
+    def _collect_plan(self, collect_count, ignore_count, query_word, detail_word):
+        page_urls = [self._search_page_url(page, query_word, detail_word)
+                     for page in self._search_pages(collect_count, ignore_count)]
+
+        # 무시할 기사 수 (무시할 페이지는 _search_pages에서 건너뜀)
+        skip = ignore_count % self.NUM_ARTICLE_PER_QUERY
+
+        return page_urls, skip
+
+    # 요청할 검색 결과 페이지 번호들을 반환할것
+    def _search_pages(self, collect_count, ignore_count):
+        raise NotImplementedError
+
+    # 검색 결과 페이지 주소를 반환할것
+    def _search_page_url(self, page, query_word, detail_word):
+        raise NotImplementedError
+
+    # 검색 결과 페이지 내용에서 [{'url': (링크), 'title': (제목)}, ...] 리스트를 반환할것
+    def _parse_search_page(self, text):
+        raise NotImplementedError
+
+    # {'date': (날짜), 'title': (제목), 'body': (내용)} 딕셔너리로 반환
     def scrap_articles(self, article_url):
+        with metrics.press_label(self.PRESS):
+            text = Scraper._get_text(article_url, 'article')
+            return Scraper._parse_timed(self._parse_article, text, 'parse')
+
+    # 기사 페이지를 받아오기만 함 (분석은 parse_article로 따로 함)
+    # 캐시를 쓰지 않으면 인코딩 판별도 분석하는 쪽에서 하도록 디코딩하지 않은 바이트를 반환함
+    def fetch_article(self, article_url):
+        with metrics.press_label(self.PRESS):
+            if response_cache.get_cache() is None:
+                return Scraper._request_get(article_url).content
+            return Scraper._get_text(article_url, 'article')
+
+    # fetch_article이 반환한 내용을 분석하여 {'date': (날짜), 'title': (제목), 'body': (내용)} 딕셔너리로 반환
+    def parse_article(self, content):
+        return self.parse_article_timed(content)[0]
+
+    # parse_article과 같지만 (결과, 정리에 걸린 시간)을 반환
+    # 분석 프로세스의 측정값은 버려지므로 정리 시간을 부모 프로세스에 넘겨 기록하도록 함
+    def parse_article_timed(self, content):
+        if isinstance(content, bytes):
+            content = decode_content(content)
+        return Scraper._clean_timed(self._parse_article, content)
+
+    # 기사 페이지 내용에서 {'date': (날짜), 'title': (제목), 'body': (내용)} 딕셔너리를 반환할것
+    # 동기/비동기 스크래퍼가 함께 사용함
+    def _parse_article(self, text):
+        raise NotImplementedError
+
+
+# 중앙일보 스크래퍼
+class JoongangScraper(Scraper):
+
+    PRESS = 'joongang'  # 언론사 이름
+    BASE_URL = 'https://news.joins.com'  # 검색 주소
+    NUM_ARTICLE_PER_QUERY = 10  # 페이지당 기사 수
+
+    # 분석할 하위 트리 (속성 이름, (값, ...))
+    SEARCH_PARTS = ('id', ('content',))  # 검색 결과 목록
+    ARTICLE_PARTS = ('class', ('article_head', 'article_body'))  # 기사 머리 (날짜, 제목), 본문
+
+    def _search_pages(self, collect_count, ignore_count):
+        # 무시한 페이지 수
+        page_ignore = ignore_count // JoongangScraper.NUM_ARTICLE_PER_QUERY
+        return range(page_ignore + 1,
+                     (collect_count + ignore_count) // JoongangScraper.NUM_ARTICLE_PER_QUERY + 2)
 
-        soup = BeautifulSoup(Scraper._request_get(
-            article_url).text, 'html.parser')
+    def _search_page_url(self, page, query_word, detail_word):
+        # 상세 검색 기능도 함께 이용하여 IncludeKeyword에 명시된 키워드를 포함하는 기사만 검색
+        return f'{self.base_url}/search/JoongangNews?page={page}&Keyword={query_word}&SortType=New&SearchCategoryType=JoongangNews&IncludeKeyword={detail_word}'
+
+    def _parse_search_page(self, text):
+        soup = html_parser.parse_html(text, JoongangScraper.SEARCH_PARTS)
+
+        # 검색 결과의 제목과 사이트 주소가 포함되어 있는 부분의 css selector.
+        # 리스트 형식으로 여러개 반환
+        link_elements = soup.select(
+            '#content > div.section_news > div.bd > ul > li > div > h2 > a')
+
+        # 기사 정보 딕셔너리
+        return [{'url': element.get("href"),
+                 'title': Scraper._clean_text(element.get_text())}
+                for element in link_elements]
+
+    def _parse_article(self, text):
+
+        soup = html_parser.parse_html(text, JoongangScraper.ARTICLE_PARTS)
 
         # 기사 날짜 추출
         date_element = soup.select(
@@ -117,9 +277,10 @@ class JoongangScraper(Scraper):
         body_elements = soup.select(
             '#article_body')  # 기사 내용 요소 추출, 여러개일 수 있음
 
-        body = reduce(lambda prev, next: prev + next,
-                      map(lambda element: Scraper._clean_text(element.get_text()),
-                          body_elements))  # 각 요소별 내용을 하나로 합침
+        if not body_elements:
+            raise ValueError('No Article Body')
+        body = Scraper._join_clean(
+            [element.get_text() for element in body_elements])  # 각 요소별 내용을 하나로 합침
 
         # {'date': (날짜), 'title': (제목), 'body': (내용)} 딕셔너리로 반환
         return {'date': date, 'title': title, 'body': body}
@@ -128,69 +289,56 @@ class JoongangScraper(Scraper):
 # 동아일보 스크래퍼
 class DongaScraper(Scraper):
 
+    PRESS = 'donga'  # 언론사 이름
+    BASE_URL = 'http://news.donga.com'  # 검색 주소
     ARTICLE_HREF_FILTER = re.compile(r'.+/news/article/.+')  # 기사 필터
     NUM_ARTICLE_PER_QUERY = 15  # 페이지당 기사 수
 
-    def collect_articles(self, collect_count, ignore_count, query_word, detail_word):
-
-        # 찾은 기사 수
-        num = 0
+    # 분석할 하위 트리 (속성 이름, (값, ...))
+    SEARCH_PARTS = ('class', ('t',))  # 검색 결과 항목
+    ARTICLE_PARTS = ('class', ('article_title', 'article_txt'))  # 기사 머리 (날짜, 제목), 본문
 
+    def _search_pages(self, collect_count, ignore_count):
         # 무시한 페이지 수
-        page_ignore = ignore_count // JoongangScraper.NUM_ARTICLE_PER_QUERY
-        # 무시할 기사 수
-        skip = ignore_count - page_ignore * JoongangScraper.NUM_ARTICLE_PER_QUERY
-
-        for page in range(page_ignore,
-                          (collect_count+ignore_count) // DongaScraper.NUM_ARTICLE_PER_QUERY + 2):
-
-            soup = BeautifulSoup(
-                Scraper._request_get(
-                    f'http://news.donga.com/search?p={1+page*DongaScraper.NUM_ARTICLE_PER_QUERY}&check_news=1&more=1&sorting=1&range=3&search_date=&v1=&v2=&query={query_word}')
-                .text, 'html.parser')
+        page_ignore = ignore_count // DongaScraper.NUM_ARTICLE_PER_QUERY
+        return range(page_ignore,
+                     (collect_count + ignore_count) // DongaScraper.NUM_ARTICLE_PER_QUERY + 2)
 
-            # 검색 결과의 제목과 사이트 주소가 포함되어 있는 부분의 css selector.
-            link_elements = soup.select('div.t > p.tit > a')
+    def _search_page_url(self, page, query_word, detail_word):
+        return f'{self.base_url}/search?p={1+page*DongaScraper.NUM_ARTICLE_PER_QUERY}&check_news=1&more=1&sorting=1&range=3&search_date=&v1=&v2=&query={query_word}'
 
-            link_elements = list(filter(lambda element: DongaScraper.ARTICLE_HREF_FILTER.search(
-                element.get("href")), link_elements))  # 기사 링크만 필터링
+    def _parse_search_page(self, text):
+        soup = html_parser.parse_html(text, DongaScraper.SEARCH_PARTS)
 
-            for element in link_elements:
-                # 기사 무시
-                if skip > 0:
-                    print(f'Ignored Article, {skip} left.')
-                    skip -= 1
-                    continue
-
-                # 목표 기사 수 도달
-                if num >= collect_count:
-                    break
+        # 검색 결과의 제목과 사이트 주소가 포함되어 있는 부분의 css selector.
+        link_elements = soup.select('div.t > p.tit > a')
 
-                # 기사 정보 딕셔너리
-                article = {'url': element.get(
-                    "href"), 'title': Scraper._clean_text(element.get_text())}
+        link_elements = filter(lambda element: DongaScraper.ARTICLE_HREF_FILTER.search(
+            element.get("href")), link_elements)  # 기사 링크만 필터링
 
-                yield article
-                num += 1
+        # 기사 정보 딕셔너리
+        return [{'url': element.get("href"),
+                 'title': Scraper._clean_text(element.get_text())}
+                for element in link_elements]
 
-    def scrap_articles(self, article_url):
-        soup = BeautifulSoup(Scraper._request_get(
-            article_url).text, 'html.parser')
+    def _parse_article(self, text):
+        soup = html_parser.parse_html(text, DongaScraper.ARTICLE_PARTS)
 
         # 기사 날짜 추출
+        # 선택자는 ARTICLE_PARTS 하위 트리 안에서 찾을 수 있도록 바깥 요소(#container, #content)를 뺌
         date_element = soup.select(
-            '#container > div.article_title > div.title_foot > span.date01')[0]  # 최초 일자 요소 (최종 수정일자는 [1]번째 요소)
+            'div.article_title > div.title_foot > span.date01')[0]  # 최초 일자 요소 (최종 수정일자는 [1]번째 요소)
         date = Scraper._extract_date(
             date_element.get_text())  # 정규식으로 날짜만 얻어옴
 
         # 기사 제목 추출
         title_element = soup.select_one(
-            '#container > div.article_title > h1')  # 기사 제목 요소 추출. 하나임
+            'div.article_title > h1')  # 기사 제목 요소 추출. 하나임
         title = Scraper._clean_text(title_element.get_text())
 
         # 기사 본문 추출하는 부분
         body_element = soup.select_one(
-            '#content > div > div.article_txt')  # 기사 내용 요소 추출, 하나임
+            'div.article_txt')  # 기사 내용 요소 추출, 하나임
 
         body = Scraper._clean_text(body_element.get_text())
 
@@ -201,60 +349,97 @@ class DongaScraper(Scraper):
 # 조선일보 스크래퍼
 class ChosunScraper(Scraper):
 
+    PRESS = 'chosun'  # 언론사 이름
+    BASE_URL = 'https://www.chosun.com'  # 검색 API 주소
     # 기사 링크 추출용 정규식
     ARTICLE_HREF_FILTER = r'.*article.html\?id=\d+'
-    # 스크립트 중 정보 추출용 정규식
-    DATA_SCRIPT_FILTER = r'^.*Fusion.globalContent=(.+);Fusion.globalContentConfig.*'
+    # 기사 정보(JSON)가 들어있는 스크립트 변수
+    DATA_SCRIPT_MARKER = 'Fusion.globalContent='
+    DATA_DECODER = json.JSONDecoder()  # 변수 뒤의 JSON 객체 하나만 읽음
+    BODY_TYPES = ('text', 'header')  # 본문으로 쓸 content_elements 종류 (문단, 소제목)
+    TAG_FILTER = re.compile(r'<[^>]*>')  # 문단 안의 태그 (<b>, <a>, <br/> 등)
+    KST = datetime.timezone(datetime.timedelta(hours=9))  # 기사 날짜 기준 시간대 (JSON의 날짜는 UTC)
     NUM_ARTICLE_PER_QUERY = 10  # 페이지당 기사 수
 
-    def collect_articles(self, collect_count, ignore_count, query_word, detail_word):
-        # 찾은 기사 수
-        num = 0
+    # 분석할 하위 트리 (속성 이름, (값, ...))
+    ARTICLE_PARTS = ('id', ('wv_wrap_id',))  # 기사 전체 (날짜, 제목, 본문)
 
+    def _search_pages(self, collect_count, ignore_count):
         # 무시한 페이지 수
-        page_ignore = ignore_count // JoongangScraper.NUM_ARTICLE_PER_QUERY
-        # 무시할 기사 수
-        skip = ignore_count - page_ignore * JoongangScraper.NUM_ARTICLE_PER_QUERY
-
-        for page in range(page_ignore, (collect_count + ignore_count) // ChosunScraper.NUM_ARTICLE_PER_QUERY + 1):
-
-            # 조선일보 API 질의 문자열
-            query = json.dumps({
-                'emd_word': requests.utils.quote(detail_word),
-                'query': requests.utils.quote(query_word),
-                'page': page,
-                'date_period': 'all',
-                'encodeURI': 'true', 'expt_word': '', 'field': '',
-                'siteid': 'www', 'sort': '1', 'writer': ''
-            }, ensure_ascii=False, separators=(',', ':'))
-
-            # 조선일보 API 질의 결과
-            data = requests.get(
-                f'https://www.chosun.com/pf/api/v3/content/fetch/search-param-api?query={query}&d=&_website=chosun').json()
-
-            for element in data["content_elements"]:
-                # 기사 무시
-                if skip > 0:
-                    print(f'Ignored Article, {skip} left.')
-                    skip -= 1
-                    continue
-
-                # 목표 기사 수 도달
-                if num >= collect_count:
-                    break
-
-                article = {
-                    'url': re.search(ChosunScraper.ARTICLE_HREF_FILTER,
-                                     element["article_view_url"]).group(0),
-                    'title': Scraper._clean_text(element["title"])
-                }
+        page_ignore = ignore_count // ChosunScraper.NUM_ARTICLE_PER_QUERY
+        return range(page_ignore,
+                     (collect_count + ignore_count) // ChosunScraper.NUM_ARTICLE_PER_QUERY + 1)
+
+    def _search_page_url(self, page, query_word, detail_word):
+        # 조선일보 API 질의 문자열
+        query = json.dumps({
+            'emd_word': requests.utils.quote(detail_word),
+            'query': requests.utils.quote(query_word),
+            'page': page,
+            'date_period': 'all',
+            'encodeURI': 'true', 'expt_word': '', 'field': '',
+            'siteid': 'www', 'sort': '1', 'writer': ''
+        }, ensure_ascii=False, separators=(',', ':'))
+
+        return f'{self.base_url}/pf/api/v3/content/fetch/search-param-api?query={query}&d=&_website=chosun'
+
+    def _parse_search_page(self, text):
+        # 조선일보 API 질의 결과
+        data = json.loads(text)
+
+        return [{'url': re.search(ChosunScraper.ARTICLE_HREF_FILTER,
+                                  element["article_view_url"]).group(0),
+                 'title': Scraper._clean_text(element["title"])}
+                for element in data.get("content_elements", [])]
+
+    # 스크립트의 JSON에서 기사를 바로 추출하고, JSON이 없거나 형식이 다르면 HTML을 분석함
+    def _parse_article(self, text):
+        article = ChosunScraper._parse_article_data(text)
+        if article is not None:
+            return article
+        return ChosunScraper._parse_article_html(text)
+
+    # Fusion.globalContent의 JSON에서 기사 추출. 없거나 형식이 다르면 None
+    # 문자열 검색 한 번으로 위치를 찾고 JSON만 디코딩하므로 페이지 전체의 DOM을 만들지 않음
+    # 본문은 HTML 경로의 get_text와 같도록 문단을 그대로 이어 붙이고 태그를 뺌
+    @staticmethod
+    def _parse_article_data(text):
+        start = text.find(ChosunScraper.DATA_SCRIPT_MARKER)
+        if start < 0:
+            return None
 
-                yield article
-                num += 1
+        try:
+            data, _ = ChosunScraper.DATA_DECODER.raw_decode(text, start + len(ChosunScraper.DATA_SCRIPT_MARKER))
+            title = data['headlines']['basic']
+            # HTML 경로는 머리에 보이는 날짜 중 마지막 것(수정 날짜)을 쓰므로 같게 맞춤
+            date = ChosunScraper._kst_date(
+                data.get('last_updated_date') or data.get('display_date') or data['first_publish_date'])
+            body = ''.join(element.get('content', '') for element in data['content_elements']
+                           if element.get('type') in ChosunScraper.BODY_TYPES)
+        except (ValueError, KeyError, TypeError, AttributeError):
+            return None
+
+        if not body:  # 사진, 영상 기사 등
+            return None
+
+        if '<' in body:
+            body = ChosunScraper.TAG_FILTER.sub('', body)
+        if '&' in body:
+            body = html.unescape(body)
+
+        return {'date': date, 'title': Scraper._clean_text(html.unescape(title)), 'body': Scraper._clean_text(body)}
+
+    # ISO 8601 시각(UTC)을 한국 시간 날짜(YYYY-MM-DD)로 변환
+    @staticmethod
+    def _kst_date(value):
+        moment = datetime.datetime.fromisoformat(value.replace('Z', '+00:00'))
+        if moment.tzinfo is None:
+            moment = moment.replace(tzinfo=datetime.timezone.utc)
+        return moment.astimezone(ChosunScraper.KST).strftime('%Y-%m-%d')
 
-    def scrap_articles(self, article_url):
-        soup = BeautifulSoup(Scraper._request_get(
-            article_url).text, 'html.parser')
+    @staticmethod
+    def _parse_article_html(text):
+        soup = html_parser.parse_html(text, ChosunScraper.ARTICLE_PARTS)
 
         # 기사 날짜 추출
         date_element = soup.select_one(
@@ -274,3 +459,7 @@ class ChosunScraper(Scraper):
         body = Scraper._clean_text(body_element.get_text())
 
         return {'date': date, 'title': title, 'body': body}
+
+
+# 언론사 이름 -> 스크래퍼 클래스
+SCRAPERS = {scraper.PRESS: scraper for scraper in (JoongangScraper, DongaScraper, ChosunScraper)}
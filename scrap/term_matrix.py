@@ -0,0 +1,223 @@
+##################################################################################################
+# 명사 추출 결과로 문서-단어 행렬(희소 CSR)을 한 번만 만들어 분석 단계들이 함께 쓰도록 저장함
+# 명사 파일을 한 행씩 읽으며 만들기 때문에 기사 수가 많아도 밀집 행렬을 만들지 않음
+# 단어는 tm의 TermDocumentMatrix(wordLengths=c(2, Inf))처럼 공백으로 나누고 소문자로 바꾼 뒤 2글자 이상만 셈
+#
+# 출력 (출력 디렉토리에 저장)
+# - dtm.mtx: Matrix Market 좌표 형식 (행: 문서, 열: 단어). R에서 Matrix::readMM으로 읽음
+# - vocab.txt: 열 순서대로 한 줄에 한 단어. 전체 빈도수가 높은 순 (같으면 가나다순)
+#              따라서 상위 N개 단어의 행렬은 앞쪽 N개 열만 쓰면 됨
+# - frequent.csv: 상위 단어와 빈도수. 2_frequency.r의 출력과 같은 형식
+# - lda.txt: 상위 단어들만 쓴 LDA-C 형식 (한 줄에 한 문서, "단어 수 번호:횟수 ...", 번호는 vocab.txt의 0부터 순서)
+#            R에서 lda::read.documents로 읽으면 dtm2ldaformat(omit_empty = FALSE)과 같은 형식이 됨
+#
+# 사용법: term_matrix.py [-h] -i <nouns> [-o <directory>] [-n <number>] [-w <words>]
+# -h --help: 도움말
+# -i --input  (명사 추출 결과 CSV 파일, 1_extract_nouns.r의 출력)
+# -o --output (출력 디렉토리, 기본값 현재 디렉토리)
+# -n --number (frequent.csv에 저장할 상위 단어 수, 기본값 50)
+# -w --words  (lda.txt에 쓸 상위 단어 수, 기본값 500)
+##################################################################################################
+
+import sys  # 시스템 모듈
+import os  # 파일 도구
+import getopt  # 명령행 인수 파서
+import inspect  # 텍스트 도구
+import time  # 처리 시간
+from array import array  # 정수 배열 (CSR 저장)
+from collections import Counter  # 문서별 단어 수
+
+import noun_filter  # 명사 파일 읽기
+
+MIN_WORD_LENGTH = 2  # 셀 단어의 최소 글자 수
+
+
+# 희소 문서-단어 행렬 (CSR)
+# 문서 i의 단어 번호와 횟수는 indices, data의 indptr[i]부터 indptr[i + 1] 앞까지
+class TermMatrix:
+
+    def __init__(self, vocab, indptr, indices, data):
+        self.vocab = vocab  # 열 번호 -> 단어
+        self.indptr = indptr
+        self.indices = indices
+        self.data = data
+
+    @property
+    def num_documents(self):
+        return len(self.indptr) - 1
+
+    @property
+    def num_nonzero(self):
+        return len(self.data)
+
+    # 단어별 전체 빈도수 (열 번호 순서)
+    def term_frequencies(self):
+        frequencies = [0] * len(self.vocab)
+        for index, count in zip(self.indices, self.data):
+            frequencies[index] += count
+        return frequencies
+
+    # 문서 하나의 (단어 번호, 횟수) 리스트
+    def row(self, document):
+        start, end = self.indptr[document], self.indptr[document + 1]
+        return list(zip(self.indices[start:end], self.data[start:end]))
+
+    # 빈도수가 높은 순(같으면 가나다순)으로 열 순서를 바꾼 새 행렬. 문서마다 단어 번호순으로 정렬함
+    def sorted_by_frequency(self):
+        frequencies = self.term_frequencies()
+        order = sorted(range(len(self.vocab)), key=lambda index: (-frequencies[index], self.vocab[index]))
+        new_index = [0] * len(order)
+        for position, index in enumerate(order):
+            new_index[index] = position
+
+        indices, data = array('i'), array('i')
+        for document in range(self.num_documents):
+            for index, count in sorted((new_index[index], count) for index, count in self.row(document)):
+                indices.append(index)
+                data.append(count)
+
+        return TermMatrix([self.vocab[index] for index in order], self.indptr, indices, data)
+
+    # Matrix Market 좌표 형식으로 저장 (번호는 1부터)
+    def write_mtx(self, file_name):
+        with open(file_name, 'w', encoding='utf8', newline='\n') as file:
+            file.write('%%MatrixMarket matrix coordinate integer general\n')
+            file.write('% rows: documents, columns: terms (vocab.txt)\n')
+            file.write(f'{self.num_documents} {len(self.vocab)} {self.num_nonzero}\n')
+            for document in range(self.num_documents):
+                file.writelines(f'{document + 1} {index + 1} {count}\n' for index, count in self.row(document))
+
+    # 한 줄에 한 단어
+    def write_vocab(self, file_name):
+        with open(file_name, 'w', encoding='utf8', newline='\n') as file:
+            file.writelines(f'{term}\n' for term in self.vocab)
+
+    # LDA-C 형식으로 저장. num_words를 주면 번호가 그보다 작은 단어만 씀 (빈도순으로 정렬된 행렬이면 상위 단어)
+    # 단어가 없는 문서도 "0" 한 줄로 남겨 문서 순서를 유지함
+    def write_lda(self, file_name, num_words=None):
+        with open(file_name, 'w', encoding='utf8', newline='\n') as file:
+            for document in range(self.num_documents):
+                entries = [f'{index}:{count}' for index, count in self.row(document)
+                           if num_words is None or index < num_words]
+                file.write(' '.join([str(len(entries))] + entries) + '\n')
+
+    # 상위 단어와 빈도수를 2_frequency.r과 같은 형식(write.table, sep=", ")으로 저장
+    def write_frequent(self, file_name, num_words):
+        frequencies = self.term_frequencies()
+        top = sorted(range(len(self.vocab)), key=lambda index: (-frequencies[index], self.vocab[index]))[:num_words]
+        with open(file_name, 'w', encoding='utf8', newline='\n') as file:
+            file.write('"word", "freq"\n')
+            for index in top:
+                term = self.vocab[index].replace('"', '\\"')
+                file.write(f'"{term}", {frequencies[index]}\n')
+
+
+# 문서를 하나씩 받아 행렬을 만듦. 단어 번호는 처음 나온 순서
+class TermMatrixBuilder:
+
+    def __init__(self, min_length=MIN_WORD_LENGTH):
+        self.min_length = min_length
+        self._term_ids = {}  # 단어 -> 번호
+        self._vocab = []
+        self._indptr, self._indices, self._data = array('q', [0]), array('i'), array('i')
+
+    # 문서(단어를 공백으로 구분한 문자열) 하나 추가
+    def add(self, document):
+        counts = Counter(word for word in document.lower().split() if len(word) >= self.min_length)
+        for term, count in counts.items():
+            index = self._term_ids.get(term)
+            if index is None:
+                index = self._term_ids[term] = len(self._vocab)
+                self._vocab.append(term)
+            self._indices.append(index)
+            self._data.append(count)
+        self._indptr.append(len(self._indices))
+
+    def matrix(self):
+        return TermMatrix(self._vocab, self._indptr, self._indices, self._data)
+
+
+# 문서들로 행렬 생성. 문서를 하나씩 처리하므로 제너레이터를 넘겨도 됨
+# 단어 번호는 처음 나온 순서이며, 빈도순으로 바꾸려면 sorted_by_frequency를 호출함
+def build_term_matrix(documents, min_length=MIN_WORD_LENGTH):
+    builder = TermMatrixBuilder(min_length)
+    for document in documents:
+        builder.add(document)
+    return builder.matrix()
+
+
+# 빈도순으로 정렬한 행렬을 출력 디렉토리에 저장 (dtm.mtx, vocab.txt, frequent.csv, lda.txt)
+def write_all(matrix, output_dir_name, num_frequent=50, num_words=500):
+    os.makedirs(output_dir_name, exist_ok=True)
+    matrix.write_mtx(os.path.join(output_dir_name, 'dtm.mtx'))
+    matrix.write_vocab(os.path.join(output_dir_name, 'vocab.txt'))
+    matrix.write_frequent(os.path.join(output_dir_name, 'frequent.csv'), num_frequent)
+    matrix.write_lda(os.path.join(output_dir_name, 'lda.txt'), num_words)
+
+
+# 명사 추출 결과 CSV에서 본문(명사들)을 하나씩 반환
+def read_bodies(file_name, column='body'):
+    rows = noun_filter.read_rows(file_name)
+    header = next(rows, None)
+    if header is None:
+        return
+    position = header.index(column)
+    for row in rows:
+        yield row[position] if position < len(row) else ''
+
+
+# 커맨드라인 도움말 출력 및 종료
+def print_help(exit_code):
+    print(inspect.cleandoc(
+        '''사용법: [-h] -i <nouns> [-o <directory>] [-n <number>] [-w <words>]
+            -h --help: 도움말
+            -i --input  (명사 추출 결과 CSV 파일, 1_extract_nouns.r의 출력)
+            -o --output (출력 디렉토리, 기본값 현재 디렉토리)
+                        dtm.mtx, vocab.txt, frequent.csv, lda.txt를 저장함
+            -n --number (frequent.csv에 저장할 상위 단어 수, 기본값 50)
+            -w --words  (lda.txt에 쓸 상위 단어 수, 기본값 500)'''))
+    sys.exit(exit_code)
+
+
+def main(argv):
+
+    nouns_file_name = None  # 명사 파일명
+    output_dir_name = '.'  # 출력 디렉토리
+    num_frequent = 50  # frequent.csv의 단어 수
+    num_words = 500  # lda.txt의 단어 수
+
+    try:  # 명령행 인수 파싱
+        opts, _ = getopt.getopt(argv, 'hi:o:n:w:', ['help', 'input=', 'output=', 'number=', 'words='])
+
+    except getopt.GetoptError as error:  # 오류 발생 (잘못된 입력)
+        print(error)
+        print_help(1)
+
+    for opt, arg in opts:
+        if opt in ('-h', '--help'):  # 도움말
+            print_help(0)
+        elif opt in ('-i', '--input'):  # 명사 파일명
+            nouns_file_name = arg
+        elif opt in ('-o', '--output'):  # 출력 디렉토리
+            output_dir_name = arg
+        elif opt in ('-n', '--number'):  # frequent.csv의 단어 수
+            num_frequent = int(arg)
+        elif opt in ('-w', '--words'):  # lda.txt의 단어 수
+            num_words = int(arg)
+
+    if nouns_file_name is None:  # 명사 파일 입력 안함
+        print_help(1)
+
+    start_time = time.monotonic()
+    print('Building Document Term Matrix... ', end='', flush=True)
+    matrix = build_term_matrix(read_bodies(nouns_file_name)).sorted_by_frequency()
+    print(f'[DONE] {matrix.num_documents} Documents, {len(matrix.vocab)} Terms, '
+          f'{matrix.num_nonzero} Non-zero Entries')
+
+    write_all(matrix, output_dir_name, num_frequent, num_words)
+
+    print(f'Saved to {output_dir_name} in {time.monotonic() - start_time:.1f}s')
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
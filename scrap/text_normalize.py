@@ -0,0 +1,184 @@
+##########################################################################
+# 기사 텍스트 정리와 날짜 추출
+# - clean_text: 한글과 공백만 남기고 나머지는 공백 하나로 바꿈
+#   한글이 아닌 문자(공백 포함)가 이어진 부분을 정규식 한 번으로 공백 하나로 바꾸므로
+#   특수 문자를 공백으로 바꾼 뒤 연속된 공백을 다시 합치던 두 번의 치환과 결과가 같음
+# - join_clean: 여러 요소의 텍스트를 각각 정리해서 한 번에 이어 붙임
+# - extract_date: 날짜가 있는 첫 줄에서 가장 오른쪽 날짜를 YYYY-MM-DD로 반환
+#   예전 정규식(.*날짜.*)과 같은 결과를 내지만 줄 전체를 되돌아가며 맞춰보지 않음
+#
+# 직접 실행하면 예전 방식과 결과가 같은지 확인하고 처리 시간을 비교함
+# 사용법: text_normalize.py [-h] [-n <repeat>] [<file> ...]
+# -h --help: 도움말
+# -n --repeat (반복 횟수, 기본값 20)
+# <file> (시험할 텍스트 파일들. 기사 페이지를 저장한 HTML도 됨. 없으면 대역 서버의 기사 본문을 사용)
+##########################################################################
+
+import re  # 정규표현식
+import sys  # 시스템 모듈
+import getopt  # 명령행 인수 파서
+import inspect  # 텍스트 도구
+import time  # 처리 시간 측정
+
+NON_HANGUL = re.compile(r'[^가-힣]+')  # 한글이 아닌 문자가 이어진 부분 (공백 포함)
+
+# 날짜 검출용 정규식. (년, 월, 일) 그룹
+DATE_PATTERN = re.compile(r'((?:19|20)\d{2})[-.](0[1-9]|1[0-2])[-.]([012][0-9]|3[01])')
+
+
+# 필요한 문자(한글, 공백)만 남김
+def clean_text(text):
+    return NON_HANGUL.sub(' ', text)
+
+
+# 텍스트들을 각각 정리해서 이어 붙임. 문자열을 반복해서 더하지 않음
+def join_clean(texts):
+    return ''.join(map(clean_text, texts))
+
+
+# 날짜가 있는 첫 줄에서 가장 오른쪽 날짜를 YYYY-MM-DD로 반환. 없으면 ValueError
+def extract_date(text):
+    match = DATE_PATTERN.search(text)
+    if match is None:
+        raise ValueError(f'No Date in {text[:40]!r}')
+
+    # 같은 줄에 날짜가 더 있으면 가장 오른쪽 것 (날짜에는 줄바꿈이 없으므로 줄 끝까지만 찾음)
+    line_end = text.find('\n', match.end())
+    if line_end < 0:
+        line_end = len(text)
+    while True:
+        next_match = DATE_PATTERN.search(text, match.start() + 1, line_end)
+        if next_match is None:
+            break
+        match = next_match
+
+    return f'{match.group(1)}-{match.group(2)}-{match.group(3)}'
+
+
+# 예전 방식 (비교용)
+_OLD_CHARACTER_FILTER = re.compile(r'[^ 가-힣]+')
+_OLD_DATE_REGEX = re.compile(r'.*((?:19|20)(?:\d{2}))[-.](0[1-9]|1[0-2])[-.]([012][0-9]|3[01]).*')
+
+
+def _old_clean_text(text):
+    return re.sub(r' +', ' ', _OLD_CHARACTER_FILTER.sub(' ', text))
+
+
+def _old_join_clean(texts):
+    result = ''
+    for text in texts:
+        result = result + _old_clean_text(text)
+    return result
+
+
+def _old_extract_date(text):
+    match = re.search(_OLD_DATE_REGEX, text)
+    if match is None:
+        raise ValueError(f'No Date in {text[:40]!r}')
+    return f'{match.group(1)}-{match.group(2)}-{match.group(3)}'
+
+
+# 대역 서버가 만드는 기사 페이지들의 본문, 날짜 텍스트
+def _fixture_samples(num_articles=100):
+    from fixture_server import FixturePages  # 대역 서버 페이지 생성기
+    import html_parser  # HTML 분석기
+
+    pages = FixturePages(num_articles)
+    samples = []
+    for article_id in range(num_articles):
+        for make_page, selector in ((pages.joongang_article, '#article_body'),
+                                    (pages.donga_article, 'div.article_txt'),
+                                    (pages.chosun_article, 'div.wv_newsbody')):
+            soup = html_parser.parse_html(make_page(article_id)[1])
+            samples.append(soup.select_one(selector).get_text())
+    return samples
+
+
+# 한 번 실행하는 데 걸린 시간의 최솟값 (초)
+def _best_time(function, samples, repeat):
+    best = None
+    for _ in range(repeat):
+        start = time.perf_counter()
+        for sample in samples:
+            function(sample)
+        elapsed = time.perf_counter() - start
+        best = elapsed if best is None else min(best, elapsed)
+    return best
+
+
+# 날짜 추출 결과. 날짜가 없으면 오류 종류
+def _date_or_error(function, text):
+    try:
+        return function(text)
+    except ValueError:
+        return None
+
+
+# 커맨드라인 도움말 출력 및 종료
+def print_help(exit_code):
+    print(inspect.cleandoc(
+        '''사용법: [-h] [-n <repeat>] [<file> ...]
+            -h --help: 도움말
+            -n --repeat (반복 횟수, 기본값 20)
+            <file> (시험할 텍스트 파일들. 기사 페이지를 저장한 HTML도 됨. 없으면 대역 서버의 기사 본문을 사용)'''))
+    sys.exit(exit_code)
+
+
+def main(argv):
+
+    repeat = 20  # 반복 횟수
+
+    try:  # 명령행 인수 파싱
+        opts, file_names = getopt.getopt(argv, 'hn:', ['help', 'repeat='])
+
+    except getopt.GetoptError as error:  # 오류 발생 (잘못된 입력)
+        print(error)
+        print_help(1)
+
+    for opt, arg in opts:
+        if opt in ('-h', '--help'):  # 도움말
+            print_help(0)
+        elif opt in ('-n', '--repeat'):  # 반복 횟수
+            repeat = int(arg)
+
+    if file_names:
+        samples = []
+        for file_name in file_names:
+            with open(file_name, encoding='utf8', errors='replace') as file:
+                samples.append(file.read())
+    else:
+        samples = _fixture_samples()
+
+    # 날짜는 날짜 요소처럼 짧은 텍스트와, 날짜가 없는 긴 줄 뒤에 날짜가 있는 텍스트로 확인함
+    # 예전 방식은 긴 줄에서 오래 걸리므로 긴 텍스트는 10개만 사용함
+    short_dates = [f'입력 2020.{day % 12 + 1:02}.{day % 28 + 1:02} 18:{day % 60:02} | '
+                   f'수정 20{day % 30 + 10}-{day % 12 + 1:02}-{day % 31 + 1:02} 09:00'
+                   for day in range(len(samples))]
+    long_dates = [sample + '\n입력 2020.12.31 18:00' for sample in samples[:10]]
+
+    # 결과가 같은지 확인
+    mismatches = sum(clean_text(sample) != _old_clean_text(sample) for sample in samples)
+    mismatches += join_clean(samples) != _old_join_clean(samples)
+    mismatches += sum(_date_or_error(extract_date, sample) != _date_or_error(_old_extract_date, sample)
+                      for sample in short_dates + long_dates + samples[:10])
+
+    size = sum(map(len, samples))
+    print(f'{len(samples)} Texts, {size / 1024:.0f}K Characters, Mismatches: {mismatches}')
+
+    cases = (
+        ('clean_text', clean_text, _old_clean_text, samples),
+        ('join_clean', join_clean, _old_join_clean, [samples]),
+        ('date_short', extract_date, _old_extract_date, short_dates),
+        ('date_long', extract_date, _old_extract_date, long_dates),
+    )
+    for name, new_function, old_function, case_samples in cases:
+        new_time = _best_time(new_function, case_samples, repeat)
+        old_time = _best_time(old_function, case_samples, repeat)
+        print(f'{name:12} old {old_time * 1000:9.3f} ms  new {new_time * 1000:9.3f} ms  '
+              f'({old_time / new_time if new_time > 0 else 0:.1f}x)')
+
+    sys.exit(1 if mismatches else 0)
+
+
+if __name__ == '__main__':
+    main(sys.argv[1:])
@@ -0,0 +1,150 @@
+##########################################################################
+# 스크랩 작업 큐 (SQLite)
+# 수집하는 쪽(scrap_articles.py -c --queue)이 기사를 올리고, 여러 작업자 프로세스(--worker)가
+# 기사를 묶음으로 빌려가서(lease) 스크랩한 뒤 각자의 출력 파일(샤드)에 저장함
+# - 빌린 기사는 유효 시간(visibility timeout)이 지나면 다른 작업자가 다시 빌릴 수 있음
+#   작업자는 살아있는 동안 주기적으로 유효 시간을 늘리므로(renew) 죽은 작업자의 기사만 다시 나감
+# - 빌릴 때마다 시도 횟수를 늘리고, MAX_ATTEMPTS번 빌려가도 끝나지 않은 기사는 실패로 봄
+# - 수집이 끝나면 finish_publishing으로 표시하며, 작업자는 표시가 있고 남은 기사가 없으면 끝냄
+#
+# 여러 프로세스, 여러 컴퓨터(공유 디렉토리)에서 같은 파일을 열며, 빌리기는 쓰기 잠금을 잡은 트랜잭션에서 함
+# 다른 저장소를 쓰려면 같은 메서드를 가진 클래스로 바꾸면 됨
+##########################################################################
+
+import time  # 유효 시간
+import sqlite3  # SQLite 데이터베이스
+import threading  # 동기화 도구
+
+MAX_ATTEMPTS = 3  # 기사 하나를 빌려줄 최대 횟수
+
+# 기사 상태
+PENDING = 'pending'  # 기다리는 중
+LEASED = 'leased'  # 작업자가 빌려감
+DONE = 'done'  # 스크랩 완료
+FAILED = 'failed'  # MAX_ATTEMPTS번 실패
+
+
+class WorkQueue:
+
+    def __init__(self, path, timeout=30.0):
+        self.path = path  # 큐 파일 경로
+
+        # 같은 프로세스의 여러 스레드(생산자, 기록, 유효 시간 갱신)가 같은 연결을 쓰므로 잠금으로 보호함
+        # 트랜잭션은 직접 시작함 (빌리기는 BEGIN IMMEDIATE로 다른 프로세스와 겹치지 않도록)
+        self._lock = threading.Lock()
+        self._connection = sqlite3.connect(path, timeout=timeout, check_same_thread=False, isolation_level=None)
+        self._connection.execute('PRAGMA journal_mode=WAL')
+        self._connection.execute('PRAGMA synchronous=NORMAL')
+        self._connection.executescript('''
+            CREATE TABLE IF NOT EXISTS jobs (
+                seq INTEGER PRIMARY KEY AUTOINCREMENT,
+                url TEXT UNIQUE NOT NULL,
+                title TEXT NOT NULL,
+                press TEXT NOT NULL,
+                state TEXT NOT NULL DEFAULT 'pending',
+                owner TEXT,
+                expires REAL,
+                attempts INTEGER NOT NULL DEFAULT 0);
+            CREATE INDEX IF NOT EXISTS jobs_state ON jobs (state, seq);
+            CREATE TABLE IF NOT EXISTS meta (
+                key TEXT PRIMARY KEY,
+                value TEXT);
+        ''')
+
+    def _transaction(self, function, immediate=False):  # function(cursor)를 한 트랜잭션에서 실행
+        with self._lock:
+            cursor = self._connection.cursor()
+            cursor.execute('BEGIN IMMEDIATE' if immediate else 'BEGIN')
+            try:
+                result = function(cursor)
+            except BaseException:
+                cursor.execute('ROLLBACK')
+                raise
+            cursor.execute('COMMIT')
+            return result
+
+    def _query(self, sql, params=()):
+        with self._lock:
+            return self._connection.execute(sql, params).fetchall()
+
+    # 기사 올리기. 이미 있는 기사는 무시함. articles: [(링크, 제목, 언론사), ...]
+    def publish_many(self, articles):
+        self._transaction(lambda cursor: cursor.executemany(
+            'INSERT OR IGNORE INTO jobs (url, title, press) VALUES (?, ?, ?)', articles))
+
+    # 수집이 끝났음을 표시. 다시 수집을 시작하면 reopen_publishing
+    def finish_publishing(self):
+        self._transaction(lambda cursor: cursor.execute(
+            "INSERT OR REPLACE INTO meta (key, value) VALUES ('published', '1')"))
+
+    def reopen_publishing(self):
+        self._transaction(lambda cursor: cursor.execute("DELETE FROM meta WHERE key = 'published'"))
+
+    # 기다리는 기사와 유효 시간이 지난 기사를 올린 순서대로 최대 size개 빌림
+    # presses를 주면 그 언론사의 기사만. [{'url', 'title', 'press'}, ...] 반환
+    def lease(self, owner, size, lease_seconds, presses=None):
+        now = time.time()
+        press_filter = f' AND press IN ({",".join("?" * len(presses))})' if presses else ''
+
+        def lease_rows(cursor):
+            rows = cursor.execute(
+                f'SELECT seq, url, title, press FROM jobs '
+                f'WHERE (state = ? OR (state = ? AND expires < ?)) AND attempts < ?{press_filter} '
+                f'ORDER BY seq LIMIT ?',
+                (PENDING, LEASED, now, MAX_ATTEMPTS, *(presses or ()), size)).fetchall()
+            cursor.executemany(
+                'UPDATE jobs SET state = ?, owner = ?, expires = ?, attempts = attempts + 1 WHERE seq = ?',
+                [(LEASED, owner, now + lease_seconds, seq) for seq, *_ in rows])
+            return rows
+
+        rows = self._transaction(lease_rows, immediate=True)
+        return [{'url': url, 'title': title, 'press': press} for _, url, title, press in rows]
+
+    # owner가 빌린 기사의 유효 시간을 늘림. 작업자가 살아있는 동안 주기적으로 호출함
+    def renew(self, owner, lease_seconds):
+        self._transaction(lambda cursor: cursor.execute(
+            'UPDATE jobs SET expires = ? WHERE state = ? AND owner = ?',
+            (time.time() + lease_seconds, LEASED, owner)))
+
+    # 스크랩을 마친 기사. 저장 객체가 파일에 내보낸 뒤 호출함
+    def complete_many(self, urls):
+        self._transaction(lambda cursor: cursor.executemany(
+            'UPDATE jobs SET state = ?, owner = NULL, expires = NULL WHERE url = ?',
+            [(DONE, url) for url in urls]))
+
+    # 스크랩에 실패한 기사. MAX_ATTEMPTS번 빌려간 기사는 실패, 아니면 다시 기다림
+    def fail(self, url):
+        self._transaction(lambda cursor: cursor.execute(
+            'UPDATE jobs SET state = CASE WHEN attempts >= ? THEN ? ELSE ? END, owner = NULL, expires = NULL '
+            'WHERE url = ? AND state = ?',
+            (MAX_ATTEMPTS, FAILED, PENDING, url, LEASED)))
+
+    # owner가 빌렸지만 끝내지 못한 기사를 돌려줌 (작업자가 끝날 때)
+    def release(self, owner):
+        self._transaction(lambda cursor: cursor.execute(
+            'UPDATE jobs SET state = ?, owner = NULL, expires = NULL WHERE state = ? AND owner = ?',
+            (PENDING, LEASED, owner)))
+
+    # 더 할 일이 없음. 수집이 끝났고, 빌릴 수 있거나 다른 작업자가 빌려간 기사가 없음
+    # 유효 시간이 지난 기사도 남은 기사이므로, 죽은 작업자의 기사는 다른 작업자가 마저 함
+    def is_drained(self, presses=None):
+        if not self._query("SELECT 1 FROM meta WHERE key = 'published'"):
+            return False
+        press_filter = f' AND press IN ({",".join("?" * len(presses))})' if presses else ''
+        return not self._query(
+            f'SELECT 1 FROM jobs WHERE state IN (?, ?) AND attempts < ?{press_filter} LIMIT 1',
+            (PENDING, LEASED, MAX_ATTEMPTS, *(presses or ())))
+
+    # 상태별 기사 수. MAX_ATTEMPTS번 빌려가도 끝나지 않아 더 빌려줄 수 없는 기사는 실패로 셈
+    def counts(self):
+        counts = {PENDING: 0, LEASED: 0, DONE: 0, FAILED: 0}
+        for state, exhausted, count in self._query(
+                'SELECT state, attempts >= ? AND (state = ? OR (state = ? AND expires < ?)), COUNT(*) '
+                'FROM jobs GROUP BY 1, 2',
+                (MAX_ATTEMPTS, PENDING, LEASED, time.time())):
+            counts[FAILED if exhausted else state] += count
+        return counts
+
+    def close(self):
+        with self._lock:
+            self._connection.close()